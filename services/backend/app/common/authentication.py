@@ -0,0 +1,54 @@
+from typing import Any, Optional
+import secrets
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import HttpRequest
+from rest_framework.authtoken.models import Token
+from .redis_client import get_async_redis_client, get_redis_client
+
+# Stream ticket -> user id, deleted on first use
+STREAM_TICKET_KEY = "auth:stream_ticket:{}"
+
+
+def issue_stream_ticket(user: Any) -> str:
+    """
+    A short-lived, single-use ticket authenticating one event stream
+    (EventSource cannot set headers). Unlike the API token, a ticket that
+    ends up in access logs as ?ticket= is useless by the time it is read.
+    """
+    ticket = secrets.token_urlsafe(32)
+    get_redis_client().set(
+        STREAM_TICKET_KEY.format(ticket),
+        user.pk,
+        ex=settings.STREAM_TICKET_TTL_SECONDS,
+    )
+    return ticket
+
+
+async def aauthenticate(request: HttpRequest) -> Optional[Any]:
+    """
+    Async counterpart of the API authentication, for plain async views (DRF
+    views are sync): an API token from the Authorization header, a stream
+    ticket from the `ticket` query parameter, else the session. Returns the
+    active user or None.
+    """
+    keyword, _, key = request.headers.get("Authorization", "").partition(" ")
+    if keyword == "Token" and key:
+        try:
+            token = await Token.objects.select_related("user").aget(key=key)
+        except Token.DoesNotExist:
+            return None
+        return token.user if token.user.is_active else None
+
+    ticket = request.GET.get("ticket", "")
+    if ticket:
+        user_id = await get_async_redis_client().getdel(
+            STREAM_TICKET_KEY.format(ticket)
+        )
+        if user_id is None:
+            return None
+        owner = await get_user_model().objects.filter(pk=user_id).afirst()
+        return owner if owner is not None and owner.is_active else None
+
+    user = await request.auser()
+    return user if user.is_authenticated else None
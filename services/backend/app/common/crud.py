@@ -1,4 +1,4 @@
-from typing import Type, TypeVar, Generic, Optional, Dict, Any
+from typing import Type, TypeVar, Generic, Optional, Dict, Any, List, Sequence
 from django.db import models
 from django.shortcuts import get_object_or_404
 
@@ -88,6 +88,26 @@ class FilterMixin(BaseCRUD[T]):
         return self.model.objects.filter(**filter_dict)  # type: ignore[attr-defined]
 
 
+class BulkMixin(BaseCRUD[T]):
+    def bulk_create(self, instances: Sequence[T], batch_size: int = 500) -> List[T]:
+        """
+        Generic multi-row insert. Skips save() and signals.
+        """
+        return self.model.objects.bulk_create(  # type: ignore[attr-defined]
+            instances, batch_size=batch_size
+        )
+
+    def bulk_update(
+        self, instances: Sequence[T], fields: Sequence[str], batch_size: int = 500
+    ) -> int:
+        """
+        Generic multi-row update of the given fields. Skips save() and signals.
+        """
+        return self.model.objects.bulk_update(  # type: ignore[attr-defined]
+            instances, fields, batch_size=batch_size
+        )
+
+
 # ---------------------------------------------------------
 # THE COMBO PACK
 # ---------------------------------------------------------
@@ -100,6 +120,7 @@ class FullCRUD(
     UpdateMixin[T],
     DeleteMixin[T],
     FilterMixin[T],
+    BulkMixin[T],
 ):
     """Inherit from this to get everything instantly."""
 
@@ -0,0 +1,107 @@
+from typing import Any, List, Optional, Tuple
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+import json
+from django.db.models import Model, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Newest-first keyset (seek) pagination on (ordering_field, tiebreak_field).
+
+    The cursor holds the key of the last row of the page, and the next page
+    is `WHERE (ordering_field, tiebreak_field) < cursor LIMIT size + 1`, so
+    every page is one index range scan: no COUNT and no OFFSET.
+    """
+
+    ordering_field = "created_at"
+    tiebreak_field = "id"
+    page_size = 10
+    page_size_query_param = "size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(
+        self, queryset: Any, request: Request, view: Any = None
+    ) -> List[Any]:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(
+            f"-{self.ordering_field}", f"-{self.tiebreak_field}"
+        )
+        position = self.decode_cursor(request)
+        if position is not None:
+            value, tiebreak = position
+            queryset = queryset.filter(
+                Q(**{f"{self.ordering_field}__lt": value})
+                | Q(
+                    **{
+                        self.ordering_field: value,
+                        f"{self.tiebreak_field}__lt": tiebreak,
+                    }
+                )
+            )
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data: Any) -> Response:
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema: Any) -> Any:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.page[-1]),
+        )
+
+    def encode_cursor(self, instance: Model) -> str:
+        value = getattr(instance, self.ordering_field)
+        key = [value.isoformat(), getattr(instance, self.tiebreak_field)]
+        return urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+    def decode_cursor(self, request: Request) -> Optional[Tuple[datetime, int]]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            raw_value, raw_tiebreak = json.loads(urlsafe_b64decode(encoded.encode()))
+            value = parse_datetime(raw_value)
+            tiebreak = int(raw_tiebreak)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        # Cursors we issue always carry an offset
+        if value is None or value.tzinfo is None:
+            raise NotFound(self.invalid_cursor_message)
+        return value, tiebreak
@@ -0,0 +1,40 @@
+from typing import Optional
+import asyncio
+import weakref
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+
+_client: Optional[redis.Redis] = None
+
+# Asyncio connections belong to the event loop they were opened on
+_async_clients: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]"
+) = weakref.WeakKeyDictionary()
+
+
+def get_redis_client() -> redis.Redis:
+    """
+    Process-wide Redis client (thread/greenlet safe connection pool).
+    Used for runtime state that does not belong in Postgres.
+    """
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _client
+
+
+def _new_async_client() -> aioredis.Redis:
+    return aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+
+def get_async_redis_client() -> aioredis.Redis:
+    """
+    Redis client of the running event loop, for code that must not block
+    it. Every loop gets a client (and connection pool) of its own.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = _new_async_client()
+    return client
@@ -8,6 +8,7 @@ from common.crud import (
     UpdateMixin,
     DeleteMixin,
     FilterMixin,
+    BulkMixin,
 )
 
 
@@ -99,6 +100,28 @@ class TestCRUDMixins:
         crud.model.objects.filter.assert_called_once_with(is_active=True)
         assert result == mock_queryset
 
+    def test_bulk_create_mixin(self) -> None:
+        crud: BulkMixin[Any] = BulkMixin()
+        crud.model = MagicMock()
+        instances = [MagicMock(), MagicMock()]
+
+        crud.bulk_create(instances, batch_size=100)
+
+        crud.model.objects.bulk_create.assert_called_once_with(
+            instances, batch_size=100
+        )
+
+    def test_bulk_update_mixin(self) -> None:
+        crud: BulkMixin[Any] = BulkMixin()
+        crud.model = MagicMock()
+        instances = [MagicMock()]
+
+        crud.bulk_update(instances, ["status"])
+
+        crud.model.objects.bulk_update.assert_called_once_with(
+            instances, ["status"], batch_size=500
+        )
+
 
 class TestFullCRUD:
     def test_full_crud_has_all_methods(self) -> None:
@@ -109,3 +132,5 @@ class TestFullCRUD:
         assert hasattr(crud, "update")
         assert hasattr(crud, "delete")
         assert hasattr(crud, "filter")
+        assert hasattr(crud, "bulk_create")
+        assert hasattr(crud, "bulk_update")
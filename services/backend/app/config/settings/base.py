@@ -177,14 +177,139 @@ LOGGING = {
 # ---------------------------------------------------
 
 CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0")
+REDIS_URL = os.environ.get("REDIS_URL", CELERY_BROKER_URL)
 CELERY_RESULTS_BACKEND = "django-db"
 
 CELERY_TASK_ROUTES = {
     "monitor.tasks.check_monitor_task": {"queue": "runner_queue"},
+    "monitor.tasks.check_monitors_batch_task": {"queue": "runner_queue"},
+    # Heavy periodic jobs: their own worker, so they never delay notifications
+    "monitor.tasks.detect_fleet_anomalies_task": {"queue": "analytics_queue"},
+    "monitor.tasks.manage_result_partitions_task": {"queue": "analytics_queue"},
+    "monitor.tasks.apply_retention_task": {"queue": "analytics_queue"},
     "notifications.tasks.send_notification_task": {"queue": "notification_queue"},
     "*": {"queue": "celery"},
 }
 
+# Max in-flight HTTP checks per batch task (one event loop per task)
+RUNNER_BATCH_CONCURRENCY = int(os.environ.get("RUNNER_BATCH_CONCURRENCY", 100))
+
+# Runner DNS cache: answers are kept for their TTL, clamped to this range
+RUNNER_DNS_MIN_TTL = float(os.environ.get("RUNNER_DNS_MIN_TTL", 5))
+RUNNER_DNS_MAX_TTL = float(os.environ.get("RUNNER_DNS_MAX_TTL", 300))
+
+# Runner keep-alive pools: connections per host, and seconds before an idle
+# connection (or a host's whole pool) is closed
+RUNNER_POOL_MAX_PER_HOST = int(os.environ.get("RUNNER_POOL_MAX_PER_HOST", 10))
+RUNNER_POOL_IDLE_SECONDS = float(os.environ.get("RUNNER_POOL_IDLE_SECONDS", 30))
+
+# Response body bytes a check reads at most (0: stop after the headers).
+# Bodies that fit keep their connection reusable, longer ones are cut off
+RUNNER_MAX_BODY_BYTES = int(os.environ.get("RUNNER_MAX_BODY_BYTES", 65536))
+
+# PING checks: echo requests per monitor, seconds between them, and seconds
+# replies are awaited after the last one
+RUNNER_PING_COUNT = int(os.environ.get("RUNNER_PING_COUNT", 3))
+RUNNER_PING_INTERVAL = float(os.environ.get("RUNNER_PING_INTERVAL", 0.2))
+RUNNER_PING_TIMEOUT = float(os.environ.get("RUNNER_PING_TIMEOUT", 2))
+
+# Monitors of the same target share a check started less than this many
+# seconds ago (or still in flight)
+RUNNER_COALESCE_WINDOW_SECONDS = float(
+    os.environ.get("RUNNER_COALESCE_WINDOW_SECONDS", 5)
+)
+
+# Politeness towards checked hosts, across all runner workers: checks of a
+# host in flight at once, seconds between their starts, and seconds after
+# which a slot of a crashed worker is freed. Checks over the limits wait
+RUNNER_HOST_MAX_CONCURRENCY = int(os.environ.get("RUNNER_HOST_MAX_CONCURRENCY", 4))
+RUNNER_HOST_MIN_SPACING_SECONDS = float(
+    os.environ.get("RUNNER_HOST_MIN_SPACING_SECONDS", 0.1)
+)
+RUNNER_HOST_LEASE_SECONDS = float(os.environ.get("RUNNER_HOST_LEASE_SECONDS", 60))
+
+# In-worker result buffer: flushed when it holds RESULT_BUFFER_SIZE results
+# or its oldest result is RESULT_BUFFER_FLUSH_SECONDS old
+RESULT_BUFFER_SIZE = int(os.environ.get("RESULT_BUFFER_SIZE", 500))
+RESULT_BUFFER_FLUSH_SECONDS = float(os.environ.get("RESULT_BUFFER_FLUSH_SECONDS", 2))
+# Failed writes put their results back in the buffer this many times in a
+# row, then the results are written one by one and the failing ones dropped
+RESULT_BUFFER_MAX_RETRIES = int(os.environ.get("RESULT_BUFFER_MAX_RETRIES", 3))
+
+CELERY_BEAT_SCHEDULE = {
+    "detect-fleet-anomalies": {
+        "task": "monitor.tasks.detect_fleet_anomalies_task",
+        "schedule": float(os.environ.get("FLEET_ANOMALY_SCAN_SECONDS", 300)),
+    },
+    "manage-result-partitions": {
+        "task": "monitor.tasks.manage_result_partitions_task",
+        "schedule": 3600.0,
+    },
+    "apply-retention": {
+        "task": "monitor.tasks.apply_retention_task",
+        "schedule": 3600.0,
+    },
+}
+
+# ---------------------------------------------------
+# Check history
+# ---------------------------------------------------
+# MonitorResult is partitioned by day; partitions are created this many days
+# ahead and dropped once they are older than RESULT_RETENTION_DAYS
+RESULT_PARTITION_PREMAKE_DAYS = int(os.environ.get("RESULT_PARTITION_PREMAKE_DAYS", 7))
+
+# Retention in days (0 keeps forever). Raw results are kept for
+# RESULT_RETENTION_DAYS, the downsampled rollups for longer.
+RESULT_RETENTION_DAYS = int(os.environ.get("RESULT_RETENTION_DAYS", 30))
+ROLLUP_RETENTION_DAYS = {
+    "minute": int(os.environ.get("ROLLUP_MINUTE_RETENTION_DAYS", 2)),
+    "hour": int(os.environ.get("ROLLUP_HOUR_RETENTION_DAYS", 90)),
+    "day": int(os.environ.get("ROLLUP_DAY_RETENTION_DAYS", 730)),
+}
+# Rows deleted per statement (one short transaction each) and pause between
+RETENTION_CHUNK_SIZE = int(os.environ.get("RETENTION_CHUNK_SIZE", 5000))
+RETENTION_CHUNK_PAUSE_SECONDS = float(
+    os.environ.get("RETENTION_CHUNK_PAUSE_SECONDS", 0.05)
+)
+
+# The per-user dashboard summary in Redis is updated by ingestion and rebuilt
+# from the database at least this often (monitor edits drop it right away)
+DASHBOARD_SUMMARY_TTL_SECONDS = int(
+    os.environ.get("DASHBOARD_SUMMARY_TTL_SECONDS", 3600)
+)
+
+# Idle seconds before a live events stream sends a keepalive comment
+MONITOR_EVENTS_KEEPALIVE_SECONDS = float(
+    os.environ.get("MONITOR_EVENTS_KEEPALIVE_SECONDS", 15)
+)
+# Seconds a single-use ticket for opening an events stream stays valid
+STREAM_TICKET_TTL_SECONDS = int(os.environ.get("STREAM_TICKET_TTL_SECONDS", 30))
+
+# ---------------------------------------------------
+# Fleet anomaly detection
+# ---------------------------------------------------
+FLEET_ANOMALY_WINDOW_MINUTES = int(os.environ.get("FLEET_ANOMALY_WINDOW_MINUTES", 60))
+FLEET_ANOMALY_MAX_SAMPLES = int(os.environ.get("FLEET_ANOMALY_MAX_SAMPLES", 120))
+# Robust z-score (EWMA vs median, in MADs) above which a monitor is flagged
+FLEET_ANOMALY_THRESHOLD = float(os.environ.get("FLEET_ANOMALY_THRESHOLD", 4))
+# ... and how far above its usual latency for this hour of day it must be
+FLEET_ANOMALY_SEASONAL_FACTOR = float(
+    os.environ.get("FLEET_ANOMALY_SEASONAL_FACTOR", 1.5)
+)
+FLEET_ANOMALY_COOLDOWN_SECONDS = int(
+    os.environ.get("FLEET_ANOMALY_COOLDOWN_SECONDS", 3600)
+)
+
+# ---------------------------------------------------
+# Scheduler
+# ---------------------------------------------------
+SCHEDULER_TICK_SECONDS = float(os.environ.get("SCHEDULER_TICK_SECONDS", 1))
+SCHEDULER_SYNC_SECONDS = int(os.environ.get("SCHEDULER_SYNC_SECONDS", 300))
+SCHEDULER_BATCH_SIZE = int(os.environ.get("SCHEDULER_BATCH_SIZE", 100))
+# Random delay (seconds, at most a tenth of the interval) added to each due
+# time, on top of every monitor's fixed phase within its interval
+SCHEDULER_JITTER_SECONDS = float(os.environ.get("SCHEDULER_JITTER_SECONDS", 1))
+
 TELEGRAM_BOT_NAME = os.environ.get("TELEGRAM_BOT_NAME", "statushawh_test_bot")
 TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN", None)
 REQUEST_TIMEOUT = 10
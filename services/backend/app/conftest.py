@@ -0,0 +1,39 @@
+from typing import Any, List, Tuple
+import ipaddress
+import weakref
+import fakeredis
+import pytest
+from common import redis_client
+from monitor import resolver
+
+# What every hostname resolves to in tests (example.com, a public address)
+TEST_ADDRESS = ipaddress.ip_address("93.184.216.34")
+
+
+@pytest.fixture(autouse=True)
+def fake_redis(monkeypatch: Any) -> fakeredis.FakeRedis:
+    """Every test gets its own empty in-memory Redis."""
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(redis_client, "_client", client)
+    # Async clients (one per event loop) see the same data
+    monkeypatch.setattr(redis_client, "_async_clients", weakref.WeakKeyDictionary())
+    monkeypatch.setattr(
+        redis_client,
+        "_new_async_client",
+        lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+    )
+    return client
+
+
+@pytest.fixture(autouse=True)
+def fake_dns(monkeypatch: Any) -> None:
+    """No test queries real DNS: every hostname resolves to TEST_ADDRESS."""
+
+    async def lookup(
+        self: resolver.DNSCache, host: str
+    ) -> Tuple[List[resolver.IPAddress], float]:
+        return [TEST_ADDRESS], 60
+
+    monkeypatch.setattr(resolver.DNSCache, "_lookup", lookup)
+    monkeypatch.setattr(resolver.dns_cache, "entries", {})
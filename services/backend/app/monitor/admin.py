@@ -11,13 +11,23 @@ class MonitorAdmin(admin.ModelAdmin):
         "url_link",
         "monitor_type",
         "status_badge",
+        "last_status_code",
+        "last_response_time_ms",
+        "recent_uptime",
         "is_active",
         "interval",
         "created_at",
     )
     list_filter = ("monitor_type", "status", "is_active", "created_at")
     search_fields = ("name", "url", "user__email")
-    readonly_fields = ("created_at", "updated_at")
+    readonly_fields = (
+        "last_checked_at",
+        "last_status_code",
+        "last_response_time_ms",
+        "recent_uptime",
+        "created_at",
+        "updated_at",
+    )
     list_editable = ("is_active",)
     list_per_page = 25
     date_hierarchy = "created_at"
@@ -25,7 +35,27 @@ class MonitorAdmin(admin.ModelAdmin):
         (None, {"fields": ("user", "name", "url")}),
         (
             "Configuration",
-            {"fields": ("monitor_type", "interval", "status", "is_active")},
+            {
+                "fields": (
+                    "monitor_type",
+                    "interval",
+                    "status",
+                    "is_active",
+                    "fresh_connection",
+                    "expected_banner",
+                )
+            },
+        ),
+        (
+            "Latest result",
+            {
+                "fields": (
+                    "last_checked_at",
+                    "last_status_code",
+                    "last_response_time_ms",
+                    "recent_uptime",
+                )
+            },
         ),
         (
             "Timestamps",
@@ -49,6 +79,14 @@ class MonitorAdmin(admin.ModelAdmin):
 
     status_badge.short_description = "Status"  # type: ignore[attr-defined]
 
+    def recent_uptime(self, obj: Monitor) -> str:
+        uptime = obj.recent_uptime_percentage
+        return "-" if uptime is None else f"{uptime}%"
+
+    recent_uptime.short_description = (  # type: ignore[attr-defined]
+        f"Uptime (last {Monitor.RECENT_CHECKS})"
+    )
+
 
 @admin.register(MonitorResult)
 class MonitorResultAdmin(admin.ModelAdmin):
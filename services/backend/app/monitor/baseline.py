@@ -0,0 +1,91 @@
+from typing import Callable, Dict, List, Optional, Tuple, cast
+import math
+import redis
+from common.redis_client import get_redis_client
+
+# Hash per monitor: count, sum, sumsq, pos and the ring slots v0..v{WINDOW-1}
+BASELINE_KEY = "monitor:baseline:{}"
+WINDOW_SIZE = 20
+MIN_SAMPLES = 10
+# Baselines of deleted/paused monitors expire on their own
+BASELINE_TTL = 7 * 24 * 3600
+
+
+class LatencyBaseline:
+    """
+    Online response-time baseline per monitor: a fixed-size ring buffer with
+    running sum and sum of squares, kept in Redis. Mean and stdev of the last
+    WINDOW_SIZE samples are available without touching MonitorResult.
+    """
+
+    def __init__(
+        self, client: Optional[redis.Redis] = None, window: int = WINDOW_SIZE
+    ) -> None:
+        self.redis = client or get_redis_client()
+        self.window = window
+
+    def observe(
+        self, monitor_id: int, value: int, seed: Callable[[], List[int]]
+    ) -> Optional[Tuple[int, float, float]]:
+        """
+        Returns (count, mean, stdev) of the baseline *before* `value`, or None
+        if there are fewer than MIN_SAMPLES samples, then adds `value`.
+        `seed` provides the most recent samples (newest first) when the
+        monitor has no baseline yet, e.g. after a Redis flush.
+        """
+        key = BASELINE_KEY.format(monitor_id)
+        state = cast(Dict[str, str], self.redis.hgetall(key))
+        if not state:
+            state = self._build(seed()[: self.window])
+
+        count = int(state["count"])
+        total = int(state["sum"])
+        total_sq = int(state["sumsq"])
+        pos = int(state["pos"])
+
+        stats = None
+        if count >= MIN_SAMPLES:
+            mean = total / count
+            variance = max(total_sq - total * total / count, 0) / (count - 1)
+            stats = (count, mean, math.sqrt(variance))
+
+        # Evict the oldest sample once the ring is full
+        slot = f"v{pos}"
+        if count == self.window:
+            evicted = int(state[slot])
+            total -= evicted
+            total_sq -= evicted * evicted
+        else:
+            count += 1
+
+        state.update(
+            {
+                "count": str(count),
+                "sum": str(total + value),
+                "sumsq": str(total_sq + value * value),
+                "pos": str((pos + 1) % self.window),
+                slot: str(value),
+            }
+        )
+
+        pipe = self.redis.pipeline()
+        pipe.hset(key, mapping=state)  # type: ignore[arg-type]
+        pipe.expire(key, BASELINE_TTL)
+        pipe.execute()
+
+        return stats
+
+    def reset(self, monitor_id: int) -> None:
+        self.redis.delete(BASELINE_KEY.format(monitor_id))
+
+    def _build(self, newest_first: List[int]) -> Dict[str, str]:
+        """Ring state holding `newest_first`, oldest sample in slot v0."""
+        samples = list(reversed(newest_first))
+        state = {
+            "count": str(len(samples)),
+            "sum": str(sum(samples)),
+            "sumsq": str(sum(v * v for v in samples)),
+            "pos": str(len(samples) % self.window),
+        }
+        state.update({f"v{i}": str(v) for i, v in enumerate(samples)})
+        return state
@@ -0,0 +1,87 @@
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+import dataclasses
+import time
+from urllib.parse import urlsplit
+import httpx
+from .dtos import CheckResult
+from .models import Monitor
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def target_key(monitor: Monitor) -> Hashable:
+    """
+    What a check of the monitor actually requests: monitors with equal keys
+    get the same result from one check. URLs compare normalized (case of
+    scheme and host, default ports, no fragment).
+    """
+    if monitor.monitor_type == Monitor.MonitorType.TCP:
+        target = urlsplit(monitor.url)
+        return (
+            monitor.monitor_type,
+            (target.hostname or "").rstrip("."),
+            target.port,
+            monitor.expected_banner,
+        )
+
+    url = httpx.URL(monitor.url)
+    port = None if url.port == DEFAULT_PORTS.get(url.scheme) else url.port
+    return (
+        monitor.monitor_type,
+        url.scheme,
+        url.userinfo,
+        url.host.rstrip("."),
+        port,
+        url.raw_path,
+        monitor.fresh_connection,
+    )
+
+
+class CheckCoalescer:
+    """
+    Shares checks between monitors of the same target (see target_key): a
+    check in flight, or one started less than `window` seconds ago, is
+    reused instead of sent again. A monitor waits at most `timeout`, if
+    given. Bound to one event loop, like the futures it keeps.
+    """
+
+    def __init__(
+        self, window: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.window = window
+        self.clock = clock
+        # target: (started at, check)
+        self.checks: Dict[Hashable, Tuple[float, asyncio.Future[CheckResult]]] = {}
+        self.last_sweep = clock()
+
+    async def check(
+        self,
+        monitor: Monitor,
+        run: Callable[[], Awaitable[CheckResult]],
+        timeout: Optional[float] = None,
+    ) -> CheckResult:
+        """The result of `run()` for this monitor, shared with its target."""
+        now = self.clock()
+        if now - self.last_sweep >= self.window:
+            self._sweep(now)
+
+        key = target_key(monitor)
+        entry = self.checks.get(key)
+        if entry is None or entry[1].done() and now - entry[0] >= self.window:
+            entry = (now, asyncio.ensure_future(run()))
+            self.checks[key] = entry
+
+        # Shielded: a waiter timing out does not cancel the shared check
+        result = await asyncio.wait_for(asyncio.shield(entry[1]), timeout)
+        return dataclasses.replace(result, monitor_id=monitor.id)
+
+    def _sweep(self, now: float) -> None:
+        self.last_sweep = now
+        expired = [
+            key
+            for key, (started_at, future) in self.checks.items()
+            if future.done() and now - started_at >= self.window
+        ]
+        for key in expired:
+            del self.checks[key]
@@ -0,0 +1,222 @@
+from typing import Any, Callable, Coroutine, Dict, Optional, Tuple, TypeVar
+from concurrent.futures import Future
+import asyncio
+import os
+import ssl
+import threading
+import time
+import httpx
+from django.conf import settings
+import gevent
+from gevent import monkey
+from .coalescing import CheckCoalescer
+from .politeness import HostLimiter
+from .resolver import DNSCache, PinnedTransport, dns_cache as shared_dns_cache
+
+T = TypeVar("T")
+
+
+def wait_for_future(future: "Future[T]") -> T:
+    """
+    The result of a future completed by another thread. Under gevent, only
+    the calling greenlet waits: a hub watcher, started before the callback
+    that wakes it is added, is how another thread wakes a greenlet.
+    """
+    if monkey.is_module_patched("threading"):
+        hub = gevent.get_hub()
+        waiter: gevent.hub.Waiter[Any] = gevent.hub.Waiter()
+        watcher = hub.loop.async_()
+        watcher.start(waiter.switch, None)
+        try:
+            future.add_done_callback(lambda _: watcher.send())
+            if not future.done():
+                waiter.get()
+        finally:
+            watcher.close()
+    return future.result()
+
+
+class HostPools(httpx.AsyncBaseTransport):
+    """
+    One bounded keep-alive pool per host: at most `max_connections` open to
+    a host (more requests wait for a free one), idle connections close after
+    `idle_seconds`, and so does the pool of a host idle that long. Every pool
+    shares one SSL context, so CA certificates are loaded once.
+    """
+
+    def __init__(
+        self,
+        max_connections: int,
+        idle_seconds: float,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        transport_factory: Optional[Callable[[], httpx.AsyncBaseTransport]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ssl_context = ssl_context or httpx.create_ssl_context()
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=idle_seconds,
+        )
+        self.idle_seconds = idle_seconds
+        self.transport_factory = transport_factory or self._new_transport
+        self.clock = clock
+        # (scheme, host): (last used at, transport)
+        self.pools: Dict[Tuple[str, str], Tuple[float, httpx.AsyncBaseTransport]] = {}
+        self.last_sweep = clock()
+
+    def _new_transport(self) -> httpx.AsyncBaseTransport:
+        return httpx.AsyncHTTPTransport(verify=self.ssl_context, limits=self.limits)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        now = self.clock()
+        if now - self.last_sweep >= self.idle_seconds:
+            await self.evict_idle(now)
+
+        # Pinned requests carry the address in the URL: pool by hostname, so
+        # hosts sharing an address never share a connection (nor its TLS SNI)
+        host = request.headers.get("Host") or request.url.netloc.decode()
+        key = (request.url.scheme, host)
+        entry = self.pools.get(key)
+        transport = entry[1] if entry is not None else self.transport_factory()
+        self.pools[key] = (now, transport)
+        return await transport.handle_async_request(request)
+
+    async def evict_idle(self, now: float) -> None:
+        self.last_sweep = now
+        idle = [
+            key
+            for key, (used_at, _) in self.pools.items()
+            if now - used_at >= self.idle_seconds
+        ]
+        for key in idle:
+            _, transport = self.pools.pop(key)
+            await transport.aclose()
+
+    async def aclose(self) -> None:
+        pools, self.pools = self.pools, {}
+        for _, transport in pools.values():
+            await transport.aclose()
+
+
+class RunnerConnections:
+    """
+    The runner's event loop and HTTP clients. They live as long as the
+    worker process, so keep-alive connections (and the TCP and TLS
+    handshakes they save) outlive a single batch.
+
+    The loop runs in a thread of its own, and every task of the worker
+    submits its checks to it: the runner's gevent pool runs many tasks at
+    once in one thread, where only one event loop can run. It is an OS
+    thread even under gevent, so nothing on the loop may use its default
+    executor (gevent's threads are greenlets): hosts are resolved by the
+    DNS cache, and connected to by address.
+
+    `client(fresh=True)` never reuses a connection: every request opens its
+    own, for monitors that want handshake time in their response time.
+    Checks of the same target share results through `coalescer`, and wait
+    for their turn at the host through `limiter`.
+    """
+
+    def __init__(
+        self,
+        dns_cache: Optional[DNSCache] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_connections_per_host: Optional[int] = None,
+        idle_seconds: Optional[float] = None,
+        coalesce_window: Optional[float] = None,
+    ) -> None:
+        self.dns_cache = dns_cache or shared_dns_cache
+        self.transport = transport
+        self.max_connections_per_host = (
+            max_connections_per_host or settings.RUNNER_POOL_MAX_PER_HOST
+        )
+        self.idle_seconds = idle_seconds or settings.RUNNER_POOL_IDLE_SECONDS
+        self.coalesce_window = (
+            settings.RUNNER_COALESCE_WINDOW_SECONDS
+            if coalesce_window is None
+            else coalesce_window
+        )
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.clients: Dict[bool, httpx.AsyncClient] = {}
+        self.coalescer = CheckCoalescer(self.coalesce_window)
+        self.limiter = HostLimiter()
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """
+        Runs coroutine to completion on the worker's event loop. Blocks the
+        calling thread or greenlet only: callers run their coroutines at once.
+        """
+        return wait_for_future(
+            asyncio.run_coroutine_threadsafe(coroutine, self._running_loop())
+        )
+
+    def _running_loop(self) -> asyncio.AbstractEventLoop:
+        with self.lock:
+            if self.loop is None or self.loop.is_closed() or self.pid != os.getpid():
+                # A forked worker starts over: its parent's loop thread and
+                # sockets are not its own
+                self.loop = asyncio.SelectorEventLoop(
+                    monkey.get_original("selectors", "DefaultSelector")()
+                )
+                self.clients = {}
+                self.coalescer = CheckCoalescer(self.coalesce_window)
+                self.limiter = HostLimiter()
+                self.pid = os.getpid()
+                start_thread = monkey.get_original("_thread", "start_new_thread")
+                start_thread(self._run_loop, (self.loop,))
+            return self.loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def client(self, fresh: bool = False) -> httpx.AsyncClient:
+        """The client for the running loop; pooled unless `fresh`."""
+        if fresh not in self.clients:
+            self.clients[fresh] = httpx.AsyncClient(
+                follow_redirects=True,
+                transport=PinnedTransport(self._transport(fresh), self.dns_cache),
+            )
+        return self.clients[fresh]
+
+    def _transport(self, fresh: bool) -> httpx.AsyncBaseTransport:
+        if self.transport is not None:
+            return self.transport
+        ssl_context = httpx.create_ssl_context()
+        if fresh:
+            return httpx.AsyncHTTPTransport(
+                verify=ssl_context, limits=httpx.Limits(max_keepalive_connections=0)
+            )
+        return HostPools(
+            self.max_connections_per_host, self.idle_seconds, ssl_context=ssl_context
+        )
+
+    def close(self) -> None:
+        """Closes the clients and stops the loop (its thread closes it)."""
+        loop = self.loop
+        if loop is None or loop.is_closed() or self.pid != os.getpid():
+            return
+        self.run(self._aclose())
+        loop.call_soon_threadsafe(loop.stop)
+        self.loop = None
+
+    async def _aclose(self) -> None:
+        # Shared checks nobody waits for anymore
+        pending = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        clients, self.clients = self.clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+# Shared by every batch a runner process checks
+runner_connections = RunnerConnections()
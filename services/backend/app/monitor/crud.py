@@ -1,9 +1,45 @@
-from typing import Optional, Dict, Any
-from django.db.models import QuerySet, Avg, Count, Case, When, IntegerField
+from typing import Optional, Dict, Any, Tuple, Iterable, List
+from functools import reduce
+import operator
+from django.db import connection
+from django.db.models import (
+    QuerySet,
+    Avg,
+    Count,
+    Case,
+    When,
+    IntegerField,
+    Q,
+    Min,
+    Max,
+    Sum,
+    OuterRef,
+    Subquery,
+    F,
+    FloatField,
+    Window,
+)
+from django.db.models.functions import Cast, Extract, Floor, Least, RowNumber
 from datetime import datetime, timedelta
 from django.utils import timezone
 from common.crud import FullCRUD
-from .models import Monitor, MonitorResult
+from .dtos import PHASES
+from .models import Monitor, MonitorResult, MonitorRollup
+from .rollups import (
+    DAY,
+    HOUR,
+    RollupAccumulator,
+    SKETCH_SIZE,
+    cover,
+    floor_to,
+    sketch_quantile,
+)
+
+HISTORY_PERIODS = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+}
 
 
 class MonitorResultCRUD(FullCRUD[MonitorResult]):
@@ -31,6 +67,30 @@ class MonitorResultCRUD(FullCRUD[MonitorResult]):
             self.model.objects.filter(monitor=monitor).order_by("-created_at").first()
         )
 
+    def get_last_checks(self, monitor_ids: List[int]) -> Dict[int, MonitorResult]:
+        """
+        Latest result of each monitor, in one query: a LIMIT 1 probe of the
+        (monitor, -created_at) index per monitor.
+        """
+        latest = (
+            self.model.objects.filter(  # type: ignore[attr-defined]
+                monitor_id=OuterRef("pk")
+            )
+            .order_by("-created_at")
+            .values("id")[:1]
+        )
+        last_ids = (
+            Monitor.objects.filter(id__in=monitor_ids)
+            .annotate(last_id=Subquery(latest))
+            .values("last_id")
+        )
+        return {
+            result.monitor_id: result
+            for result in self.model.objects.filter(  # type: ignore[attr-defined]
+                id__in=last_ids
+            )
+        }
+
     def get_history(
         self, monitor: Monitor, period: Optional[str] = None
     ) -> QuerySet[MonitorResult]:
@@ -38,13 +98,43 @@ class MonitorResultCRUD(FullCRUD[MonitorResult]):
             monitor=monitor
         ).order_by("-created_at")
 
-        if period == "24h":
+        if period in HISTORY_PERIODS:
             queryset = queryset.filter(
-                created_at__gte=timezone.now() - timedelta(hours=24)
+                created_at__gte=timezone.now() - HISTORY_PERIODS[period]
             )
 
         return queryset
 
+    def get_history_buckets(
+        self,
+        queryset: QuerySet[MonitorResult],
+        start_time: datetime,
+        width: float,
+        buckets: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregates a history queryset into `buckets` buckets of `width`
+        seconds from start_time, in SQL: one row per non-empty bucket
+        (numbered from 0), oldest first.
+        """
+        offset = Extract("created_at", "epoch") - start_time.timestamp()
+        bucket = Least(Cast(Floor(offset / width), IntegerField()), buckets - 1)
+        rows = (
+            queryset.filter(response_time_ms__isnull=False)
+            .order_by()
+            .annotate(bucket=bucket)
+            .values("bucket")
+            .annotate(
+                checks=Count("id"),
+                up_count=Count("id", filter=Q(is_up=True)),
+                min_latency=Min("response_time_ms"),
+                avg_latency=Avg("response_time_ms"),
+                max_latency=Max("response_time_ms"),
+            )
+            .order_by("bucket")
+        )
+        return [dict(row) for row in rows]
+
     def get_recent_failures(self, user: Any, limit: int = 5) -> QuerySet[MonitorResult]:
         return (  # type: ignore[attr-defined]
             self.model.objects.filter(monitor__user=user, is_up=False)
@@ -52,6 +142,33 @@ class MonitorResultCRUD(FullCRUD[MonitorResult]):
             .order_by("-created_at")[:limit]
         )
 
+    def get_latency_window(
+        self, start_time: datetime, max_samples: int
+    ) -> List[Tuple[int, Optional[int]]]:
+        """
+        (monitor_id, response_time_ms) of the latest `max_samples` successful
+        checks of each active monitor since start_time, ordered by monitor and
+        then oldest first. The cap is applied in SQL (ROW_NUMBER per monitor).
+        """
+        return list(
+            self.model.objects.filter(  # type: ignore[attr-defined]
+                created_at__gte=start_time,
+                is_up=True,
+                monitor__is_active=True,
+                response_time_ms__isnull=False,
+            )
+            .annotate(
+                rank=Window(
+                    RowNumber(),
+                    partition_by="monitor_id",
+                    order_by=(F("created_at").desc(), F("id").desc()),
+                )
+            )
+            .filter(rank__lte=max_samples)
+            .order_by("monitor_id", "created_at", "id")
+            .values_list("monitor_id", "response_time_ms")
+        )
+
 
 class MonitorCRUD(FullCRUD[Monitor]):
     model = Monitor
@@ -66,3 +183,342 @@ class MonitorCRUD(FullCRUD[Monitor]):
 
     def count_by_user(self, user: Any, is_active: Optional[bool] = None) -> int:
         return self.filter_by_user(user, is_active).count()
+
+    def get_status_counts(self, user: Any) -> Dict[str, int]:
+        """Monitor counts of a user for the dashboard, in one aggregate."""
+        active = Q(is_active=True)
+        return self.model.objects.filter(  # type: ignore[attr-defined,no-any-return]
+            user=user
+        ).aggregate(
+            total=Count("id"),
+            active=Count("id", filter=active),
+            up=Count("id", filter=active & Q(status=Monitor.StatusType.UP)),
+            down=Count("id", filter=active & Q(status=Monitor.StatusType.DOWN)),
+        )
+
+    def record_check(
+        self,
+        monitor_id: int,
+        status: str,
+        checked_at: datetime,
+        status_code: Optional[int] = None,
+        response_time_ms: Optional[int] = None,
+    ) -> Optional[Tuple[str, Monitor]]:
+        """
+        Sets status/last_checked_at and the latest-result fields in one
+        atomic UPDATE ... RETURNING and bypasses Monitor.save(). Returns
+        (previous_status, monitor) where the monitor only carries the fields
+        alerting needs, or None if missing.
+        """
+        table = self.model._meta.db_table
+        is_up = int(status == Monitor.StatusType.UP)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {table} AS m
+                SET status = %s, last_checked_at = %s, updated_at = %s,
+                    last_status_code = %s, last_response_time_ms = %s,
+                    recent_checks = ((m.recent_checks << 1) | %s) & %s,
+                    recent_checks_count = LEAST(m.recent_checks_count + 1, %s)
+                FROM (
+                    SELECT id, status FROM {table} WHERE id = %s FOR UPDATE
+                ) AS prev
+                WHERE m.id = prev.id
+                RETURNING prev.status, m.user_id, m.name, m.url
+                """,
+                [
+                    status,
+                    checked_at,
+                    checked_at,
+                    status_code,
+                    response_time_ms,
+                    is_up,
+                    (1 << Monitor.RECENT_CHECKS) - 1,
+                    Monitor.RECENT_CHECKS,
+                    monitor_id,
+                ],
+            )
+            row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        previous_status, user_id, name, url = row
+        monitor = self.model(
+            id=monitor_id,
+            user_id=user_id,
+            name=name,
+            url=url,
+            status=status,
+            last_checked_at=checked_at,
+            last_status_code=status_code,
+            last_response_time_ms=response_time_ms,
+        )
+        return previous_status, monitor
+
+    def lock_many(self, monitor_ids: Iterable[int]) -> Dict[int, Monitor]:
+        """
+        Locks the given monitors (in id order, to avoid deadlocks between
+        concurrent writers) and returns them keyed by id. Must run inside
+        a transaction.
+        """
+        queryset = (
+            self.model.objects.select_for_update()  # type: ignore[attr-defined]
+            .filter(id__in=set(monitor_ids))
+            .only(
+                "id",
+                "user_id",
+                "name",
+                "url",
+                "status",
+                "last_checked_at",
+                "recent_checks",
+                "recent_checks_count",
+            )
+            .order_by("id")
+        )
+        return {monitor.id: monitor for monitor in queryset}
+
+
+class MonitorRollupCRUD(FullCRUD[MonitorRollup]):
+    model = MonitorRollup
+
+    def record(self, results: Iterable[MonitorResult]) -> None:
+        """
+        Adds saved results to their minute, hour and day rollups with one
+        INSERT ... ON CONFLICT DO UPDATE (one row per touched bucket).
+        """
+        accumulator = RollupAccumulator()
+        for result in results:
+            accumulator.add(
+                result.monitor_id,
+                result.created_at,
+                result.is_up,
+                result.response_time_ms,
+                [getattr(result, f"{phase}_ms") for phase in PHASES],
+            )
+        if not accumulator:
+            return
+
+        rows = list(accumulator.rows())
+        table = self.model._meta.db_table
+        placeholders = ", ".join(["%s"] * len(rows[0]))
+        values = ", ".join([f"({placeholders})"] * len(rows))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} AS r (
+                    monitor_id, granularity, bucket_start, checks, up_count,
+                    latency_count, latency_sum, latency_min, latency_max,
+                    latency_sketch, phase_counts, phase_sums
+                )
+                VALUES {values}
+                ON CONFLICT (monitor_id, granularity, bucket_start) DO UPDATE SET
+                    checks = r.checks + EXCLUDED.checks,
+                    up_count = r.up_count + EXCLUDED.up_count,
+                    latency_count = r.latency_count + EXCLUDED.latency_count,
+                    latency_sum = r.latency_sum + EXCLUDED.latency_sum,
+                    latency_min = LEAST(r.latency_min, EXCLUDED.latency_min),
+                    latency_max = GREATEST(r.latency_max, EXCLUDED.latency_max),
+                    latency_sketch = ARRAY(
+                        SELECT COALESCE(a, 0) + COALESCE(b, 0)
+                        FROM unnest(r.latency_sketch, EXCLUDED.latency_sketch)
+                            WITH ORDINALITY AS s(a, b, i)
+                        ORDER BY i
+                    ),
+                    phase_counts = ARRAY(
+                        SELECT COALESCE(a, 0) + COALESCE(b, 0)
+                        FROM unnest(r.phase_counts, EXCLUDED.phase_counts)
+                            WITH ORDINALITY AS s(a, b, i)
+                        ORDER BY i
+                    ),
+                    phase_sums = ARRAY(
+                        SELECT COALESCE(a, 0) + COALESCE(b, 0)
+                        FROM unnest(r.phase_sums, EXCLUDED.phase_sums)
+                            WITH ORDINALITY AS s(a, b, i)
+                        ORDER BY i
+                    )
+                """,
+                [value for row in rows for value in row],
+            )
+
+    def rebuild(
+        self, start_time: datetime, end_time: datetime, chunk_size: int = 5000
+    ) -> int:
+        """
+        Recomputes the rollups from raw results, starting at the day of
+        start_time. Results saved after end_time are already counted by the
+        live ingestion path and are not replayed. Returns the number of
+        results replayed.
+        """
+        start_time = floor_to(start_time, DAY)
+        self.model.objects.filter(  # type: ignore[attr-defined]
+            bucket_start__gte=start_time
+        ).delete()
+
+        results = (
+            MonitorResult.objects.filter(
+                created_at__gte=start_time, created_at__lt=end_time
+            )
+            .only(
+                "monitor_id",
+                "created_at",
+                "is_up",
+                "response_time_ms",
+                *(f"{phase}_ms" for phase in PHASES),
+            )
+            .order_by("monitor_id", "created_at")
+            .iterator(chunk_size=chunk_size)
+        )
+
+        replayed = 0
+        chunk: List[MonitorResult] = []
+        for result in results:
+            chunk.append(result)
+            if len(chunk) >= chunk_size:
+                self.record(chunk)
+                replayed += len(chunk)
+                chunk = []
+        self.record(chunk)
+        return replayed + len(chunk)
+
+    def get_stats_aggregate(
+        self, monitor: Monitor, start_time: datetime, end_time: datetime
+    ) -> Dict[str, Any]:
+        """
+        Same keys as MonitorResultCRUD.get_stats_aggregate (plus p95_latency
+        and avg_timings, the average of each phase over the checks timing it),
+        read from the coarsest rollups that cover [start_time, end_time).
+        At most a few hundred rows, however long the period.
+        """
+        return self.get_stats_aggregates([monitor.id], start_time, end_time)[monitor.id]
+
+    def get_stats_aggregates(
+        self, monitor_ids: List[int], start_time: datetime, end_time: datetime
+    ) -> Dict[int, Dict[str, Any]]:
+        """get_stats_aggregate of several monitors with a single query."""
+        stats: Dict[int, Dict[str, Any]] = {
+            monitor_id: {
+                "total_checks": 0,
+                "up_count": 0,
+                "down_count": 0,
+                "avg_latency": None,
+                "p95_latency": None,
+                "avg_timings": dict.fromkeys(PHASES),
+            }
+            for monitor_id in monitor_ids
+        }
+        condition = self._cover_condition(start_time, end_time)
+        if condition is None or not monitor_ids:
+            return stats
+
+        rows = self.model.objects.filter(  # type: ignore[attr-defined]
+            condition, monitor_id__in=monitor_ids
+        ).values_list(
+            "monitor_id",
+            "checks",
+            "up_count",
+            "latency_count",
+            "latency_sum",
+            "latency_sketch",
+            "phase_counts",
+            "phase_sums",
+        )
+
+        # monitor_id: [checks, up_count, latency_count, latency_sum], sketch,
+        # per phase [count, sum]
+        totals: Dict[int, List[int]] = {}
+        sketches: Dict[int, List[int]] = {}
+        phases: Dict[int, List[List[int]]] = {}
+        for (
+            monitor_id,
+            checks,
+            up_count,
+            count,
+            summed,
+            bucket_sketch,
+            phase_counts,
+            phase_sums,
+        ) in rows:
+            total = totals.setdefault(monitor_id, [0, 0, 0, 0])
+            total[0] += checks
+            total[1] += up_count
+            total[2] += count
+            total[3] += summed
+            sketch = sketches.setdefault(monitor_id, [0] * SKETCH_SIZE)
+            for index, value in enumerate(bucket_sketch):
+                sketch[index] += value
+            phase = phases.setdefault(monitor_id, [[0, 0] for _ in PHASES])
+            for index, (phase_count, phase_sum) in enumerate(
+                zip(phase_counts, phase_sums)
+            ):
+                phase[index][0] += phase_count
+                phase[index][1] += phase_sum
+
+        for monitor_id, (checks, up, latency_count, latency_sum) in totals.items():
+            if not checks:
+                continue
+            stats[monitor_id] = {
+                "total_checks": checks,
+                "up_count": up,
+                "down_count": checks - up,
+                "avg_latency": latency_sum / latency_count if latency_count else None,
+                "p95_latency": sketch_quantile(sketches[monitor_id], 0.95),
+                "avg_timings": {
+                    name: summed / count if count else None
+                    for name, (count, summed) in zip(PHASES, phases[monitor_id])
+                },
+            }
+        return stats
+
+    def get_daily_hour_averages(
+        self, hour_start: datetime, days: int
+    ) -> List[Tuple[int, float]]:
+        """
+        (monitor_id, avg latency) of the hour starting at hour_start on each
+        of the previous `days` days, from the hourly rollups of active
+        monitors: one row per monitor and day, ordered by monitor and day.
+        """
+        return list(
+            self.model.objects.filter(  # type: ignore[attr-defined]
+                granularity=HOUR,
+                bucket_start__in=[
+                    hour_start - timedelta(days=day) for day in range(days, 0, -1)
+                ],
+                latency_count__gt=0,
+                monitor__is_active=True,
+            )
+            .annotate(
+                avg_latency=Cast("latency_sum", FloatField()) / F("latency_count")
+            )
+            .order_by("monitor_id", "bucket_start")
+            .values_list("monitor_id", "avg_latency")
+        )
+
+    def get_user_hourly_latency(
+        self, user: Any, since: datetime
+    ) -> List[Tuple[datetime, int, int]]:
+        """(hour, latency_count, latency_sum) over all monitors of a user."""
+        return list(
+            self.model.objects.filter(  # type: ignore[attr-defined]
+                monitor__user=user, granularity=HOUR, bucket_start__gte=since
+            )
+            .values("bucket_start")
+            .annotate(count=Sum("latency_count"), total=Sum("latency_sum"))
+            .order_by("bucket_start")
+            .values_list("bucket_start", "count", "total")
+        )
+
+    def _cover_condition(self, start_time: datetime, end_time: datetime) -> Optional[Q]:
+        """Rollup rows covering [start_time, end_time), see rollups.cover."""
+        ranges = cover(start_time, end_time)
+        if not ranges:
+            return None
+
+        return reduce(
+            operator.or_,
+            (
+                Q(granularity=granularity, bucket_start__gte=lo, bucket_start__lt=hi)
+                for granularity, lo, hi in ranges
+            ),
+        )
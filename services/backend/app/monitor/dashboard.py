@@ -0,0 +1,218 @@
+from typing import Any, Counter, Dict, Iterable, List, Optional, Tuple
+from collections import defaultdict
+from datetime import datetime, timedelta
+import json
+import redis
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from common.redis_client import get_redis_client
+from .models import Monitor, MonitorResult
+from .rollups import HOUR, floor_to
+
+# Hash per user: built, total, active, up, down and per-hour latency
+# sum:<epoch>/count:<epoch>; the recent failures are a capped list of JSON
+SUMMARY_KEY = "monitor:summary:{}"
+FAILURES_KEY = "monitor:summary:{}:failures"
+RECENT_FAILURES = 5
+
+# (previous status, monitor, saved result) as recorded by the ingestion path
+SummaryUpdate = Tuple[str, Monitor, MonitorResult]
+
+# Applies the updates of one user to their summary (KEYS[1]) and recent
+# failures (KEYS[2]), only if the summary is built: updates on a missing one
+# would linger without a TTL. ARGV: the number of hash increments, the
+# (field, step) pairs, the epoch hour before which latency fields are dropped,
+# the failures to keep, then the new failures, oldest first.
+RECORD = """
+if redis.call('HEXISTS', KEYS[1], 'built') == 0 then
+    return 0
+end
+local n = tonumber(ARGV[1])
+for i = 0, n - 1 do
+    redis.call('HINCRBY', KEYS[1], ARGV[2 + 2 * i], ARGV[3 + 2 * i])
+end
+
+local since = tonumber(ARGV[2 + 2 * n])
+for _, field in ipairs(redis.call('HKEYS', KEYS[1])) do
+    local hour = string.match(field, '^%a+:(%d+)$')
+    if hour and tonumber(hour) < since then
+        redis.call('HDEL', KEYS[1], field)
+    end
+end
+
+local first_failure = 4 + 2 * n
+if #ARGV >= first_failure then
+    for i = first_failure, #ARGV do
+        redis.call('LPUSH', KEYS[2], ARGV[i])
+    end
+    redis.call('LTRIM', KEYS[2], 0, tonumber(ARGV[3 + 2 * n]) - 1)
+    local ttl = redis.call('TTL', KEYS[1])
+    if ttl > 0 then
+        redis.call('EXPIRE', KEYS[2], ttl)
+    end
+end
+return 1
+"""
+
+
+def failure_entry(result: MonitorResult, monitor: Monitor) -> Dict[str, Any]:
+    return {
+        "id": result.id,
+        "monitor_name": monitor.name,
+        "url": monitor.url,
+        "code": result.status_code,
+        "created_at": result.created_at,
+        "reason": (
+            "Timeout" if result.status_code == 0 else f"{result.status_code} Error"
+        ),
+    }
+
+
+class DashboardSummary:
+    """
+    Live dashboard numbers per user, pushed by the ingestion path: status
+    counts, rolling 24h latency per hour and the recent failures. Reading
+    them is a single Redis round trip.
+
+    A summary is built from the database on the first read and rebuilt once
+    its TTL runs out, which also corrects any drift. Monitor edits drop it.
+    """
+
+    def __init__(
+        self, client: Optional[redis.Redis] = None, ttl: Optional[int] = None
+    ) -> None:
+        self.redis = client or get_redis_client()
+        self.ttl = ttl or settings.DASHBOARD_SUMMARY_TTL_SECONDS
+
+    def get(
+        self, user_id: int, now: Optional[datetime] = None
+    ) -> Optional[Dict[str, Any]]:
+        """The dashboard statistics, or None if the summary must be built."""
+        with self.redis.pipeline() as pipe:
+            pipe.hgetall(SUMMARY_KEY.format(user_id))
+            pipe.lrange(FAILURES_KEY.format(user_id), 0, RECENT_FAILURES - 1)
+            state, failures = pipe.execute()
+
+        # Updates on a missing summary leave a partial hash behind
+        if "built" not in state:
+            return None
+        return self._summarize(state, [json.loads(f) for f in failures], now)
+
+    def build(
+        self,
+        user_id: int,
+        counts: Dict[str, int],
+        latency: Iterable[Tuple[datetime, int, int]],
+        failures: List[Dict[str, Any]],
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Replaces the summary of a user with database state: monitor counts,
+        (hour, latency_count, latency_sum) of the last 24h and the most
+        recent failures, newest first. Returns the dashboard statistics.
+        """
+        state: Dict[str, int] = {"built": 1, **counts}
+        for hour, count, total in latency:
+            state[f"count:{int(hour.timestamp())}"] = count
+            state[f"sum:{int(hour.timestamp())}"] = total
+        encoded = [json.dumps(f, cls=DjangoJSONEncoder) for f in failures]
+
+        key, failures_key = SUMMARY_KEY.format(user_id), FAILURES_KEY.format(user_id)
+        with self.redis.pipeline() as pipe:
+            pipe.delete(key, failures_key)
+            pipe.hset(key, mapping=state)
+            pipe.expire(key, self.ttl)
+            if encoded:
+                pipe.rpush(failures_key, *encoded[:RECENT_FAILURES])
+                pipe.expire(failures_key, self.ttl)
+            pipe.execute()
+
+        return self._summarize(
+            {field: str(value) for field, value in state.items()},
+            [json.loads(f) for f in encoded[:RECENT_FAILURES]],
+            now,
+        )
+
+    def record(
+        self, updates: Iterable[SummaryUpdate], now: Optional[datetime] = None
+    ) -> None:
+        """
+        Applies saved results to their users' built summaries in one round
+        trip, dropping latency hours that fell out of the 24h window.
+        """
+        increments: Dict[int, Counter[str]] = defaultdict(Counter)
+        failures: Dict[int, List[str]] = defaultdict(list)
+        for previous_status, monitor, result in updates:
+            steps = increments[monitor.user_id]
+            new_status: str = (
+                Monitor.StatusType.UP if result.is_up else Monitor.StatusType.DOWN
+            )
+            if previous_status != new_status:
+                for status, step in ((previous_status, -1), (new_status, 1)):
+                    if status in (Monitor.StatusType.UP, Monitor.StatusType.DOWN):
+                        steps[status.lower()] += step
+
+            if result.response_time_ms is not None:
+                hour = int(floor_to(result.created_at, HOUR).timestamp())
+                steps[f"count:{hour}"] += 1
+                steps[f"sum:{hour}"] += result.response_time_ms
+
+            if not result.is_up:
+                entry = failure_entry(result, monitor)
+                failures[monitor.user_id].append(
+                    json.dumps(entry, cls=DjangoJSONEncoder)
+                )
+
+        since = floor_to((now or timezone.now()) - timedelta(hours=24), HOUR)
+        apply = self.redis.register_script(RECORD)
+        with self.redis.pipeline() as pipe:
+            for user_id in increments.keys() | failures.keys():
+                steps = increments[user_id]
+                args: List[Any] = [len(steps)]
+                for field, step in steps.items():
+                    args += [field, step]
+                args += [int(since.timestamp()), RECENT_FAILURES]
+                args += failures[user_id]
+                apply(
+                    keys=[SUMMARY_KEY.format(user_id), FAILURES_KEY.format(user_id)],
+                    args=args,
+                    client=pipe,
+                )
+            pipe.execute()
+
+    def invalidate(self, *user_ids: int) -> None:
+        keys = [SUMMARY_KEY.format(user_id) for user_id in user_ids]
+        keys += [FAILURES_KEY.format(user_id) for user_id in user_ids]
+        if keys:
+            self.redis.delete(*keys)
+
+    def _summarize(
+        self,
+        state: Dict[str, str],
+        failures: List[Dict[str, Any]],
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        since = floor_to((now or timezone.now()) - timedelta(hours=24), HOUR)
+        latency_count = latency_sum = 0
+        for field, value in state.items():
+            kind, _, hour = field.partition(":")
+            if not hour or int(hour) < since.timestamp():
+                continue
+            if kind == "count":
+                latency_count += int(value)
+            elif kind == "sum":
+                latency_sum += int(value)
+
+        total, up, down = int(state["total"]), int(state["up"]), int(state["down"])
+        return {
+            "total": total,
+            "active": int(state["active"]),
+            "up": up,
+            "down": down,
+            "paused": total - up - down,
+            "avg_latency": (
+                round(latency_sum / latency_count, 2) if latency_count else 0.0
+            ),
+            "recent_failures": failures,
+        }
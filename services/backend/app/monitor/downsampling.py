@@ -0,0 +1,45 @@
+import numpy as np
+import numpy.typing as npt
+
+IntArray = npt.NDArray[np.int64]
+
+# Points per graph series
+DEFAULT_POINTS = 300
+MAX_POINTS = 1000
+GRAPH_METHODS = ("buckets", "lttb")
+
+
+def lttb(x: npt.ArrayLike, y: npt.ArrayLike, threshold: int) -> IntArray:
+    """
+    Largest-Triangle-Three-Buckets: indices of at most `threshold` points of
+    the series (x ascending) that keep its visual shape, spikes included.
+    The first and last points are always kept.
+    """
+    xs = np.asarray(x, dtype=np.float64)
+    ys = np.asarray(y, dtype=np.float64)
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return np.arange(n, dtype=np.int64)
+
+    # Inner points are split in threshold - 2 buckets of equal size
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (the last point for the last bucket)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        next_x = xs[next_start:next_end].mean()
+        next_y = ys[next_start:next_end].mean()
+
+        # Twice the area of the triangle (previous, candidate, next average)
+        area = np.abs(
+            (xs[previous] - next_x) * (ys[start:end] - ys[previous])
+            - (xs[previous] - xs[start:end]) * (next_y - ys[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+
+    return selected
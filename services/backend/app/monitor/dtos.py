@@ -0,0 +1,73 @@
+from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from django.utils import timezone
+
+# Phases of a check, in order; MonitorResult stores each as <phase>_ms
+PHASES = ("dns", "connect", "tls", "ttfb", "transfer")
+
+
+@dataclass
+class CheckTimings:
+    """
+    Milliseconds spent in each phase of a check (summed over redirects).
+    None when a phase did not happen, e.g. connect and tls on a reused
+    connection, or did not complete because the check failed in it.
+    """
+
+    dns: Optional[int] = None
+    connect: Optional[int] = None
+    tls: Optional[int] = None
+    ttfb: Optional[int] = None
+    transfer: Optional[int] = None
+
+    def as_fields(self) -> Dict[str, Optional[int]]:
+        """The MonitorResult fields of these timings."""
+        return {f"{phase}_ms": getattr(self, phase) for phase in PHASES}
+
+
+@dataclass
+class CheckResult:
+    """Outcome of a single monitor check, as produced by the Runner."""
+
+    monitor_id: int
+    is_up: bool
+    response_time_ms: int
+    # None for up TCP checks (no HTTP status); 0 when the check failed
+    status_code: Optional[int]
+    timings: CheckTimings = field(default_factory=CheckTimings)
+    # PING: percentage of echo requests left unanswered
+    packet_loss: Optional[int] = None
+    # When the check completed; results are written later, in batches
+    checked_at: datetime = field(default_factory=timezone.now, compare=False)
+
+
+@dataclass
+class PingStats:
+    """Echo requests sent to one address, the replies and their RTTs."""
+
+    sent: int = 0
+    received: int = 0
+    rtts_ms: List[float] = field(default_factory=list)
+
+    @property
+    def loss(self) -> int:
+        """Percentage of requests left unanswered."""
+        if not self.sent:
+            return 100
+        return round((self.sent - self.received) / self.sent * 100)
+
+    @property
+    def avg_rtt_ms(self) -> Optional[float]:
+        return sum(self.rtts_ms) / len(self.rtts_ms) if self.rtts_ms else None
+
+
+@dataclass
+class FleetAnomaly:
+    """A monitor flagged by the fleet-wide latency detector."""
+
+    monitor_id: int
+    current: float
+    median: float
+    score: float
+    seasonal: Optional[float] = None
@@ -0,0 +1,288 @@
+from typing import List, Optional, Sequence
+from urllib.parse import urlsplit
+import asyncio
+import logging
+import time
+import httpx
+from django.conf import settings
+from .dtos import CheckResult, CheckTimings
+from .models import Monitor
+from .connections import RunnerConnections, runner_connections
+from .icmp import PingProber
+from .politeness import HostLimiter
+from .resolver import DNSCache, IPAddress
+from .timings import PhaseTimer
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "StatusHawk Monitor/1.0"
+CHECK_TIMEOUT = 10
+# Bytes of a TCP server's greeting searched for the expected banner
+BANNER_BYTES = 1024
+
+
+def _elapsed_ms(since: float) -> int:
+    return round((time.perf_counter() - since) * 1000)
+
+
+class AsyncCheckEngine:
+    """
+    Checks a batch of monitors concurrently on the worker's event loop.
+    Requests go through the worker's pooled clients (see RunnerConnections),
+    and connect to the address the DNS cache resolved and vetted for the
+    host. A transport or DNS cache of its own gives the engine private
+    connections, closed after each run.
+
+    Responses are streamed: only the status code is used, so a check reads
+    at most max_body_bytes of the body and memory per check stays bounded.
+    TCP monitors are plain socket connects on the same loop, and PING
+    monitors of a batch are probed together (see PingProber).
+
+    HTTP and TCP checks wait for their turn at the target host (see
+    HostLimiter) without taking a concurrency slot of the batch; only the
+    check itself counts against the timeout and its response time.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        timeout: float = CHECK_TIMEOUT,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        dns_cache: Optional[DNSCache] = None,
+        connections: Optional[RunnerConnections] = None,
+        max_body_bytes: Optional[int] = None,
+        prober: Optional[PingProber] = None,
+        limiter: Optional[HostLimiter] = None,
+    ) -> None:
+        self.concurrency = concurrency or settings.RUNNER_BATCH_CONCURRENCY
+        self.timeout = timeout
+        self.max_body_bytes = (
+            settings.RUNNER_MAX_BODY_BYTES if max_body_bytes is None else max_body_bytes
+        )
+        self.owns_connections = connections is None and (
+            transport is not None or dns_cache is not None
+        )
+        if self.owns_connections:
+            connections = RunnerConnections(dns_cache, transport)
+        self.connections = connections or runner_connections
+        self.prober = prober or PingProber()
+        # None: the limiter of the connections' loop
+        self.limiter = limiter
+
+    def run(self, monitors: Sequence[Monitor]) -> List[CheckResult]:
+        """Blocking entrypoint used by the Celery task."""
+        if not monitors:
+            return []
+        try:
+            return self.connections.run(self.check_many(monitors))
+        finally:
+            if self.owns_connections:
+                self.connections.close()
+
+    async def check_many(self, monitors: Sequence[Monitor]) -> List[CheckResult]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(monitor: Monitor) -> CheckResult:
+            return await self.check_coalesced(monitor, semaphore)
+
+        # PING monitors are probed together, the others one by one
+        is_ping = [m.monitor_type == Monitor.MonitorType.PING for m in monitors]
+        ping_results, other_results = await asyncio.gather(
+            self.check_pings([m for m, ping in zip(monitors, is_ping) if ping]),
+            asyncio.gather(
+                *(bounded(m) for m, ping in zip(monitors, is_ping) if not ping)
+            ),
+        )
+        by_monitor = {r.monitor_id: r for r in [*ping_results, *other_results]}
+        return [by_monitor[monitor.id] for monitor in monitors]
+
+    async def check_coalesced(
+        self, monitor: Monitor, semaphore: asyncio.Semaphore
+    ) -> CheckResult:
+        """
+        Checks an HTTP or TCP monitor, sharing the check with monitors of the
+        same target (see CheckCoalescer). Down if no result within timeout.
+        """
+        try:
+            return await self.connections.coalescer.check(
+                monitor, lambda: self.check_politely(monitor, semaphore)
+            )
+        except TimeoutError:
+            logger.warning(f"Monitor {monitor.url} timed out")
+            return CheckResult(
+                monitor_id=monitor.id,
+                is_up=False,
+                response_time_ms=round(self.timeout * 1000),
+                status_code=0,
+            )
+
+    async def check_politely(
+        self, monitor: Monitor, semaphore: asyncio.Semaphore
+    ) -> CheckResult:
+        """Checks the monitor once its host may take another check."""
+        limiter = self.limiter or self.connections.limiter
+        async with limiter.slot(urlsplit(monitor.url).hostname or ""):
+            async with semaphore, asyncio.timeout(self.timeout):
+                return await self.check_target(monitor)
+
+    async def check_target(self, monitor: Monitor) -> CheckResult:
+        if monitor.monitor_type == Monitor.MonitorType.TCP:
+            return await self.check_tcp(monitor)
+        client = self.connections.client(fresh=monitor.fresh_connection)
+        return await self.check_one(client, monitor)
+
+    async def check_one(
+        self, client: httpx.AsyncClient, monitor: Monitor
+    ) -> CheckResult:
+        timer = PhaseTimer()
+        start_time = time.perf_counter()
+        try:
+            async with client.stream(
+                "GET",
+                monitor.url,
+                headers={"User-Agent": USER_AGENT},
+                timeout=self.timeout,
+                extensions={"trace": timer.trace},
+            ) as response:
+                status_code = response.status_code
+                is_up = 200 <= status_code < 300
+                await self.read_body(response, timer)
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            status_code = 0
+            is_up = False
+            logger.warning(f"Monitor {monitor.url} failed with exception: {e}")
+
+        duration_ms = int((time.perf_counter() - start_time) * 1000)
+        # On failure: the phases completed before it (the failed one is left out)
+        timings = timer.timings()
+        logger.debug(
+            f"Monitor {monitor.url} responded with status_code={status_code} "
+            f"in {duration_ms}ms ({timings})"
+        )
+
+        return CheckResult(
+            monitor_id=monitor.id,
+            is_up=is_up,
+            response_time_ms=duration_ms,
+            status_code=status_code,
+            timings=timings,
+        )
+
+    async def read_body(self, response: httpx.Response, timer: PhaseTimer) -> int:
+        """
+        Reads and discards the body up to max_body_bytes (none when 0). A body
+        that fits is drained, so its connection can be reused; a longer one
+        is cut off after the chunk that exceeds the cap, closing the
+        connection. Returns bytes read.
+        """
+        received = 0
+        # Raw bytes: a capped read never inflates a compressed body
+        if self.max_body_bytes > 0 and not response.is_stream_consumed:
+            async for chunk in response.aiter_raw():
+                received += len(chunk)
+                if received > self.max_body_bytes:
+                    break
+        # A cut-off transfer ends here: closing the stream reports it failed
+        await timer.trace("runner.receive_response_body.complete", {})
+        return received
+
+    async def check_tcp(self, monitor: Monitor) -> CheckResult:
+        """
+        Port liveness of a tcp://host:port monitor: a non-blocking connect to
+        the vetted address and, if the monitor expects a banner, a read of
+        the server's greeting. Up results carry no status code.
+        """
+        target = urlsplit(monitor.url)
+        timings = CheckTimings()
+        status_code: Optional[int] = None
+        start_time = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout):
+                ip = await self.connections.dns_cache.resolve(target.hostname or "")
+                timings.dns = _elapsed_ms(start_time)
+
+                connect_start = time.perf_counter()
+                reader, writer = await asyncio.open_connection(str(ip), target.port)
+                timings.connect = _elapsed_ms(connect_start)
+                try:
+                    is_up = True
+                    if monitor.expected_banner:
+                        banner_start = time.perf_counter()
+                        banner = await reader.read(BANNER_BYTES)
+                        timings.ttfb = _elapsed_ms(banner_start)
+                        is_up = monitor.expected_banner.encode() in banner
+                finally:
+                    writer.close()
+        except (OSError, TimeoutError, ValueError, httpx.ConnectError) as e:
+            is_up = False
+            status_code = 0
+            logger.warning(f"Monitor {monitor.url} failed with exception: {e}")
+
+        duration_ms = _elapsed_ms(start_time)
+        logger.debug(
+            f"Monitor {monitor.url} is_up={is_up} in {duration_ms}ms ({timings})"
+        )
+
+        return CheckResult(
+            monitor_id=monitor.id,
+            is_up=is_up,
+            response_time_ms=duration_ms,
+            status_code=status_code,
+            timings=timings,
+        )
+
+    async def check_pings(self, monitors: Sequence[Monitor]) -> List[CheckResult]:
+        """
+        Pings the hosts of PING monitors in one PingProber run (monitors of
+        the same address share its probes). Up while any reply arrives; the
+        response time is the average round trip.
+        """
+        if not monitors:
+            return []
+
+        start_time = time.perf_counter()
+        addresses = await asyncio.gather(*(self._ping_address(m) for m in monitors))
+        try:
+            stats = await self.prober.probe(
+                list({address for address in addresses if address is not None})
+            )
+        except OSError as e:
+            logger.error(f"Cannot open ICMP sockets, PING checks fail: {e}")
+            stats = {}
+        duration_ms = _elapsed_ms(start_time)
+
+        results = []
+        for monitor, address in zip(monitors, addresses):
+            ping = stats.get(address) if address is not None else None
+            if ping is None or ping.avg_rtt_ms is None:
+                results.append(
+                    CheckResult(
+                        monitor_id=monitor.id,
+                        is_up=False,
+                        response_time_ms=duration_ms,
+                        status_code=0,
+                        packet_loss=ping.loss if ping is not None else None,
+                    )
+                )
+                continue
+
+            results.append(
+                CheckResult(
+                    monitor_id=monitor.id,
+                    is_up=True,
+                    response_time_ms=round(ping.avg_rtt_ms),
+                    status_code=None,
+                    packet_loss=ping.loss,
+                )
+            )
+        return results
+
+    async def _ping_address(self, monitor: Monitor) -> Optional[IPAddress]:
+        """The vetted address to ping for a monitor, None if there is none."""
+        try:
+            return await self.connections.dns_cache.resolve(
+                urlsplit(monitor.url).hostname or ""
+            )
+        except httpx.ConnectError as e:
+            logger.warning(f"Monitor {monitor.url} failed with exception: {e}")
+            return None
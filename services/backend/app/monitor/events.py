@@ -0,0 +1,97 @@
+from typing import Any, AsyncGenerator, Dict, Iterable, Optional
+import json
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from common.redis_client import get_redis_client
+from .dashboard import SummaryUpdate
+from .models import Monitor
+
+# Pub/sub channel per user; every message is one JSON event with a "type"
+EVENTS_CHANNEL = "monitor:events:{}"
+# Browsers reconnect after this many milliseconds when a stream drops
+RETRY_MS = 5000
+
+
+def _encode(event: Dict[str, Any]) -> str:
+    return json.dumps(event, cls=DjangoJSONEncoder)
+
+
+class MonitorEventPublisher:
+    """
+    Publishes what the ingestion path records to the user's events channel:
+    a "status" event for every transition and a "result" event for every
+    check. Fire and forget: nobody listening costs one PUBLISH.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None) -> None:
+        self.redis = client or get_redis_client()
+
+    def publish(self, updates: Iterable[SummaryUpdate]) -> None:
+        with self.redis.pipeline(transaction=False) as pipe:
+            for previous_status, monitor, result in updates:
+                channel = EVENTS_CHANNEL.format(monitor.user_id)
+                status: str = (
+                    Monitor.StatusType.UP if result.is_up else Monitor.StatusType.DOWN
+                )
+                if previous_status != status:
+                    event = {
+                        "type": "status",
+                        "monitor_id": monitor.id,
+                        "status": status,
+                        "previous_status": previous_status,
+                        "changed_at": result.created_at,
+                    }
+                    pipe.publish(channel, _encode(event))
+
+                event = {
+                    "type": "result",
+                    "monitor_id": monitor.id,
+                    "id": result.id,
+                    "is_up": result.is_up,
+                    "status_code": result.status_code,
+                    "response_time_ms": result.response_time_ms,
+                    "created_at": result.created_at,
+                }
+                pipe.publish(channel, _encode(event))
+            pipe.execute()
+
+
+async def stream_events(
+    user_id: int,
+    client: Optional[aioredis.Redis] = None,
+    keepalive: Optional[float] = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Server-sent events of a user's monitors, relayed from their channel.
+    Each stream holds one Redis pub/sub connection; a comment line is sent
+    when idle for `keepalive` seconds so proxies keep the connection open.
+    """
+    own_client = client is None
+    if client is None:
+        client = aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    if keepalive is None:
+        keepalive = settings.MONITOR_EVENTS_KEEPALIVE_SECONDS
+
+    pubsub = client.pubsub()
+    await pubsub.subscribe(EVENTS_CHANNEL.format(user_id))
+    try:
+        # The subscription confirmation, so it does not read as an idle wait
+        await pubsub.get_message(timeout=keepalive)
+        yield f"retry: {RETRY_MS}\n\n"
+        while True:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=keepalive
+            )
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+
+            data = message["data"]
+            yield f"event: {json.loads(data)['type']}\ndata: {data}\n\n"
+    finally:
+        await pubsub.unsubscribe()
+        await pubsub.aclose()
+        if own_client:
+            await client.aclose()
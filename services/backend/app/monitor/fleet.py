@@ -0,0 +1,155 @@
+from typing import List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+import logging
+import numpy as np
+import numpy.typing as npt
+from django.conf import settings
+from django.utils import timezone
+from .crud import MonitorResultCRUD, MonitorRollupCRUD
+from .dtos import FleetAnomaly
+from .rollups import HOUR, floor_to
+
+logger = logging.getLogger(__name__)
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+# Scales the MAD to a stdev for normally distributed latencies
+MAD_SCALE = 1.4826
+# Floor for the MAD so that near-constant latencies don't alert on noise
+MIN_MAD_MS = 5.0
+MIN_SAMPLES = 10
+EWMA_ALPHA = 0.3
+# A flagged monitor must have been slow for this many checks in a row
+SUSTAINED_SAMPLES = 3
+SEASONAL_DAYS = 7
+# Set while a monitor is in its alert cooldown
+FLEET_ALERT_KEY = "monitor:fleet_alert:{}"
+
+
+def to_matrix(
+    rows: Sequence[Tuple[int, Optional[float]]], max_samples: int
+) -> Tuple[IntArray, FloatArray]:
+    """
+    Turns (monitor_id, value) rows, grouped by monitor and oldest first, into
+    the unique monitor ids and a (monitors x max_samples) matrix. Each row is
+    right-aligned (newest sample in the last column) and padded with NaN.
+    """
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty((0, max_samples))
+
+    data = np.asarray(rows, dtype=np.float64)
+    ids, starts, counts = np.unique(
+        data[:, 0].astype(np.int64), return_index=True, return_counts=True
+    )
+    group = np.repeat(np.arange(len(ids)), counts)
+    # Distance of every sample from the newest sample of its monitor
+    age = np.repeat(starts + counts, counts) - 1 - np.arange(len(data))
+    keep = age < max_samples
+
+    matrix = np.full((len(ids), max_samples), np.nan)
+    matrix[group[keep], max_samples - 1 - age[keep]] = data[keep, 1]
+    return ids, matrix
+
+
+def robust_stats(matrix: FloatArray) -> Tuple[FloatArray, FloatArray]:
+    """Row-wise median and MAD (scaled to a stdev), ignoring NaN padding."""
+    median = np.nanmedian(matrix, axis=1)
+    mad = np.nanmedian(np.abs(matrix - median[:, None]), axis=1) * MAD_SCALE
+    return median, mad
+
+
+def ewma(matrix: FloatArray, alpha: float = EWMA_ALPHA) -> FloatArray:
+    """Row-wise exponentially weighted moving average, skipping NaN padding."""
+    level = np.full(matrix.shape[0], np.nan)
+    # One pass per column, every monitor at once
+    for column in matrix.T:
+        blended = alpha * column + (1 - alpha) * level
+        level = np.where(
+            np.isnan(level), column, np.where(np.isnan(column), level, blended)
+        )
+    return level
+
+
+class FleetAnomalyDetector:
+    """
+    Periodic fleet-wide latency detector.
+
+    Loads the recent latency window of every active monitor into one NumPy
+    matrix and flags monitors whose smoothed latency (EWMA) is far above
+    their robust baseline (median/MAD) and above what is usual for this
+    hour of the day. Complements the per-check Z-score in MonitorService,
+    which reacts to single spikes; this one catches sustained degradation.
+    """
+
+    def __init__(
+        self,
+        window: Optional[timedelta] = None,
+        max_samples: Optional[int] = None,
+        threshold: Optional[float] = None,
+        seasonal_factor: Optional[float] = None,
+    ) -> None:
+        self.result_crud = MonitorResultCRUD()
+        self.rollup_crud = MonitorRollupCRUD()
+        self.window = window or timedelta(minutes=settings.FLEET_ANOMALY_WINDOW_MINUTES)
+        self.max_samples = max_samples or settings.FLEET_ANOMALY_MAX_SAMPLES
+        self.threshold = threshold or settings.FLEET_ANOMALY_THRESHOLD
+        self.seasonal_factor = seasonal_factor or settings.FLEET_ANOMALY_SEASONAL_FACTOR
+
+    def detect(self, now: Optional[datetime] = None) -> List[FleetAnomaly]:
+        now = now or timezone.now()
+        rows = self.result_crud.get_latency_window(now - self.window, self.max_samples)
+        ids, matrix = to_matrix(rows, self.max_samples)
+
+        enough = np.count_nonzero(~np.isnan(matrix), axis=1) >= MIN_SAMPLES
+        ids, matrix = ids[enough], matrix[enough]
+        if not len(ids):
+            return []
+
+        median, mad = robust_stats(matrix)
+        spread = np.maximum(mad, MIN_MAD_MS)
+        level = ewma(matrix)
+        score = (level - median) / spread
+
+        # A single spike also lifts the EWMA for a while; require a streak
+        upper = median + self.threshold * spread
+        sustained = np.all(matrix[:, -SUSTAINED_SAMPLES:] > upper[:, None], axis=1)
+
+        seasonal = self.seasonal_baseline(ids, now)
+        # Monitors without history for this hour are judged on score alone
+        usual = np.where(np.isnan(seasonal), -np.inf, seasonal * self.seasonal_factor)
+        flagged = np.flatnonzero((score > self.threshold) & sustained & (level > usual))
+
+        logger.info(f"Fleet anomaly scan: {len(ids)} monitors, {len(flagged)} flagged")
+        return [
+            FleetAnomaly(
+                monitor_id=int(ids[i]),
+                current=float(level[i]),
+                median=float(median[i]),
+                score=float(score[i]),
+                seasonal=None if np.isnan(seasonal[i]) else float(seasonal[i]),
+            )
+            for i in flagged
+        ]
+
+    def seasonal_baseline(self, ids: IntArray, now: datetime) -> FloatArray:
+        """
+        Median over the previous days of each monitor's average latency during
+        the current hour of day, aligned with `ids` (NaN without history).
+        Read from the hourly rollups, one row per monitor and day.
+        """
+        rows = self.rollup_crud.get_daily_hour_averages(
+            floor_to(now, HOUR), SEASONAL_DAYS
+        )
+        seasonal_ids, matrix = to_matrix(rows, SEASONAL_DAYS)
+
+        baseline = np.full(len(ids), np.nan)
+        if not len(seasonal_ids):
+            return baseline
+
+        medians = np.nanmedian(matrix, axis=1)
+        positions = np.searchsorted(seasonal_ids, ids)
+        positions = np.minimum(positions, len(seasonal_ids) - 1)
+        found = seasonal_ids[positions] == ids
+        baseline[found] = medians[positions[found]]
+        return baseline
@@ -0,0 +1,192 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import asyncio
+import ipaddress
+import itertools
+import logging
+import random
+import socket
+import struct
+import time
+from django.conf import settings
+from .dtos import PingStats
+from .resolver import IPAddress
+
+logger = logging.getLogger(__name__)
+
+ECHO_REQUEST: Dict[int, int] = {socket.AF_INET: 8, socket.AF_INET6: 128}
+ECHO_REPLY: Dict[int, int] = {socket.AF_INET: 0, socket.AF_INET6: 129}
+PROTOCOLS: Dict[int, int] = {
+    socket.AF_INET: socket.IPPROTO_ICMP,
+    socket.AF_INET6: socket.IPPROTO_ICMPV6,
+}
+# type, code, checksum, identifier, sequence
+HEADER = struct.Struct("!BBHHH")
+PAYLOAD = b"StatusHawk ping".ljust(32, b".")
+# Shared by every probe of the process, so that concurrent probes never send
+# the same (address, sequence) and cannot take each other's replies
+SEQUENCES = itertools.count()
+
+
+def checksum(data: bytes) -> int:
+    """Internet checksum (RFC 1071)."""
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
+
+def echo_request(family: int, identifier: int, sequence: int) -> bytes:
+    # The kernel computes ICMPv6 checksums (they cover the IPv6 addresses)
+    header = HEADER.pack(ECHO_REQUEST[family], 0, 0, identifier, sequence)
+    if family == socket.AF_INET:
+        header = HEADER.pack(
+            ECHO_REQUEST[family], 0, checksum(header + PAYLOAD), identifier, sequence
+        )
+    return header + PAYLOAD
+
+
+def parse_echo_reply(family: int, packet: bytes) -> Optional[Tuple[int, int]]:
+    """(identifier, sequence) of an echo reply, None for any other packet."""
+    # Raw IPv4 sockets (and BSD datagram ones) include the IP header
+    if family == socket.AF_INET and packet and packet[0] >> 4 == 4:
+        packet = packet[(packet[0] & 0x0F) * 4 :]
+    if len(packet) < HEADER.size:
+        return None
+    kind, _, _, identifier, sequence = HEADER.unpack_from(packet)
+    if kind != ECHO_REPLY[family]:
+        return None
+    return identifier, sequence
+
+
+class ICMPSocket:
+    """
+    A non-blocking ICMP socket of one address family: an unprivileged
+    datagram socket where the kernel allows it (net.ipv4.ping_group_range),
+    a raw socket otherwise. Datagram sockets only get their own replies, the
+    kernel sets the identifier; raw sockets see every ICMP packet, so
+    replies are told apart by a random identifier per socket.
+    """
+
+    def __init__(self, family: int) -> None:
+        self.family = family
+        try:
+            self.sock = socket.socket(family, socket.SOCK_DGRAM, PROTOCOLS[family])
+            self.identifier: Optional[int] = None
+        except PermissionError:
+            self.sock = socket.socket(family, socket.SOCK_RAW, PROTOCOLS[family])
+            self.identifier = random.getrandbits(16)
+        self.sock.setblocking(False)
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class PingProber:
+    """
+    Pings a batch of addresses at once: `count` echo requests to each,
+    `interval` seconds apart, over one socket per address family. Replies
+    are matched to requests by source address and sequence number, and are
+    awaited for `timeout` seconds after the last request.
+    """
+
+    def __init__(
+        self,
+        count: Optional[int] = None,
+        interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.count = count or settings.RUNNER_PING_COUNT
+        self.interval = settings.RUNNER_PING_INTERVAL if interval is None else interval
+        self.timeout = timeout or settings.RUNNER_PING_TIMEOUT
+
+    async def probe(self, addresses: Sequence[IPAddress]) -> Dict[IPAddress, PingStats]:
+        """
+        PingStats of every address. Raises OSError when ICMP sockets cannot
+        be opened at all.
+        """
+        stats = {address: PingStats() for address in addresses}
+        if not stats:
+            return stats
+
+        families = {
+            socket.AF_INET if address.version == 4 else socket.AF_INET6
+            for address in stats
+        }
+        sockets = [ICMPSocket(family) for family in families]
+        # (address, sequence): sent at
+        pending: Dict[Tuple[IPAddress, int], float] = {}
+        answered = asyncio.Event()
+        receivers = [
+            asyncio.create_task(self._receive(icmp, stats, pending, answered))
+            for icmp in sockets
+        ]
+        try:
+            await self._send(sockets, stats, pending)
+            try:
+                async with asyncio.timeout(self.timeout):
+                    while pending:
+                        answered.clear()
+                        await answered.wait()
+            except TimeoutError:
+                pass
+        finally:
+            for receiver in receivers:
+                receiver.cancel()
+            await asyncio.gather(*receivers, return_exceptions=True)
+            for icmp in sockets:
+                icmp.close()
+        return stats
+
+    async def _send(
+        self,
+        sockets: List[ICMPSocket],
+        stats: Dict[IPAddress, PingStats],
+        pending: Dict[Tuple[IPAddress, int], float],
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        by_family = {icmp.family: icmp for icmp in sockets}
+        for round_ in range(self.count):
+            if round_:
+                await asyncio.sleep(self.interval)
+            for address, ping in stats.items():
+                family = socket.AF_INET if address.version == 4 else socket.AF_INET6
+                icmp = by_family[family]
+                sequence = next(SEQUENCES) & 0xFFFF
+                packet = echo_request(family, icmp.identifier or 0, sequence)
+                ping.sent += 1
+                pending[(address, sequence)] = time.perf_counter()
+                try:
+                    await loop.sock_sendto(icmp.sock, packet, (str(address), 0))
+                except OSError as e:
+                    # Unreachable networks and the like: the request is lost
+                    pending.pop((address, sequence), None)
+                    logger.debug(f"Ping to {address} failed: {e}")
+
+    async def _receive(
+        self,
+        icmp: ICMPSocket,
+        stats: Dict[IPAddress, PingStats],
+        pending: Dict[Tuple[IPAddress, int], float],
+        answered: asyncio.Event,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            packet, source = await loop.sock_recvfrom(icmp.sock, 2048)
+            received_at = time.perf_counter()
+            reply = parse_echo_reply(icmp.family, packet)
+            if reply is None:
+                continue
+            identifier, sequence = reply
+            if icmp.identifier is not None and identifier != icmp.identifier:
+                continue
+
+            address = ipaddress.ip_address(source[0].partition("%")[0])
+            sent_at = pending.pop((address, sequence), None)
+            if sent_at is None:
+                continue
+            ping = stats[address]
+            ping.received += 1
+            ping.rtts_ms.append((received_at - sent_at) * 1000)
+            answered.set()
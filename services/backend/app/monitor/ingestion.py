@@ -0,0 +1,169 @@
+from typing import Any, Iterable, List, Optional
+import logging
+import threading
+import time
+from celery.signals import (
+    worker_ready,
+    worker_process_init,
+    worker_shutdown,
+    worker_process_shutdown,
+)
+from django.conf import settings
+from django.db import close_old_connections
+from .dtos import CheckResult
+from .services import MonitorService
+
+logger = logging.getLogger(__name__)
+
+
+class ResultBuffer:
+    """
+    In-worker buffer between the Runner tasks and the database.
+
+    Results are written with MonitorService.process_check_results once the
+    buffer holds `max_size` results or its oldest result is `max_age` seconds
+    old, so each commit carries hundreds of rows instead of one. A background
+    flusher enforces the age limit when no new results arrive.
+
+    Results of a failed write go back to the front of the buffer and are
+    written with the next flush, up to `max_retries` failures in a row. Then
+    they are written one by one, so only the results that fail on their own
+    are dropped.
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        max_age: Optional[float] = None,
+        max_retries: Optional[int] = None,
+    ) -> None:
+        self.max_size = max_size or settings.RESULT_BUFFER_SIZE
+        self.max_age = max_age or settings.RESULT_BUFFER_FLUSH_SECONDS
+        self.max_retries = (
+            settings.RESULT_BUFFER_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self._failed_writes = 0
+        self._results: List[CheckResult] = []
+        self._oldest_at = 0.0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def add(self, results: Iterable[CheckResult]) -> None:
+        with self._lock:
+            if not self._results:
+                self._oldest_at = time.monotonic()
+            self._results.extend(results)
+            batch = self._drain() if self._is_due() else []
+
+        self._write(batch)
+
+    def flush(self) -> int:
+        """Writes everything that is buffered. Returns the number of results."""
+        with self._lock:
+            batch = self._drain()
+
+        self._write(batch)
+        return len(batch)
+
+    def flush_if_due(self) -> int:
+        with self._lock:
+            batch = self._drain() if self._is_due() else []
+
+        self._write(batch)
+        return len(batch)
+
+    def start(self) -> None:
+        """Starts the background flusher (once per worker process)."""
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+
+        self._stopped.clear()
+        self._flusher = threading.Thread(
+            target=self._run, name="result-buffer-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.max_age / 2):
+            close_old_connections()
+            self.flush_if_due()
+
+    def _is_due(self) -> bool:
+        if not self._results:
+            return False
+        return (
+            len(self._results) >= self.max_size
+            or time.monotonic() - self._oldest_at >= self.max_age
+        )
+
+    def _drain(self) -> List[CheckResult]:
+        batch, self._results = self._results, []
+        return batch
+
+    def _write(self, batch: List[CheckResult]) -> None:
+        if not batch:
+            return
+
+        service = MonitorService()
+        for i in range(0, len(batch), self.max_size):
+            try:
+                service.process_check_results(batch[i : i + self.max_size])
+            except Exception as e:
+                self._write_failed(service, batch[i:], e)
+                return
+            self._failed_writes = 0
+
+    def _write_failed(
+        self, service: MonitorService, pending: List[CheckResult], error: Exception
+    ) -> None:
+        with self._lock:
+            self._failed_writes += 1
+            attempt = self._failed_writes
+            retry = attempt <= self.max_retries
+            if retry:
+                # Written again once the buffer is due, at the earliest after
+                # max_age seconds unless it fills up
+                self._results[:0] = pending
+                self._oldest_at = time.monotonic()
+
+        if retry:
+            logger.warning(
+                f"Failed to write {len(pending)} buffered results "
+                f"(attempt {attempt}), keeping them for the next flush: {error}"
+            )
+            return
+
+        self._failed_writes = 0
+        logger.error(
+            f"Failed to write {len(pending)} buffered results after {attempt} "
+            f"attempts, writing them one by one: {error}",
+            exc_info=True,
+        )
+        for result in pending:
+            try:
+                service.process_check_results([result])
+            except Exception as e:
+                logger.error(f"Dropped result of monitor {result.monitor_id}: {e}")
+
+
+result_buffer = ResultBuffer()
+
+
+@worker_ready.connect
+@worker_process_init.connect
+def _start_result_buffer(**kwargs: Any) -> None:
+    result_buffer.start()
+
+
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def _flush_result_buffer(**kwargs: Any) -> None:
+    result_buffer.stop()
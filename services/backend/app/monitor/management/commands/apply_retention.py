@@ -0,0 +1,18 @@
+from typing import Any
+from django.core.management.base import BaseCommand
+from monitor.retention import RetentionEngine
+
+
+class Command(BaseCommand):
+    help = (
+        "Purges check results and rollups that are past retention. "
+        "Celery beat also runs this every hour."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.stdout.write("Applying history retention...")
+
+        purged = RetentionEngine().run()
+
+        summary = ", ".join(f"{count} {kind}" for kind, count in purged.items())
+        self.stdout.write(self.style.SUCCESS(f"Successfully purged {summary}."))
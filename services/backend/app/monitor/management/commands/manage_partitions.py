@@ -0,0 +1,41 @@
+from typing import Any
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from monitor.partitions import ResultPartitionManager
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates upcoming MonitorResult partitions and drops expired ones. "
+        "Celery beat also runs this every hour."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=settings.RESULT_PARTITION_PREMAKE_DAYS,
+            help="How many days of partitions to create ahead of today",
+        )
+        parser.add_argument(
+            "--retain-days",
+            type=int,
+            default=settings.RESULT_RETENTION_DAYS,
+            help="Drop partitions older than this many days (0 keeps everything)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        manager = ResultPartitionManager()
+        if not manager.is_partitioned():
+            self.stdout.write(self.style.WARNING("MonitorResult is not partitioned."))
+            return
+
+        created = manager.ensure(options["ahead"])
+        dropped = manager.drop_expired(options["retain_days"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully created {len(created)} "
+                f"and dropped {len(dropped)} partitions."
+            )
+        )
@@ -0,0 +1,31 @@
+from typing import Any
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+from monitor.crud import MonitorRollupCRUD
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the monitor rollups from raw results. "
+        "Run once after deploying rollups to backfill existing history."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="How many days of history to rebuild",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        days = options["days"]
+        now = timezone.now()
+        self.stdout.write(f"Rebuilding rollups for the last {days} days...")
+
+        replayed = MonitorRollupCRUD().rebuild(now - timedelta(days=days), now)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully rebuilt rollups from {replayed} results.")
+        )
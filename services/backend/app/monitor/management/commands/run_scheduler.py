@@ -0,0 +1,46 @@
+from typing import Any
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from monitor.scheduler import MonitorScheduler
+
+
+class Command(BaseCommand):
+    help = "Runs the central monitor scheduler (enqueues due monitors)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--tick",
+            type=float,
+            default=settings.SCHEDULER_TICK_SECONDS,
+            help="Seconds between two scheduler ticks",
+        )
+        parser.add_argument(
+            "--sync-interval",
+            type=int,
+            default=settings.SCHEDULER_SYNC_SECONDS,
+            help="Seconds between two reconciliations with the database",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        tick = options["tick"]
+        sync_interval = options["sync_interval"]
+        scheduler = MonitorScheduler()
+
+        self.stdout.write(f"Scheduler started (tick={tick}s)")
+
+        next_sync = 0.0
+        try:
+            while True:
+                started = time.monotonic()
+
+                if started >= next_sync:
+                    scheduler.sync()
+                    next_sync = started + sync_interval
+
+                scheduler.tick()
+
+                elapsed = time.monotonic() - started
+                time.sleep(max(0.0, tick - elapsed))
+        except KeyboardInterrupt:
+            self.stdout.write("Scheduler stopped")
@@ -0,0 +1,68 @@
+# Generated by Django 6.0 on 2026-10-17 09:00
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("monitor", "0005_monitorresult_monitor_mon_monitor_048459_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonitorRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    "granularity",
+                    models.CharField(
+                        choices=[
+                            ("minute", "Minute"),
+                            ("hour", "Hour"),
+                            ("day", "Day"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("bucket_start", models.DateTimeField()),
+                ("checks", models.PositiveIntegerField(default=0)),
+                ("up_count", models.PositiveIntegerField(default=0)),
+                ("latency_count", models.PositiveIntegerField(default=0)),
+                ("latency_sum", models.BigIntegerField(default=0)),
+                ("latency_min", models.PositiveIntegerField(blank=True, null=True)),
+                ("latency_max", models.PositiveIntegerField(blank=True, null=True)),
+                (
+                    "latency_sketch",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.IntegerField(), default=list, size=None
+                    ),
+                ),
+                (
+                    "monitor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rollups",
+                        to="monitor.monitor",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Monitor Rollup",
+                "verbose_name_plural": "Monitor Rollups",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("monitor", "granularity", "bucket_start"),
+                        name="unique_monitor_rollup_bucket",
+                    )
+                ],
+            },
+        ),
+    ]
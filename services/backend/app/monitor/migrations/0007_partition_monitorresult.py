@@ -0,0 +1,131 @@
+"""
+Turns monitor_monitorresult into a table range-partitioned by day on
+created_at (PostgreSQL only).
+
+Postgres requires the partition key in every unique constraint, so the
+primary key becomes (id, created_at). Django keeps treating `id` as the
+primary key: ids still come from a single sequence and stay unique.
+Existing rows are copied into daily partitions; a DEFAULT partition catches
+rows outside the pre-created days. monitor.partitions maintains the
+partitions from then on.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+from django.db import migrations
+
+TABLE = "monitor_monitorresult"
+LEGACY = "monitor_monitorresult_legacy"
+SEQUENCE = "monitor_monitorresult_id_seq"
+PREMAKE_DAYS = 7
+
+COLUMNS = "id, status_code, response_time_ms, is_up, checked_at, created_at, monitor_id"
+
+INDEXES = f"""
+ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_monitor_id_962a13d3_fk_monitor_monitor_id
+    FOREIGN KEY (monitor_id) REFERENCES monitor_monitor (id)
+    DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX {TABLE}_monitor_id_962a13d3 ON {TABLE} (monitor_id);
+CREATE INDEX monitor_mon_monitor_715b35_idx ON {TABLE} (monitor_id, checked_at);
+CREATE INDEX monitor_mon_monitor_048459_idx ON {TABLE} (monitor_id, created_at DESC);
+"""
+
+
+def _day_partition(day: date) -> str:
+    lo = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    hi = lo + timedelta(days=1)
+    return (
+        f"CREATE TABLE {TABLE}_p{day:%Y%m%d} PARTITION OF {TABLE} "
+        f"FOR VALUES FROM ('{lo.isoformat()}') TO ('{hi.isoformat()}');"
+    )
+
+
+def partition(apps: Any, schema_editor: Any) -> None:
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    execute = schema_editor.execute
+    execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY};")
+    execute(f"""
+        CREATE TABLE {TABLE} (
+            id integer NOT NULL,
+            status_code integer NULL CHECK (status_code >= 0),
+            response_time_ms integer NULL CHECK (response_time_ms >= 0),
+            is_up boolean NOT NULL,
+            checked_at timestamp with time zone NOT NULL,
+            created_at timestamp with time zone NOT NULL,
+            monitor_id integer NOT NULL
+        ) PARTITION BY RANGE (created_at);
+        """)
+    execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT;")
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN(created_at) FROM {LEGACY}")
+        oldest = cursor.fetchone()[0]
+
+    today = datetime.now(timezone.utc).date()
+    day = min(oldest.astimezone(timezone.utc).date(), today) if oldest else today
+    while day <= today + timedelta(days=PREMAKE_DAYS):
+        execute(_day_partition(day))
+        day += timedelta(days=1)
+
+    execute(f"INSERT INTO {TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {LEGACY};")
+    # Also drops the identity sequence of the old table
+    execute(f"DROP TABLE {LEGACY};")
+
+    execute(f"CREATE SEQUENCE {SEQUENCE} AS integer OWNED BY {TABLE}.id;")
+    execute(
+        f"SELECT setval('{SEQUENCE}', COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) "
+        f"FROM {TABLE};"
+    )
+    execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}');")
+    execute(f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id, created_at);")
+    execute(INDEXES)
+
+
+def unpartition(apps: Any, schema_editor: Any) -> None:
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    execute = schema_editor.execute
+    execute(f"ALTER TABLE {TABLE} RENAME TO {LEGACY};")
+    execute(f"ALTER TABLE {LEGACY} DROP CONSTRAINT {TABLE}_pkey;")
+    execute(
+        f"ALTER TABLE {LEGACY} DROP CONSTRAINT "
+        f"{TABLE}_monitor_id_962a13d3_fk_monitor_monitor_id;"
+    )
+    execute(f"DROP INDEX {TABLE}_monitor_id_962a13d3;")
+    execute("DROP INDEX monitor_mon_monitor_715b35_idx;")
+    execute("DROP INDEX monitor_mon_monitor_048459_idx;")
+    execute(f"""
+        CREATE TABLE {TABLE} (
+            id integer NOT NULL PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY
+                (SEQUENCE NAME {TABLE}_id_seq_plain),
+            status_code integer NULL CHECK (status_code >= 0),
+            response_time_ms integer NULL CHECK (response_time_ms >= 0),
+            is_up boolean NOT NULL,
+            checked_at timestamp with time zone NOT NULL,
+            created_at timestamp with time zone NOT NULL,
+            monitor_id integer NOT NULL
+        );
+        """)
+    execute(f"INSERT INTO {TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {LEGACY};")
+    # Drops every partition and the partitioned sequence
+    execute(f"DROP TABLE {LEGACY} CASCADE;")
+    execute(f"ALTER SEQUENCE {TABLE}_id_seq_plain RENAME TO {SEQUENCE};")
+    execute(
+        f"SELECT setval('{SEQUENCE}', COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) "
+        f"FROM {TABLE};"
+    )
+    execute(INDEXES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("monitor", "0006_monitorrollup"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
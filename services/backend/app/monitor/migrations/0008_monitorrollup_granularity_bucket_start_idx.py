@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-17 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("monitor", "0007_partition_monitorresult"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="monitorrollup",
+            index=models.Index(
+                fields=["granularity", "bucket_start"],
+                name="monitor_mon_granula_0572fc_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 6.0 on 2026-10-17 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("monitor", "0008_monitorrollup_granularity_bucket_start_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="monitor",
+            name="last_response_time_ms",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="monitor",
+            name="last_status_code",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="monitor",
+            name="recent_checks",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="monitor",
+            name="recent_checks_count",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        # Seed the latest-result columns from each monitor's newest result
+        migrations.RunSQL(
+            """
+            UPDATE monitor_monitor AS m
+            SET last_status_code = r.status_code,
+                last_response_time_ms = r.response_time_ms
+            FROM (
+                SELECT DISTINCT ON (monitor_id)
+                    monitor_id, status_code, response_time_ms
+                FROM monitor_monitorresult
+                ORDER BY monitor_id, created_at DESC
+            ) AS r
+            WHERE r.monitor_id = m.id;
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("monitor", "0009_monitor_latest_result"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="monitor",
+            name="fresh_connection",
+            field=models.BooleanField(default=False),
+        ),
+    ]
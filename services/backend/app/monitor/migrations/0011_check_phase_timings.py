@@ -0,0 +1,53 @@
+# Generated by Django 6.0 on 2026-10-17 13:00
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("monitor", "0010_monitor_fresh_connection"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="monitorresult",
+            name="connect_ms",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="monitorresult",
+            name="dns_ms",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="monitorresult",
+            name="tls_ms",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="monitorresult",
+            name="transfer_ms",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="monitorresult",
+            name="ttfb_ms",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="monitorrollup",
+            name="phase_counts",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.IntegerField(), default=list, size=None
+            ),
+        ),
+        migrations.AddField(
+            model_name="monitorrollup",
+            name="phase_sums",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.BigIntegerField(), default=list, size=None
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0 on 2026-10-17 14:00
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("monitor", "0011_check_phase_timings"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="monitor",
+            name="expected_banner",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AlterField(
+            model_name="monitor",
+            name="url",
+            field=models.CharField(
+                max_length=2048,
+                validators=[
+                    django.core.validators.URLValidator(
+                        schemes=["http", "https", "tcp"]
+                    )
+                ],
+            ),
+        ),
+    ]
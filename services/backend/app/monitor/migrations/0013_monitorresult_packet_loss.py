@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-17 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("monitor", "0012_tcp_monitors"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="monitorresult",
+            name="packet_loss",
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-17 16:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("monitor", "0013_monitorresult_packet_loss"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="monitorresult",
+            name="checked_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+        migrations.AlterField(
+            model_name="monitorresult",
+            name="created_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
@@ -1,7 +1,9 @@
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
+from django.contrib.postgres.fields import ArrayField
 from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, URLValidator
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 User = get_user_model()
@@ -21,7 +23,11 @@ class Monitor(models.Model):
     id = models.AutoField(primary_key=True, unique=True, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="monitors")
     name = models.CharField(max_length=255)
-    url = models.URLField(validators=[URLValidator()], max_length=2048)
+    # http(s)://... for HTTP monitors, tcp://host:port for TCP monitors;
+    # PING monitors ping the host of their URL
+    url = models.CharField(
+        max_length=2048, validators=[URLValidator(schemes=["http", "https", "tcp"])]
+    )
     monitor_type = models.CharField(max_length=10, choices=MonitorType.choices)
     status = models.CharField(
         max_length=10, choices=StatusType.choices, default=StatusType.PAUSED
@@ -31,10 +37,30 @@ class Monitor(models.Model):
         default=300, validators=[MinValueValidator(30)]
     )
     is_active = models.BooleanField(default=True)
+    # Open a new connection for every check, so TCP and TLS handshakes count
+    # in the response time (pooled keep-alive connections are reused otherwise)
+    fresh_connection = models.BooleanField(default=False)
+    # TCP: read the server's greeting and require this text in it
+    expected_banner = models.CharField(max_length=255, blank=True, default="")
     last_checked_at = models.DateTimeField(null=True, blank=True)
+    # Latest result, written by the ingestion path with status/last_checked_at
+    last_status_code = models.PositiveIntegerField(null=True, blank=True)
+    last_response_time_ms = models.PositiveIntegerField(null=True, blank=True)
+    # Outcomes of the last RECENT_CHECKS checks, one bit each (newest lowest,
+    # 1 = up), and how many of those bits are filled
+    recent_checks = models.BigIntegerField(default=0, editable=False)
+    recent_checks_count = models.PositiveSmallIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
+    RECENT_CHECKS = 60
+    # URL schemes each monitor type checks
+    SCHEMES: Dict[str, Tuple[str, ...]] = {
+        MonitorType.HTTP: ("http", "https"),
+        MonitorType.PING: ("http", "https"),
+        MonitorType.TCP: ("tcp",),
+    }
+
     class Meta:
         verbose_name = _("Monitor")
         verbose_name_plural = _("Monitors")
@@ -46,27 +72,69 @@ class Monitor(models.Model):
     def __str__(self) -> str:
         return f"{self.name} ({self.url})"
 
+    @property
+    def recent_uptime_percentage(self) -> Optional[float]:
+        """Uptime over the last RECENT_CHECKS checks, None before the first."""
+        if not self.recent_checks_count:
+            return None
+        up = bin(self.recent_checks).count("1")
+        return round(up / self.recent_checks_count * 100, 2)
+
+    def record_result(
+        self, is_up: bool, status_code: Optional[int], response_time_ms: Optional[int]
+    ) -> None:
+        """
+        In-memory counterpart of MonitorCRUD.record_check for the latest-result
+        fields (the batch path saves them with bulk_update).
+        """
+        self.last_status_code = status_code
+        self.last_response_time_ms = response_time_ms
+        mask = (1 << self.RECENT_CHECKS) - 1
+        self.recent_checks = ((self.recent_checks << 1) | int(is_up)) & mask
+        self.recent_checks_count = min(self.recent_checks_count + 1, self.RECENT_CHECKS)
+
     def save(self, *args: Any, **kwargs: Any) -> None:
         is_new = self.pk is None
         was_active = False
+        old_interval = None
         if not is_new:
             try:
-                old_instance = Monitor.objects.get(pk=self.pk)
+                old_instance = Monitor.objects.only("is_active", "interval").get(
+                    pk=self.pk
+                )
                 was_active = old_instance.is_active
+                old_interval = old_instance.interval
             except Monitor.DoesNotExist:
                 pass
 
         super().save(*args, **kwargs)
 
-        if self.is_active and (is_new or not was_active):
-            from monitor.tasks import check_monitor_task
+        from monitor.dashboard import DashboardSummary
+        from monitor.scheduler import MonitorScheduler
 
+        user_id = self.user_id
+        transaction.on_commit(lambda: DashboardSummary().invalidate(user_id))
+        if self.is_active and (is_new or not was_active):
             transaction.on_commit(
-                lambda: check_monitor_task.apply_async(
-                    args=[self.pk],
-                    queue="runner_queue",
-                )
+                lambda: MonitorScheduler().schedule(self.pk, self.interval)
+            )
+        elif self.is_active and self.interval != old_interval:
+            transaction.on_commit(
+                lambda: MonitorScheduler().update_interval(self.pk, self.interval)
             )
+        elif not self.is_active and was_active:
+            transaction.on_commit(lambda: MonitorScheduler().unschedule([self.pk]))
+
+    def delete(self, *args: Any, **kwargs: Any) -> Tuple[int, Dict[str, int]]:
+        monitor_id, user_id = self.pk, self.user_id
+        result = super().delete(*args, **kwargs)
+
+        from monitor.dashboard import DashboardSummary
+        from monitor.scheduler import MonitorScheduler
+
+        transaction.on_commit(lambda: MonitorScheduler().unschedule([monitor_id]))
+        transaction.on_commit(lambda: DashboardSummary().invalidate(user_id))
+        return result
 
 
 class MonitorResult(models.Model):
@@ -77,8 +145,18 @@ class MonitorResult(models.Model):
     status_code = models.PositiveIntegerField(null=True, blank=True)
     response_time_ms = models.PositiveIntegerField(null=True, blank=True)
     is_up = models.BooleanField()
-    checked_at = models.DateTimeField(auto_now_add=True, editable=False)
-    created_at = models.DateTimeField(auto_now_add=True, editable=False)
+    # Phase timings (see dtos.CheckTimings); NULL costs no space in the row
+    dns_ms = models.PositiveIntegerField(null=True, blank=True)
+    connect_ms = models.PositiveIntegerField(null=True, blank=True)
+    tls_ms = models.PositiveIntegerField(null=True, blank=True)
+    ttfb_ms = models.PositiveIntegerField(null=True, blank=True)
+    transfer_ms = models.PositiveIntegerField(null=True, blank=True)
+    # PING: percentage of echo requests left unanswered
+    packet_loss = models.PositiveSmallIntegerField(null=True, blank=True)
+    # When the check completed, set by the ingestion path (it may write the
+    # result seconds later); both default to the time of the insert
+    checked_at = models.DateTimeField(default=timezone.now, editable=False)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         verbose_name = _("Monitor Result")
@@ -91,3 +169,60 @@ class MonitorResult(models.Model):
 
     def __str__(self) -> str:
         return f"Result for {self.monitor.name} at {self.checked_at}"
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        is_new = self._state.adding
+        super().save(*args, **kwargs)
+
+        if is_new:
+            from monitor.crud import MonitorRollupCRUD
+
+            MonitorRollupCRUD().record([self])
+
+
+class MonitorRollup(models.Model):
+    """
+    Pre-aggregated check results of one monitor per minute, hour or day.
+    Maintained incrementally by the ingestion path (see monitor.rollups).
+    """
+
+    class Granularity(models.TextChoices):
+        MINUTE = "minute", _("Minute")
+        HOUR = "hour", _("Hour")
+        DAY = "day", _("Day")
+
+    # Every upsert draws a sequence value, even when it updates
+    id = models.BigAutoField(primary_key=True, editable=False)
+    monitor = models.ForeignKey(
+        Monitor, on_delete=models.CASCADE, related_name="rollups"
+    )
+    granularity = models.CharField(max_length=10, choices=Granularity.choices)
+    bucket_start = models.DateTimeField()
+    checks = models.PositiveIntegerField(default=0)
+    up_count = models.PositiveIntegerField(default=0)
+    latency_count = models.PositiveIntegerField(default=0)
+    latency_sum = models.BigIntegerField(default=0)
+    latency_min = models.PositiveIntegerField(null=True, blank=True)
+    latency_max = models.PositiveIntegerField(null=True, blank=True)
+    # Log-scale latency histogram, see monitor.rollups.SKETCH_GROWTH
+    latency_sketch = ArrayField(models.IntegerField(), default=list)
+    # Per phase (in dtos.PHASES order): checks that timed it, and their sum
+    phase_counts = ArrayField(models.IntegerField(), default=list)
+    phase_sums = ArrayField(models.BigIntegerField(), default=list)
+
+    class Meta:
+        verbose_name = _("Monitor Rollup")
+        verbose_name_plural = _("Monitor Rollups")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["monitor", "granularity", "bucket_start"],
+                name="unique_monitor_rollup_bucket",
+            )
+        ]
+        indexes = [
+            # Retention purges expired buckets per granularity
+            models.Index(fields=["granularity", "bucket_start"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.granularity} rollup for {self.monitor_id} at {self.bucket_start}"
@@ -0,0 +1,177 @@
+from typing import Dict, List, Optional
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+import logging
+import re
+from django.db import OperationalError, connection, transaction
+from django.utils import timezone
+from .models import MonitorResult
+
+logger = logging.getLogger(__name__)
+
+PARTITION_SUFFIX = re.compile(r"_p(\d{8})$")
+# How long a plain DETACH waits for its lock on the parent before giving up
+# until the next run, instead of queueing every insert and read behind it
+DETACH_LOCK_TIMEOUT_MS = 2000
+
+
+class ResultPartitionManager:
+    """
+    Maintains the daily range partitions of MonitorResult (by created_at,
+    see migration 0007): creates partitions ahead of time and drops whole
+    partitions once they are past retention, so expiring history is a
+    metadata operation instead of a DELETE.
+    """
+
+    def __init__(self) -> None:
+        self.table = MonitorResult._meta.db_table
+        self.default_partition = f"{self.table}_default"
+
+    def is_partitioned(self) -> bool:
+        if connection.vendor != "postgresql":
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT 1 FROM pg_partitioned_table pt
+                JOIN pg_class c ON c.oid = pt.partrelid
+                WHERE c.relname = %s AND pg_table_is_visible(c.oid)
+                """,
+                [self.table],
+            )
+            return cursor.fetchone() is not None
+
+    def has_default_partition(self) -> bool:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT pt.partdefid <> 0 FROM pg_partitioned_table pt
+                JOIN pg_class c ON c.oid = pt.partrelid
+                WHERE c.relname = %s AND pg_table_is_visible(c.oid)
+                """,
+                [self.table],
+            )
+            row = cursor.fetchone()
+        return bool(row and row[0])
+
+    def partitions(self) -> Dict[date, str]:
+        """Daily partitions by day (the DEFAULT partition is not included)."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT child.relname FROM pg_inherits i
+                JOIN pg_class child ON child.oid = i.inhrelid
+                JOIN pg_class parent ON parent.oid = i.inhparent
+                WHERE parent.relname = %s AND pg_table_is_visible(parent.oid)
+                """,
+                [self.table],
+            )
+            names = [row[0] for row in cursor.fetchall()]
+
+        days = {}
+        for name in names:
+            match = PARTITION_SUFFIX.search(name)
+            if match:
+                days[datetime.strptime(match.group(1), "%Y%m%d").date()] = name
+        return days
+
+    def ensure(self, days_ahead: int, today: Optional[date] = None) -> List[str]:
+        """Creates the missing partitions from today to today + days_ahead."""
+        if not self.is_partitioned():
+            return []
+
+        today = today or timezone.now().date()
+        existing = self.partitions()
+        created = []
+        for offset in range(days_ahead + 1):
+            day = today + timedelta(days=offset)
+            if day not in existing:
+                created.append(self._create(day))
+
+        if created:
+            logger.info(f"Created result partitions: {', '.join(created)}")
+        return created
+
+    def drop_expired(self, retain_days: int, today: Optional[date] = None) -> List[str]:
+        """
+        Drops the partitions that only hold rows older than retain_days.
+        A retain_days of 0 keeps everything. Each partition is detached
+        first, so the DROP itself never locks the parent table.
+        """
+        if retain_days <= 0 or not self.is_partitioned():
+            return []
+
+        cutoff = (today or timezone.now().date()) - timedelta(days=retain_days)
+        concurrently = (
+            not connection.in_atomic_block and not self.has_default_partition()
+        )
+        dropped = []
+        for day, name in sorted(self.partitions().items()):
+            if day >= cutoff:
+                break
+            if not self._detach(name, concurrently):
+                break
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE {name}")
+            dropped.append(name)
+
+        if dropped:
+            logger.info(f"Dropped expired result partitions: {', '.join(dropped)}")
+        return dropped
+
+    def _detach(self, name: str, concurrently: bool) -> bool:
+        """
+        Detaches a partition. DETACH CONCURRENTLY only takes a SHARE UPDATE
+        EXCLUSIVE lock on the parent, but Postgres refuses it inside a
+        transaction block and whenever a DEFAULT partition exists. A plain
+        DETACH needs an ACCESS EXCLUSIVE lock: it is only attempted for
+        DETACH_LOCK_TIMEOUT_MS, and False is returned (retried on the next
+        run) when the lock is not granted by then.
+        """
+        if concurrently:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"ALTER TABLE {self.table} DETACH PARTITION {name} CONCURRENTLY"
+                )
+            return True
+
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"SET LOCAL lock_timeout = {DETACH_LOCK_TIMEOUT_MS}")
+                cursor.execute(f"ALTER TABLE {self.table} DETACH PARTITION {name}")
+        except OperationalError as e:
+            logger.warning(f"Could not detach {name}, retrying next run: {e}")
+            return False
+        return True
+
+    def _create(self, day: date) -> str:
+        """
+        Creates the partition of `day` as a standalone table, moves any rows
+        of that day out of the DEFAULT partition and attaches it. ATTACH only
+        takes a SHARE UPDATE EXCLUSIVE lock, so inserts keep flowing.
+        """
+        name = f"{self.table}_p{day:%Y%m%d}"
+        lo = datetime(day.year, day.month, day.day, tzinfo=dt_timezone.utc)
+        hi = lo + timedelta(days=1)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE {name} "
+                f"(LIKE {self.table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+            cursor.execute(
+                f"""
+                WITH moved AS (
+                    DELETE FROM {self.default_partition}
+                    WHERE created_at >= %s AND created_at < %s
+                    RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved
+                """,
+                [lo, hi],
+            )
+            cursor.execute(
+                f"ALTER TABLE {self.table} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM (%s) TO (%s)",
+                [lo, hi],
+            )
+        return name
@@ -0,0 +1,156 @@
+from typing import AsyncIterator, Dict, Optional, cast
+from contextlib import asynccontextmanager
+import asyncio
+import logging
+import time
+import uuid
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+from common.redis_client import get_async_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Sorted set: lease token -> lease expiry (Redis time, milliseconds)
+SLOTS_KEY = "runner:host:{}:slots"
+# Set while a check of the host started less than the minimum spacing ago
+SPACING_KEY = "runner:host:{}:spacing"
+
+# Seconds a waiting check sleeps at most before trying again: slots released
+# by other workers wake nobody here
+MAX_WAIT_SECONDS = 1.0
+
+# Takes a slot of the host (KEYS[1]) for the token if one is free and the
+# spacing (KEYS[2]) has passed. Returns 0 then, else the milliseconds until
+# the earliest lease or the spacing expires. Runs on Redis time, so the
+# clocks of the workers do not matter.
+TAKE_SLOT = """
+local token = ARGV[1]
+local lease = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local spacing = tonumber(ARGV[4])
+local time = redis.call('TIME')
+local now = time[1] * 1000 + math.floor(time[2] / 1000)
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= limit then
+    local earliest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return math.max(tonumber(earliest[2]) - now, 1)
+end
+if spacing > 0 then
+    local remaining = redis.call('PTTL', KEYS[2])
+    if remaining > 0 then
+        return remaining
+    end
+    redis.call('SET', KEYS[2], 1, 'PX', spacing)
+end
+redis.call('ZADD', KEYS[1], now + lease, token)
+redis.call('PEXPIRE', KEYS[1], lease)
+return 0
+"""
+
+
+class HostLimiter:
+    """
+    Politeness towards the hosts we check, shared by every runner worker
+    through Redis: at most `max_concurrency` checks of a host at once, and
+    checks of a host start at least `min_spacing` seconds apart (a token
+    bucket holding one token). Checks over the limits wait for their turn,
+    they are never dropped.
+
+    A waiting check sleeps until the earliest slot lease or the spacing of
+    its host expires, and is woken early when a check of this worker frees
+    a slot of the host. Bound to one event loop, like its wake-ups.
+
+    Slots are leases expiring after `lease` seconds, so a worker that dies
+    mid-check does not hold its slots forever. If Redis is unreachable,
+    checks go ahead unlimited: politeness must not stop monitoring.
+    """
+
+    def __init__(
+        self,
+        client: Optional[aioredis.Redis] = None,
+        max_concurrency: Optional[int] = None,
+        min_spacing: Optional[float] = None,
+        lease: Optional[float] = None,
+        max_wait: float = MAX_WAIT_SECONDS,
+    ) -> None:
+        self.client = client
+        self.max_concurrency = max_concurrency or settings.RUNNER_HOST_MAX_CONCURRENCY
+        self.min_spacing = (
+            settings.RUNNER_HOST_MIN_SPACING_SECONDS
+            if min_spacing is None
+            else min_spacing
+        )
+        self.lease = lease or settings.RUNNER_HOST_LEASE_SECONDS
+        self.max_wait = max_wait
+        # host: set once a slot of the host is released in this worker
+        self.releases: Dict[str, asyncio.Event] = {}
+
+    @property
+    def redis(self) -> aioredis.Redis:
+        return self.client or get_async_redis_client()
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[None]:
+        """Waits until a check of host may start and holds its slot."""
+        token = await self.acquire(host)
+        try:
+            yield
+        finally:
+            if token is not None:
+                await self.release(host, token)
+
+    async def acquire(self, host: str) -> Optional[str]:
+        """
+        Waits for a slot of host and its spacing. Returns the lease token,
+        None if the limits could not be applied.
+        """
+        host = host.lower()
+        token = uuid.uuid4().hex
+        take_slot = self.redis.register_script(TAKE_SLOT)
+        deferred = 0.0
+        try:
+            while True:
+                wait_ms = await take_slot(
+                    keys=[SLOTS_KEY.format(host), SPACING_KEY.format(host)],
+                    args=[
+                        token,
+                        round(self.lease * 1000),
+                        self.max_concurrency,
+                        round(self.min_spacing * 1000),
+                    ],
+                )
+                if not wait_ms:
+                    break
+                deferred += await self._wait(host, cast(int, wait_ms) / 1000)
+        except redis.RedisError as e:
+            logger.warning(f"Host limits unavailable, checking {host} anyway: {e}")
+            return None
+
+        if deferred:
+            logger.debug(f"Check of {host} deferred by {deferred:.2f}s")
+        return token
+
+    async def release(self, host: str, token: str) -> None:
+        host = host.lower()
+        try:
+            await self.redis.zrem(SLOTS_KEY.format(host), token)
+        except redis.RedisError as e:
+            # The lease expires on its own
+            logger.warning(f"Could not release slot of {host}: {e}")
+
+        event = self.releases.pop(host, None)
+        if event is not None:
+            event.set()
+
+    async def _wait(self, host: str, seconds: float) -> float:
+        """Sleeps for seconds or until a slot of host is released here."""
+        started = time.monotonic()
+        event = self.releases.setdefault(host, asyncio.Event())
+        try:
+            async with asyncio.timeout(min(seconds, self.max_wait)):
+                await event.wait()
+        except TimeoutError:
+            pass
+        return time.monotonic() - started
@@ -0,0 +1,157 @@
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import asyncio
+import ipaddress
+import logging
+import time
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+IPAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+# Cloud metadata services (AWS/GCP/Azure, AWS IPv6)
+METADATA_ADDRESSES = {
+    ipaddress.ip_address("169.254.169.254"),
+    ipaddress.ip_address("fd00:ec2::254"),
+}
+
+
+def is_forbidden_address(ip: IPAddress) -> bool:
+    """Addresses a monitor may never reach: local, private and metadata."""
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return (
+        ip in METADATA_ADDRESSES
+        or ip.is_private
+        or ip.is_loopback
+        or ip.is_link_local
+        or ip.is_multicast
+        or ip.is_reserved
+        or ip.is_unspecified
+    )
+
+
+class ForbiddenAddressError(httpx.ConnectError):
+    """The host resolves to an address monitors may not connect to."""
+
+
+class DNSCache:
+    """
+    Resolves monitor hosts for the runner and caches the answers for their
+    DNS TTL (clamped to [min_ttl, max_ttl]). Every answer is vetted with
+    is_forbidden_address, so a public hostname pointing at a private or
+    metadata address is refused, and the caller connects to the vetted
+    address instead of resolving again (no DNS rebinding in between).
+    """
+
+    def __init__(
+        self,
+        resolver: Optional[dns.asyncresolver.Resolver] = None,
+        min_ttl: Optional[float] = None,
+        max_ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.resolver = resolver
+        self.min_ttl = settings.RUNNER_DNS_MIN_TTL if min_ttl is None else min_ttl
+        self.max_ttl = settings.RUNNER_DNS_MAX_TTL if max_ttl is None else max_ttl
+        self.clock = clock
+        # host: (expires_at, addresses)
+        self.entries: Dict[str, Tuple[float, List[IPAddress]]] = {}
+
+    async def resolve(self, host: str) -> IPAddress:
+        """The vetted address to connect to for `host`."""
+        try:
+            addresses = [ipaddress.ip_address(host)]
+        except ValueError:
+            addresses = await self._cached(host.lower().rstrip("."))
+
+        forbidden = [ip for ip in addresses if is_forbidden_address(ip)]
+        if forbidden:
+            raise ForbiddenAddressError(
+                f"{host} resolves to a forbidden address ({forbidden[0]})"
+            )
+        return addresses[0]
+
+    async def _cached(self, host: str) -> List[IPAddress]:
+        now = self.clock()
+        entry = self.entries.get(host)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        addresses, ttl = await self._lookup(host)
+        ttl = min(max(ttl, self.min_ttl), self.max_ttl)
+        self.entries[host] = (now + ttl, addresses)
+        return addresses
+
+    async def _lookup(self, host: str) -> Tuple[List[IPAddress], float]:
+        """A and AAAA records of host, and the lowest TTL among them."""
+        if self.resolver is None:
+            self.resolver = dns.asyncresolver.Resolver()
+
+        answers = await asyncio.gather(
+            *(
+                self.resolver.resolve(host, rdtype, raise_on_no_answer=False)
+                for rdtype in ("A", "AAAA")
+            ),
+            return_exceptions=True,
+        )
+
+        addresses: List[IPAddress] = []
+        ttls = []
+        for answer in answers:
+            if isinstance(answer, BaseException):
+                if not isinstance(answer, dns.exception.DNSException):
+                    raise answer
+                logger.debug(f"DNS lookup of {host} failed: {answer}")
+                continue
+            if answer.rrset is None:
+                continue
+            addresses += [ipaddress.ip_address(rdata.address) for rdata in answer]
+            ttls.append(answer.rrset.ttl)
+
+        if not addresses:
+            raise httpx.ConnectError(f"Could not resolve {host}")
+        return addresses, min(ttls)
+
+
+class PinnedTransport(httpx.AsyncBaseTransport):
+    """
+    Sends every request (redirects included) to the address DNSCache vetted
+    for its host. The Host header and TLS SNI/certificate checks still use
+    the hostname.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, dns_cache: DNSCache):
+        self.transport = transport
+        self.dns_cache = dns_cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        # Reported like httpcore's own steps, see monitor.timings
+        trace = request.extensions.get("trace")
+        if trace is not None:
+            await trace("dns.resolve.started", {"host": host})
+        try:
+            ip = await self.dns_cache.resolve(host)
+        except httpx.ConnectError as e:
+            # Attach the request, as httpx does for its own errors
+            e.request = request
+            raise
+        if trace is not None:
+            await trace("dns.resolve.complete", {"return_value": ip})
+
+        if request.url.scheme == "https":
+            request.extensions = {**request.extensions, "sni_hostname": host}
+        request.url = request.url.copy_with(host=str(ip))
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+# Shared by every batch a runner process checks
+dns_cache = DNSCache()
@@ -0,0 +1,106 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+import logging
+import time
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from .models import MonitorResult, MonitorRollup
+from .partitions import ResultPartitionManager
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionEngine:
+    """
+    Applies the history retention policy:
+
+    - raw MonitorResult rows are kept RESULT_RETENTION_DAYS. Whole daily
+      partitions are dropped; whatever is left (DEFAULT partition, or an
+      unpartitioned table) is deleted in global chunks on created_at. An
+      empty DEFAULT partition costs a single probe.
+    - MonitorRollup rows are kept per granularity (ROLLUP_RETENTION_DAYS),
+      so minute buckets expire first and daily history is kept longest.
+
+    Every chunk is its own short transaction, with a pause in between, so
+    purging never holds long locks or produces a burst of WAL.
+    """
+
+    def __init__(
+        self, chunk_size: Optional[int] = None, pause: Optional[float] = None
+    ) -> None:
+        self.chunk_size = chunk_size or settings.RETENTION_CHUNK_SIZE
+        self.pause = settings.RETENTION_CHUNK_PAUSE_SECONDS if pause is None else pause
+        self.partitions = ResultPartitionManager()
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Returns the number of deleted rows (or dropped partitions) per kind."""
+        now = now or timezone.now()
+        purged = self.purge_results(now)
+        purged.update(self.purge_rollups(now))
+        logger.info(f"Retention applied: {purged}")
+        return purged
+
+    def purge_results(self, now: datetime) -> Dict[str, int]:
+        retain_days = settings.RESULT_RETENTION_DAYS
+        if retain_days <= 0:
+            return {}
+
+        cutoff = now - timedelta(days=retain_days)
+        table = MonitorResult._meta.db_table
+        dropped = 0
+        if self.partitions.is_partitioned():
+            dropped = len(self.partitions.drop_expired(retain_days, now.date()))
+            # The dated partitions expire as a whole; only the DEFAULT
+            # partition needs row-level deletes
+            table = self.partitions.default_partition
+
+            if not self._has_rows(table):
+                return {"result_partitions": dropped, "results": 0}
+
+        deleted = self._delete_chunked(
+            f"""
+            DELETE FROM {table} WHERE id IN (
+                SELECT id FROM {table} WHERE created_at < %s LIMIT %s
+            )
+            """,
+            [cutoff],
+        )
+        return {"result_partitions": dropped, "results": deleted}
+
+    def purge_rollups(self, now: datetime) -> Dict[str, int]:
+        table = MonitorRollup._meta.db_table
+        purged = {}
+        for granularity, retain_days in settings.ROLLUP_RETENTION_DAYS.items():
+            if retain_days <= 0:
+                continue
+
+            purged[f"{granularity}_rollups"] = self._delete_chunked(
+                f"""
+                DELETE FROM {table} WHERE id IN (
+                    SELECT id FROM {table}
+                    WHERE granularity = %s AND bucket_start < %s
+                    LIMIT %s
+                )
+                """,
+                [granularity, now - timedelta(days=retain_days)],
+            )
+        return purged
+
+    def _has_rows(self, table: str) -> bool:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {table})")
+            return bool(cursor.fetchone()[0])
+
+    def _delete_chunked(self, sql: str, params: List[Any]) -> int:
+        """Runs a LIMITed DELETE until it deletes less than a full chunk."""
+        deleted = 0
+        while True:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params + [self.chunk_size])
+                count = cursor.rowcount
+            deleted += count
+            if count < self.chunk_size:
+                return deleted
+            if self.pause:
+                time.sleep(self.pause)
@@ -0,0 +1,159 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+import math
+from .dtos import PHASES
+from .models import MonitorRollup
+
+MINUTE = MonitorRollup.Granularity.MINUTE
+HOUR = MonitorRollup.Granularity.HOUR
+DAY = MonitorRollup.Granularity.DAY
+
+# Coarsest first
+GRANULARITIES = (DAY, HOUR, MINUTE)
+
+# Latency sketch: log-scale histogram, bucket i counts latencies in
+# [GROWTH^i, GROWTH^(i+1)) ms. 50 buckets reach ~70s with <=12.5% error.
+SKETCH_GROWTH = 1.25
+SKETCH_SIZE = 50
+
+# (monitor_id, granularity, bucket_start)
+RollupKey = Tuple[int, str, datetime]
+
+
+def sketch_index(latency_ms: int) -> int:
+    if latency_ms < 1:
+        return 0
+    return min(int(math.log(latency_ms, SKETCH_GROWTH)), SKETCH_SIZE - 1)
+
+
+def sketch_quantile(sketch: List[int], q: float) -> Optional[float]:
+    """Approximate q-quantile (0..1): geometric middle of the matching bucket."""
+    total = sum(sketch)
+    if not total:
+        return None
+
+    rank = q * total
+    seen = 0
+    for index, count in enumerate(sketch):
+        seen += count
+        if count and seen >= rank:
+            return float(SKETCH_GROWTH ** (index + 0.5))
+    return float(SKETCH_GROWTH ** (SKETCH_SIZE - 0.5))
+
+
+STEP: Dict[str, timedelta] = {
+    MINUTE: timedelta(minutes=1),
+    HOUR: timedelta(hours=1),
+    DAY: timedelta(days=1),
+}
+
+
+def floor_to(moment: datetime, granularity: str) -> datetime:
+    moment = moment.replace(second=0, microsecond=0)
+    if granularity in (HOUR, DAY):
+        moment = moment.replace(minute=0)
+    if granularity == DAY:
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def ceil_to(moment: datetime, granularity: str) -> datetime:
+    floored = floor_to(moment, granularity)
+    if floored == moment:
+        return floored
+    return floored + STEP[granularity]
+
+
+def cover(
+    start: datetime, end: datetime, granularities: Tuple[str, ...] = GRANULARITIES
+) -> List[Tuple[str, datetime, datetime]]:
+    """
+    Splits [start, end) into the fewest rollup ranges: whole days in the
+    middle, hours and then minutes towards the edges. Returns
+    (granularity, from, to) with bucket_start in [from, to). The finest level
+    is floored, so the first partial bucket is included.
+    """
+    if start >= end:
+        return []
+
+    granularity, finer = granularities[0], granularities[1:]
+    if not finer:
+        return [(granularity, floor_to(start, granularity), end)]
+
+    lo, hi = ceil_to(start, granularity), floor_to(end, granularity)
+    if lo >= hi:
+        return cover(start, end, finer)
+
+    return cover(start, lo, finer) + [(granularity, lo, hi)] + cover(hi, end, finer)
+
+
+class RollupAccumulator:
+    """
+    Pre-aggregates check results per (monitor, granularity, bucket) so a
+    batch is written with one upsert row per bucket.
+    """
+
+    def __init__(self) -> None:
+        self.buckets: Dict[RollupKey, List[int]] = {}
+        self.sketches: Dict[RollupKey, List[int]] = {}
+        # key: (phase_counts, phase_sums)
+        self.phases: Dict[RollupKey, Tuple[List[int], List[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+    def add(
+        self,
+        monitor_id: int,
+        checked_at: datetime,
+        is_up: bool,
+        response_time_ms: Optional[int],
+        timings: Sequence[Optional[int]] = (),
+    ) -> None:
+        """`timings` are the phase timings of the check, in PHASES order."""
+        for granularity in GRANULARITIES:
+            key = (monitor_id, granularity, floor_to(checked_at, granularity))
+            # checks, up_count, latency_count, latency_sum, min, max
+            bucket = self.buckets.setdefault(key, [0, 0, 0, 0, -1, -1])
+            bucket[0] += 1
+            bucket[1] += int(is_up)
+
+            if any(timing is not None for timing in timings):
+                counts, sums = self.phases.setdefault(
+                    key, ([0] * len(PHASES), [0] * len(PHASES))
+                )
+                for index, timing in enumerate(timings):
+                    if timing is not None:
+                        counts[index] += 1
+                        sums[index] += timing
+
+            if response_time_ms is None:
+                continue
+
+            bucket[2] += 1
+            bucket[3] += response_time_ms
+            if bucket[4] < 0 or response_time_ms < bucket[4]:
+                bucket[4] = response_time_ms
+            bucket[5] = max(bucket[5], response_time_ms)
+
+            sketch = self.sketches.setdefault(key, [0] * SKETCH_SIZE)
+            sketch[sketch_index(response_time_ms)] += 1
+
+    def rows(self) -> Iterable[Tuple[Any, ...]]:
+        """Upsert rows, sorted by key so concurrent writers lock in order."""
+        no_phases: Tuple[List[int], List[int]] = ([], [])
+        for key in sorted(self.buckets):
+            checks, up_count, latency_count, latency_sum, low, high = self.buckets[key]
+            phase_counts, phase_sums = self.phases.get(key, no_phases)
+            yield (
+                *key,
+                checks,
+                up_count,
+                latency_count,
+                latency_sum,
+                low if low >= 0 else None,
+                high if high >= 0 else None,
+                self.sketches.get(key, [0] * SKETCH_SIZE),
+                phase_counts,
+                phase_sums,
+            )
@@ -0,0 +1,184 @@
+from typing import Dict, Iterable, List, Optional, Tuple, cast
+import logging
+import random
+import time
+import redis
+from django.conf import settings
+from common.redis_client import get_redis_client
+from .models import Monitor
+
+logger = logging.getLogger(__name__)
+
+# Sorted set: monitor_id -> next due time (unix seconds)
+SCHEDULE_KEY = "monitor:schedule"
+# Hash: monitor_id -> interval (seconds)
+INTERVALS_KEY = "monitor:intervals"
+
+SYNC_CHUNK_SIZE = 1000
+
+# Fibonacci hashing: consecutive monitor IDs land far apart in the interval
+GOLDEN_RATIO_FRACTION = 0.6180339887498949
+# Jitter never exceeds this fraction of a monitor's interval
+MAX_JITTER_FRACTION = 0.1
+
+
+def phase(monitor_id: int, interval: int) -> float:
+    """Offset (seconds) of a monitor's checks within its interval."""
+    return (monitor_id * GOLDEN_RATIO_FRACTION) % 1 * interval
+
+
+def next_slot(monitor_id: int, interval: int, after: float) -> float:
+    """The first time after `after` that is the monitor's phase plus k intervals."""
+    return after + interval - (after - phase(monitor_id, interval)) % interval
+
+
+class MonitorScheduler:
+    """
+    Central scheduler backed by a Redis sorted set.
+
+    Every active monitor has exactly one entry scored by its next due time.
+    A tick reads the due range (O(log n + m)), moves each due monitor to its
+    next due time and enqueues them in batches for the Runner. The state
+    lives in Redis, so a scheduler restart resumes where it stopped.
+
+    Checks are spread evenly over each interval instead of firing together:
+    every monitor has a fixed phase derived from its ID, and a claimed
+    monitor moves to the next time on its phase, plus a little random
+    jitter. Monitors created or restored together thus drift apart after
+    their first check.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None) -> None:
+        self.redis = client or get_redis_client()
+        self.batch_size = settings.SCHEDULER_BATCH_SIZE
+        self.jitter = settings.SCHEDULER_JITTER_SECONDS
+
+    def next_due(self, monitor_id: int, interval: int, after: float) -> float:
+        """The monitor's next due time after `after`: on its phase, jittered."""
+        jitter = min(self.jitter, interval * MAX_JITTER_FRACTION)
+        return next_slot(monitor_id, interval, after) + random.uniform(0, jitter)
+
+    def schedule(
+        self, monitor_id: int, interval: int, due_at: Optional[float] = None
+    ) -> None:
+        """Registers a monitor. Without due_at it becomes due immediately."""
+        pipe = self.redis.pipeline()
+        pipe.hset(INTERVALS_KEY, str(monitor_id), str(interval))
+        pipe.zadd(SCHEDULE_KEY, {str(monitor_id): due_at or time.time()})
+        pipe.execute()
+
+    def update_interval(self, monitor_id: int, interval: int) -> None:
+        """Changes the interval of a scheduled monitor, keeping its next due."""
+        self.redis.hset(INTERVALS_KEY, str(monitor_id), str(interval))
+
+    def unschedule(self, monitor_ids: Iterable[int]) -> None:
+        members = [str(monitor_id) for monitor_id in monitor_ids]
+        if not members:
+            return
+        pipe = self.redis.pipeline()
+        pipe.zrem(SCHEDULE_KEY, *members)
+        pipe.hdel(INTERVALS_KEY, *members)
+        pipe.execute()
+
+    def claim_due(self, now: float, limit: int) -> List[int]:
+        """
+        Returns up to `limit` due monitor IDs and moves each of them to its
+        next due time after `now`. A monitor that fell behind skips the
+        checks it missed instead of firing them in a burst.
+        """
+        due = cast(
+            List[Tuple[str, float]],
+            self.redis.zrangebyscore(
+                SCHEDULE_KEY, "-inf", now, start=0, num=limit, withscores=True
+            ),
+        )
+        if not due:
+            return []
+
+        members = [member for member, _ in due]
+        intervals = cast(List[Optional[str]], self.redis.hmget(INTERVALS_KEY, members))
+
+        next_due: Dict[str, float] = {}
+        orphans: List[str] = []
+        for (member, _), interval in zip(due, intervals):
+            if interval is None:
+                orphans.append(member)
+                continue
+            next_due[member] = self.next_due(int(member), int(interval), now)
+
+        pipe = self.redis.pipeline()
+        if next_due:
+            # XX: never resurrect a monitor that was unscheduled meanwhile
+            pipe.zadd(SCHEDULE_KEY, next_due, xx=True)
+        if orphans:
+            pipe.zrem(SCHEDULE_KEY, *orphans)
+        pipe.execute()
+
+        return [int(member) for member in next_due]
+
+    def tick(self, now: Optional[float] = None) -> int:
+        """Enqueues every due monitor. Returns the number of monitors enqueued."""
+        from .tasks import check_monitors_batch_task
+
+        now = now or time.time()
+        enqueued = 0
+
+        while True:
+            monitor_ids = self.claim_due(now, self.batch_size)
+            if not monitor_ids:
+                break
+
+            check_monitors_batch_task.apply_async(
+                args=[monitor_ids], queue="runner_queue"
+            )
+            enqueued += len(monitor_ids)
+
+            if len(monitor_ids) < self.batch_size:
+                break
+
+        if enqueued:
+            logger.info(f"Enqueued {enqueued} due monitors")
+        return enqueued
+
+    def sync(self) -> Tuple[int, int]:
+        """
+        Reconciles the schedule with the database: registers active monitors
+        that are missing (e.g. after Redis data loss), due at their next
+        phase, and drops the ones that are no longer active.
+        Returns (added, removed).
+        """
+        now = time.time()
+        active = {
+            str(monitor_id): interval
+            for monitor_id, interval in Monitor.objects.filter(
+                is_active=True
+            ).values_list("id", "interval")
+        }
+        scheduled = {member for member, _ in self.redis.zscan_iter(SCHEDULE_KEY)}
+
+        missing = [member for member in active if member not in scheduled]
+        stale = [member for member in scheduled if member not in active]
+
+        members = list(active)
+        for i in range(0, len(members), SYNC_CHUNK_SIZE):
+            chunk = members[i : i + SYNC_CHUNK_SIZE]
+            self.redis.hset(
+                INTERVALS_KEY, mapping={member: active[member] for member in chunk}
+            )
+
+        for i in range(0, len(missing), SYNC_CHUNK_SIZE):
+            # Restored together, but not checked together
+            mapping = {
+                member: self.next_due(int(member), active[member], now)
+                for member in missing[i : i + SYNC_CHUNK_SIZE]
+            }
+            self.redis.zadd(SCHEDULE_KEY, mapping, nx=True)
+
+        for i in range(0, len(stale), SYNC_CHUNK_SIZE):
+            self.unschedule(int(member) for member in stale[i : i + SYNC_CHUNK_SIZE])
+
+        logger.info(
+            f"Schedule synced: {len(active)} active, "
+            f"{len(missing)} added, {len(stale)} removed"
+        )
+        return len(missing), len(stale)
@@ -1,10 +1,14 @@
+from typing import Any, Dict
 import ipaddress
 from urllib.parse import urlparse
 from rest_framework import serializers
 from monitor.models import Monitor, MonitorResult
+from monitor.resolver import is_forbidden_address
 
 
 class MonitorSerializer(serializers.ModelSerializer):
+    recent_uptime_percentage = serializers.FloatField(read_only=True, allow_null=True)
+
     class Meta:
         model = Monitor
         fields = (
@@ -15,24 +19,39 @@ class MonitorSerializer(serializers.ModelSerializer):
             "monitor_type",
             "status",
             "is_active",
+            "fresh_connection",
+            "expected_banner",
+            "last_checked_at",
+            "last_status_code",
+            "last_response_time_ms",
+            "recent_uptime_percentage",
+            "created_at",
+            "updated_at",
+        )
+        read_only_fields = (
+            "id",
+            "status",
+            "last_checked_at",
+            "last_status_code",
+            "last_response_time_ms",
             "created_at",
             "updated_at",
         )
-        read_only_fields = ("id", "status", "created_at", "updated_at")
 
     def validate_url(self, value: str) -> str:
         """
         Validates URL format and blocks obvious private/local addresses.
-        Note: Deep DNS inspection happens in the worker to avoid API blocking.
+        Note: Resolved addresses are vetted by the runner (monitor.resolver)
+        on every check, to avoid blocking the API on DNS.
         """
         try:
             parsed = urlparse(value)
         except Exception:
             raise serializers.ValidationError("Invalid URL format.")
 
-        if parsed.scheme not in ["http", "https"]:
+        if parsed.scheme not in ["http", "https", "tcp"]:
             raise serializers.ValidationError(
-                "Only HTTP and HTTPS schemes are supported"
+                "Only HTTP, HTTPS and TCP schemes are supported"
             )
 
         hostname = parsed.hostname
@@ -46,6 +65,28 @@ class MonitorSerializer(serializers.ModelSerializer):
 
         return value
 
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        """The URL must suit the monitor type: tcp://host:port for TCP."""
+        monitor_type = attrs.get(
+            "monitor_type", getattr(self.instance, "monitor_type", None)
+        )
+        url = attrs.get("url", getattr(self.instance, "url", ""))
+        schemes = Monitor.SCHEMES.get(monitor_type or "", ())
+        parsed = urlparse(url)
+        if parsed.scheme not in schemes:
+            raise serializers.ValidationError(
+                {"url": f"{monitor_type} monitors need a {' or '.join(schemes)} URL"}
+            )
+        try:
+            port = parsed.port
+        except ValueError:
+            port = None
+        if parsed.scheme == "tcp" and port is None:
+            raise serializers.ValidationError(
+                {"url": "TCP URLs need a port, e.g. tcp://db.example.com:5432"}
+            )
+        return attrs
+
     def _is_forbidden_host(self, hostname: str) -> bool:
         """Checks if the hostname is a restricted local or private address."""
         hostname_lower = hostname.lower()
@@ -58,10 +99,7 @@ class MonitorSerializer(serializers.ModelSerializer):
             return True
 
         try:
-            ip = ipaddress.ip_address(hostname)
-            if ip.is_private or ip.is_loopback or ip.is_link_local:
-                return True
-
+            return is_forbidden_address(ipaddress.ip_address(hostname))
         except ValueError:
             pass
 
@@ -73,10 +111,32 @@ class MonitorHistorySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = MonitorResult
-        fields = ("id", "status_code", "response_time_ms", "is_up", "created_at")
+        fields = (
+            "id",
+            "status_code",
+            "response_time_ms",
+            "dns_ms",
+            "connect_ms",
+            "tls_ms",
+            "ttfb_ms",
+            "transfer_ms",
+            "packet_loss",
+            "is_up",
+            "created_at",
+        )
         read_only_fields = fields
 
 
+class MonitorTimingsSerializer(serializers.Serializer):
+    """Average milliseconds per check phase, null when never timed."""
+
+    dns = serializers.FloatField(allow_null=True)
+    connect = serializers.FloatField(allow_null=True)
+    tls = serializers.FloatField(allow_null=True)
+    ttfb = serializers.FloatField(allow_null=True)
+    transfer = serializers.FloatField(allow_null=True)
+
+
 class MonitorStatsSerializer(serializers.Serializer):
     """
     Serializer for aggregated dashboard statistics.
@@ -89,4 +149,12 @@ class MonitorStatsSerializer(serializers.Serializer):
     down_count = serializers.IntegerField()
     uptime_percentage = serializers.FloatField()
     avg_response_time = serializers.FloatField()
+    p95_response_time = serializers.FloatField()
+    avg_timings = MonitorTimingsSerializer()
     last_check = MonitorHistorySerializer(allow_null=True)
+
+
+class MonitorBulkStatsSerializer(MonitorStatsSerializer):
+    """Statistics of one monitor in the bulk stats response."""
+
+    monitor_id = serializers.IntegerField()
@@ -1,12 +1,25 @@
 from typing import Dict, Any, Optional, List
-from django.db.models import QuerySet, Avg
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
 from django.utils import timezone
 from datetime import timedelta, datetime
 import logging
-import statistics
 from common.services import BaseService
 from .models import Monitor, MonitorResult
-from .crud import MonitorCRUD, MonitorResultCRUD
+from .crud import MonitorCRUD, MonitorResultCRUD, MonitorRollupCRUD, HISTORY_PERIODS
+from .downsampling import DEFAULT_POINTS, lttb
+from .dtos import CheckResult, CheckTimings
+from .events import MonitorEventPublisher
+from .baseline import LatencyBaseline
+from .dashboard import (
+    RECENT_FAILURES,
+    DashboardSummary,
+    SummaryUpdate,
+    failure_entry,
+)
+from .rollups import HOUR, floor_to
+from .fleet import FleetAnomalyDetector, FLEET_ALERT_KEY
 from notifications.tasks import send_notification_task
 from notifications.crud import NotificationChannelCRUD
 
@@ -16,49 +29,63 @@ logger = logging.getLogger(__name__)
 class MonitorService(BaseService[Monitor]):
     model = Monitor
     crud_class = MonitorCRUD
+    crud: MonitorCRUD
 
     def __init__(self) -> None:
         super().__init__()
         self.result_crud = MonitorResultCRUD()
+        self.rollup_crud = MonitorRollupCRUD()
         self.notification_crud = NotificationChannelCRUD()
+        self.baseline = LatencyBaseline()
+        self.dashboard = DashboardSummary()
+        self.events = MonitorEventPublisher()
 
     def process_check_result(
-        self, monitor_id: int, is_up: bool, response_time: int, status_code: int
+        self,
+        monitor_id: int,
+        is_up: bool,
+        response_time: int,
+        status_code: Optional[int],
+        timings: Optional[CheckTimings] = None,
+        packet_loss: Optional[int] = None,
     ) -> None:
         """
         Called by the Runner Worker.
-        Uses strictly existing fields: monitor.status (UP/DOWN string).
+        Hot path: one UPDATE ... RETURNING for the status transition plus one
+        INSERT for the result. Monitor.save() is deliberately bypassed.
         """
         logger.info(
             f"Processing check result for monitor_id={monitor_id}, "
             f"is_up={is_up}, status_code={status_code}"
         )
 
-        monitor = self.get(monitor_id)
-        if not monitor:
-            logger.error(f"Monitor {monitor_id} not found during result processing.")
-            return
-
         # 1. Determine the New Status String based on the boolean result
         new_status = Monitor.StatusType.UP if is_up else Monitor.StatusType.DOWN
 
-        # 2. Check for State Change (String Comparison)
-        previous_status = monitor.status
-        has_status_changed = (
-            previous_status != new_status and new_status != Monitor.StatusType.PAUSED
+        # 2. Update the monitor and read its previous status atomically
+        transition = self.crud.record_check(
+            monitor_id, new_status, timezone.now(), status_code, response_time
         )
+        if transition is None:
+            logger.error(f"Monitor {monitor_id} not found during result processing.")
+            return
+
+        previous_status, monitor = transition
+        has_status_changed = previous_status != new_status
 
-        self.result_crud.create(
-            monitor=monitor,
+        result = self.result_crud.create(
+            monitor_id=monitor_id,
             status_code=status_code,
             response_time_ms=response_time,
             is_up=is_up,
+            packet_loss=packet_loss,
+            **(timings or CheckTimings()).as_fields(),
         )
+        self.dashboard.record([(previous_status, monitor, result)])
+        self.events.publish([(previous_status, monitor, result)])
 
         logger.debug(f"Logged result for {monitor.name}")
 
-        self.update(monitor, status=new_status, last_checked_at=timezone.now())
-
         if has_status_changed:
             logger.info(
                 f"Status changed ({previous_status} -> {new_status}) for {monitor.name}"
@@ -67,6 +94,86 @@ class MonitorService(BaseService[Monitor]):
         elif is_up:
             self.detect_anomaly(monitor, response_time)
 
+    def process_check_results(self, results: List[CheckResult]) -> None:
+        """
+        Bulk counterpart of process_check_result, fed by the ResultBuffer.
+        One transaction: lock the monitors, one bulk UPDATE, one bulk INSERT.
+        Alerts and anomaly checks run after commit.
+        """
+        if not results:
+            return
+
+        logger.info(f"Processing {len(results)} check results")
+
+        now = timezone.now()
+        follow_ups: List[tuple[Monitor, str, bool, CheckResult]] = []
+        summary_updates: List[SummaryUpdate] = []
+
+        with transaction.atomic():
+            monitors = self.crud.lock_many(r.monitor_id for r in results)
+
+            rows = []
+            for result in results:
+                monitor = monitors.get(result.monitor_id)
+                if monitor is None:
+                    logger.error(
+                        f"Monitor {result.monitor_id} not found during "
+                        "result processing."
+                    )
+                    continue
+
+                new_status: str = (
+                    Monitor.StatusType.UP if result.is_up else Monitor.StatusType.DOWN
+                )
+                previous_status = monitor.status
+                has_status_changed = previous_status != new_status
+                monitor.status = new_status
+                monitor.last_checked_at = max(
+                    result.checked_at, monitor.last_checked_at or result.checked_at
+                )
+                monitor.updated_at = now
+                monitor.record_result(
+                    result.is_up, result.status_code, result.response_time_ms
+                )
+
+                row = MonitorResult(
+                    monitor_id=result.monitor_id,
+                    status_code=result.status_code,
+                    response_time_ms=result.response_time_ms,
+                    is_up=result.is_up,
+                    packet_loss=result.packet_loss,
+                    checked_at=result.checked_at,
+                    created_at=result.checked_at,
+                    **result.timings.as_fields(),
+                )
+                rows.append(row)
+                summary_updates.append((previous_status, monitor, row))
+                follow_ups.append((monitor, new_status, has_status_changed, result))
+
+            self.crud.bulk_update(
+                list(monitors.values()),
+                [
+                    "status",
+                    "last_checked_at",
+                    "updated_at",
+                    "last_status_code",
+                    "last_response_time_ms",
+                    "recent_checks",
+                    "recent_checks_count",
+                ],
+            )
+            self.result_crud.bulk_create(rows)
+            self.rollup_crud.record(rows)
+
+        self.dashboard.record(summary_updates)
+        self.events.publish(summary_updates)
+        for monitor, new_status, has_status_changed, result in follow_ups:
+            if has_status_changed:
+                logger.info(f"Status changed to {new_status} for {monitor.name}")
+                self.dispatch_alerts(monitor, new_status)
+            elif result.is_up:
+                self.detect_anomaly(monitor, result.response_time_ms)
+
     def dispatch_alerts(self, monitor: Monitor, new_status: str) -> None:
         """
         Finds subscriber channels and pushes tasks to the Notification Queue.
@@ -123,12 +230,44 @@ class MonitorService(BaseService[Monitor]):
 
     def get_stats(self, monitor: Monitor, period: str = "24h") -> Dict[str, Any]:
         """Get aggregated statistics for a monitor."""
-        start_time = self._calculate_start_time(period=period)
-
-        qs = self.result_crud.filter_by_monitor_and_period(monitor, start_time)
-        stats = self.result_crud.get_stats_aggregate(qs)
+        stats = self.rollup_crud.get_stats_aggregate(
+            monitor, self._stats_start_time(period), timezone.now()
+        )
         last_check = self.result_crud.get_last_check(monitor=monitor)
+        return self._format_stats(period, stats, last_check)
+
+    def get_bulk_stats(
+        self, monitors: List[Monitor], period: str = "24h"
+    ) -> List[Dict[str, Any]]:
+        """
+        get_stats of every monitor (e.g. a page of the list), keyed by
+        monitor_id, in two queries: the rollups and the last checks.
+        """
+        monitor_ids = [monitor.id for monitor in monitors]
+        stats = self.rollup_crud.get_stats_aggregates(
+            monitor_ids, self._stats_start_time(period), timezone.now()
+        )
+        last_checks = self.result_crud.get_last_checks(monitor_ids)
+        return [
+            {
+                "monitor_id": monitor_id,
+                **self._format_stats(
+                    period, stats[monitor_id], last_checks.get(monitor_id)
+                ),
+            }
+            for monitor_id in monitor_ids
+        ]
 
+    def _stats_start_time(self, period: str) -> datetime:
+        start_time = self._calculate_start_time(period=period)
+        if period in ("7d", "30d"):
+            # Minute rollups expire after a few days; start on an hour bucket
+            start_time = floor_to(start_time, HOUR)
+        return start_time
+
+    def _format_stats(
+        self, period: str, stats: Dict[str, Any], last_check: Optional[MonitorResult]
+    ) -> Dict[str, Any]:
         total = stats["total_checks"]
         up = stats["up_count"] or 0
 
@@ -139,6 +278,11 @@ class MonitorService(BaseService[Monitor]):
             "down_count": stats["down_count"] or 0,
             "uptime_percentage": round((up / total * 100), 2) if total > 0 else 0.0,
             "avg_response_time": round(stats["avg_latency"] or 0, 2),
+            "p95_response_time": round(stats["p95_latency"] or 0, 2),
+            "avg_timings": {
+                phase: None if average is None else round(average, 2)
+                for phase, average in stats["avg_timings"].items()
+            },
             "last_check": last_check,
         }
 
@@ -156,76 +300,104 @@ class MonitorService(BaseService[Monitor]):
         """Get history logs for a monitor."""
         return self.result_crud.get_history(monitor, period)
 
-    def get_dashboard_stats(self, user: Any) -> Dict[str, Any]:
-        """Get global dashboard statistics for a user."""
-        active_monitors_qs = self.crud.filter(user=user, is_active=True)
-        total_count = self.crud.filter(user=user).count()
-        active_count = active_monitors_qs.count()
-
-        down_count = active_monitors_qs.filter(status=Monitor.StatusType.DOWN).count()
-        up_count = active_monitors_qs.filter(status=Monitor.StatusType.UP).count()
-
-        last_24h = timezone.now() - timedelta(hours=24)
-        latency_agg = self.result_crud.filter(
-            monitor__user=user, created_at__gte=last_24h, response_time_ms__isnull=False
-        ).aggregate(avg=Avg("response_time_ms"))
-
-        avg_latency = latency_agg["avg"] or 0.0
+    def get_history_graph(
+        self,
+        monitor: Monitor,
+        period: str = "24h",
+        points: int = DEFAULT_POINTS,
+        method: str = "buckets",
+    ) -> Dict[str, Any]:
+        """
+        Response-time series of at most `points` points for charting:
+        min/avg/max per time bucket (computed in SQL), or the raw checks
+        picked by LTTB, which keeps the visual spikes.
+        """
+        if period not in HISTORY_PERIODS:
+            period = "24h"
+        span = HISTORY_PERIODS[period]
+        # Taken before get_history filters, so no row predates it
+        start_time = timezone.now() - span
+        queryset = self.result_crud.get_history(monitor, period)
+
+        if method == "lttb":
+            rows = list(
+                queryset.filter(response_time_ms__isnull=False)
+                .order_by("created_at", "id")
+                .values_list("created_at", "response_time_ms", "is_up")
+            )
+            keep = lttb(
+                [created_at.timestamp() for created_at, _, _ in rows],
+                [float(response_time or 0) for _, response_time, _ in rows],
+                points,
+            )
+            series = [
+                {
+                    "timestamp": rows[i][0],
+                    "response_time_ms": rows[i][1],
+                    "is_up": rows[i][2],
+                }
+                for i in keep
+            ]
+        else:
+            width = span.total_seconds() / points
+            series = [
+                {
+                    "timestamp": start_time + timedelta(seconds=row["bucket"] * width),
+                    "checks": row["checks"],
+                    "up_count": row["up_count"],
+                    "min_response_time": row["min_latency"],
+                    "avg_response_time": round(row["avg_latency"], 2),
+                    "max_response_time": row["max_latency"],
+                }
+                for row in self.result_crud.get_history_buckets(
+                    queryset, start_time, width, points
+                )
+            ]
 
-        recent_failures = self._serialize_recent_failures(user)
+        return {"period": period, "method": method, "points": series}
 
-        return {
-            "total": total_count,
-            "active": active_count,
-            "up": up_count,
-            "down": down_count,
-            "avg_latency": round(avg_latency, 2),
-            "recent_failures": recent_failures,
-        }
+    def get_dashboard_stats(self, user: Any) -> Dict[str, Any]:
+        """
+        Get global dashboard statistics for a user.
+        Read from the Redis summary the ingestion path keeps up to date; the
+        database is only queried to (re)build it.
+        """
+        stats = self.dashboard.get(user.id)
+        if stats is not None:
+            return stats
 
-    def _serialize_recent_failures(self, user: Any) -> List[Dict[str, Any]]:
-        """Helper to fetch and format recent failures."""
-        failures_qs = self.result_crud.get_recent_failures(user)
-        return [
-            {
-                "id": res.id,
-                "monitor_name": res.monitor.name,
-                "url": res.monitor.url,
-                "code": res.status_code,
-                "created_at": res.created_at,
-                "reason": (
-                    "Timeout" if res.status_code == 0 else f"{res.status_code} Error"
-                ),
-            }
-            for res in failures_qs
-        ]
+        now = timezone.now()
+        return self.dashboard.build(
+            user.id,
+            counts=self.crud.get_status_counts(user),
+            latency=self.rollup_crud.get_user_hourly_latency(
+                user, floor_to(now - timedelta(hours=24), HOUR)
+            ),
+            failures=[
+                failure_entry(res, res.monitor)
+                for res in self.result_crud.get_recent_failures(
+                    user, limit=RECENT_FAILURES
+                )
+            ],
+            now=now,
+        )
 
     def detect_anomaly(self, monitor: Monitor, current_response_time: int) -> None:
         """
         Calculates Z-Score to detect statistical outliers in response time.
+        Uses the online Redis baseline; history is only read on a cold start.
         """
-        history_values = list(
-            self.result_crud.filter(monitor=monitor)
-            .order_by("-created_at")
-            .values_list("response_time_ms", flat=True)[:21]
+        stats = self.baseline.observe(
+            monitor.id,
+            current_response_time,
+            seed=lambda: self._baseline_history(monitor),
         )
 
-        if len(history_values) < 11:
-            logger.debug(
-                f"Not enough data for anomaly detection. Count: {len(history_values)}"
-            )
-            return
-
-        baseline = [v for v in history_values[1:] if v is not None]
-
-        if len(baseline) < 10:
+        if stats is None:
+            logger.debug(f"Not enough data for anomaly detection for {monitor.name}")
             return
 
-        try:
-            mean = statistics.mean(baseline)
-            stdev = statistics.stdev(baseline)
-        except statistics.StatisticsError:
-            return
+        _, mean, stdev = stats
 
         if stdev == 0:
             logger.warning(
@@ -243,8 +415,69 @@ class MonitorService(BaseService[Monitor]):
             )
             self._dispatch_anomaly_alert(monitor, current_response_time, mean)
 
+    def _baseline_history(self, monitor: Monitor) -> List[int]:
+        """Previous response times (newest first) used to seed a baseline."""
+        history_values = list(
+            self.result_crud.filter(monitor=monitor)
+            .order_by("-created_at")
+            .values_list("response_time_ms", flat=True)[:21]
+        )
+        # The newest row is the result currently being processed
+        return [v for v in history_values[1:] if v is not None]
+
+    def detect_fleet_anomalies(self) -> int:
+        """
+        Runs the fleet-wide detector and sends a performance warning for every
+        flagged monitor, at most once per FLEET_ANOMALY_COOLDOWN_SECONDS.
+        Returns the number of alerts sent.
+        """
+        anomalies = FleetAnomalyDetector().detect()
+        if not anomalies:
+            return 0
+
+        monitors = (
+            self.crud.filter(id__in=[anomaly.monitor_id for anomaly in anomalies])
+            .select_related("user")
+            .in_bulk()
+        )
+        redis = self.baseline.redis
+        alerted = 0
+        for anomaly in anomalies:
+            monitor = monitors.get(anomaly.monitor_id)
+            if monitor is None:
+                continue
+
+            # A sustained degradation stays flagged on every run
+            if not redis.set(
+                FLEET_ALERT_KEY.format(monitor.id),
+                1,
+                nx=True,
+                ex=settings.FLEET_ANOMALY_COOLDOWN_SECONDS,
+            ):
+                continue
+
+            logger.warning(
+                f"FLEET ANOMALY: {monitor.name} at {anomaly.current:.0f}ms "
+                f"(median: {anomaly.median:.0f}ms, score: {anomaly.score:.1f})"
+            )
+            self._dispatch_anomaly_alert(
+                monitor,
+                round(anomaly.current),
+                anomaly.median,
+                baseline_label=(
+                    f"Median (Last {settings.FLEET_ANOMALY_WINDOW_MINUTES} min)"
+                ),
+            )
+            alerted += 1
+
+        return alerted
+
     def _dispatch_anomaly_alert(
-        self, monitor: Monitor, current: int, mean: float
+        self,
+        monitor: Monitor,
+        current: int,
+        mean: float,
+        baseline_label: str = "Average (Last 20 checks)",
     ) -> None:
         """Specific alert for performance degradation."""
         channels = self.notification_crud.filter(user=monitor.user, is_active=True)
@@ -253,7 +486,7 @@ class MonitorService(BaseService[Monitor]):
         message = (
             f"Monitor: {monitor.name}\n"
             f"Current response: {current}ms\n"
-            f"Average (Last 20 checks): {mean:.0f}ms\n"
+            f"{baseline_label}: {mean:.0f}ms\n"
             f"Analysis: Response time is abnormally high."
         )
 
@@ -1,10 +1,14 @@
-from typing import Any
-import requests
-import time
+from typing import Any, List
 import logging
 from celery import shared_task
+from django.conf import settings
 from .models import Monitor
 from .services import MonitorService
+from .engine import AsyncCheckEngine
+from .scheduler import MonitorScheduler
+from .ingestion import result_buffer
+from .partitions import ResultPartitionManager
+from .retention import RetentionEngine
 
 logger = logging.getLogger(__name__)
 
@@ -20,45 +24,100 @@ def check_monitor_task(self: Any, monitor_id: int) -> str:
     logger.info(f"Starting check for monitor_id={monitor_id}")
 
     try:
-        monitor = Monitor.objects.only("url", "interval", "is_active").get(
-            id=monitor_id
-        )
+        monitor = Monitor.objects.only(
+            "url", "is_active", "monitor_type", "fresh_connection", "expected_banner"
+        ).get(id=monitor_id)
         if not monitor.is_active:
-            logger.info(f"Monitor {monitor_id} is inactive, stopping loop")
-            return f"Monitor {monitor_id} is inactive. Loop stopping..."
+            logger.info(f"Monitor {monitor_id} is inactive, skipping check")
+            return f"Monitor {monitor_id} is inactive. Skipping..."
 
     except Monitor.DoesNotExist:
         logger.error(f"Monitor {monitor_id} does not exist")
-        return f"Monitor {monitor_id} does not exist. Loop stopping..."
+        return f"Monitor {monitor_id} does not exist. Skipping..."
 
-    start_time = time.time()
-    try:
-        response = requests.get(
-            monitor.url,
-            timeout=10,
-            headers={"User-Agent": "StatusHawk Monitor/1.0"},
-        )
-        status_code = response.status_code
-        is_up = 200 <= status_code < 300
-        logger.info(
-            f"Monitor {monitor.url} responded "
-            f"with status_code={status_code}, is_up={is_up}"
-        )
-
-    except requests.RequestException as e:
-        status_code = 0
-        is_up = False
-        logger.warning(f"Monitor {monitor.url} failed with exception: {e}")
-
-    duration_ms = int((time.time() - start_time) * 1000)
-    logger.debug(f"Check completed in {duration_ms}ms")
+    # Same engine as the batch path: pinned, vetted addresses (SSRF-safe)
+    result = AsyncCheckEngine().run([monitor])[0]
+    logger.info(
+        f"Monitor {monitor.url} responded with status_code={result.status_code}, "
+        f"is_up={result.is_up} in {result.response_time_ms}ms"
+    )
 
     # Use MonitorService to process the result (handles alerts)
     service = MonitorService()
-    service.process_check_result(monitor_id, is_up, duration_ms, status_code)
+    service.process_check_result(
+        monitor_id,
+        result.is_up,
+        result.response_time_ms,
+        result.status_code,
+        result.timings,
+        result.packet_loss,
+    )
+
+    # The next check is enqueued by the scheduler service (monitor.scheduler)
+    return f"Checked {monitor.url}: {result.status_code}"
+
+
+@shared_task(
+    name="monitor.tasks.check_monitors_batch_task",
+    bind=True,
+    queue="runner_queue",
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def check_monitors_batch_task(self: Any, monitor_ids: List[int]) -> str:
+    """
+    Checks a slice of due monitors concurrently on one event loop and
+    hands all results to the worker's ResultBuffer for bulk writing.
+    """
+    logger.info(f"Starting batch check for {len(monitor_ids)} monitors")
+
+    monitors = list(
+        Monitor.objects.only(
+            "id", "url", "monitor_type", "fresh_connection", "expected_banner"
+        ).filter(id__in=monitor_ids, is_active=True)
+    )
+
+    # Deleted/paused monitors that are still scheduled: drop them for good
+    stale_ids = set(monitor_ids) - {monitor.id for monitor in monitors}
+    if stale_ids:
+        MonitorScheduler().unschedule(stale_ids)
+
+    if not monitors:
+        logger.info("No active monitors in batch, nothing to check")
+        return "No active monitors in batch"
 
-    # Schedule next check
-    check_monitor_task.apply_async((monitor_id,), countdown=monitor.interval)
-    logger.info(f"Next check for {monitor.url} scheduled in {monitor.interval}s")
+    results = AsyncCheckEngine().run(monitors)
+    result_buffer.add(results)
 
-    return f"Checked {monitor.url}: {status_code} (Next in {monitor.interval}s)"
+    up_count = sum(1 for result in results if result.is_up)
+    return f"Checked {len(results)} monitors ({up_count} up)"
+
+
+@shared_task(
+    name="monitor.tasks.detect_fleet_anomalies_task",
+    queue="analytics_queue",
+)
+def detect_fleet_anomalies_task() -> str:
+    """Periodic (Celery beat) fleet-wide latency scan."""
+    alerted = MonitorService().detect_fleet_anomalies()
+    return f"Fleet anomaly scan sent {alerted} alerts"
+
+
+@shared_task(
+    name="monitor.tasks.manage_result_partitions_task",
+    queue="analytics_queue",
+)
+def manage_result_partitions_task() -> str:
+    """Periodic (Celery beat) creation of upcoming MonitorResult partitions."""
+    created = ResultPartitionManager().ensure(settings.RESULT_PARTITION_PREMAKE_DAYS)
+    return f"Created {len(created)} result partitions"
+
+
+@shared_task(
+    name="monitor.tasks.apply_retention_task",
+    queue="analytics_queue",
+)
+def apply_retention_task() -> str:
+    """Periodic (Celery beat) purge of expired results and rollups."""
+    purged = RetentionEngine().run()
+    return f"Retention purged {purged}"
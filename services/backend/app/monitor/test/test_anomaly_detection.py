@@ -109,3 +109,22 @@ class TestAnomalyDetection:
         assert args[0] == channel.id  # type: ignore[attr-defined]
         assert "Performance Warning" in args[1]
         assert "500ms" in args[2]
+
+    def test_detect_anomaly_reads_history_only_once(
+        self,
+        service: MonitorService,
+        monitor: Monitor,
+        django_assert_num_queries: Any,
+    ) -> None:
+        for i in range(20):
+            MonitorResult.objects.create(
+                monitor=monitor, response_time_ms=100 + (i % 3), is_up=True
+            )
+
+        with django_assert_num_queries(1):
+            service.detect_anomaly(monitor, 101)
+
+        with patch.object(service, "_dispatch_anomaly_alert") as mock_alert:
+            with django_assert_num_queries(0):
+                service.detect_anomaly(monitor, 500)
+            mock_alert.assert_called_once()
@@ -0,0 +1,71 @@
+import pytest
+import random
+import statistics
+from typing import Any, List
+from monitor.baseline import LatencyBaseline, BASELINE_KEY, BASELINE_TTL
+
+
+def _no_history() -> List[int]:
+    return []
+
+
+class TestLatencyBaseline:
+    """Unit tests for the Redis ring-buffer baseline"""
+
+    def test_not_enough_samples(self) -> None:
+        baseline = LatencyBaseline()
+
+        for value in range(10):
+            assert baseline.observe(1, 100 + value, seed=_no_history) is None
+
+        stats = baseline.observe(1, 100, seed=_no_history)
+        assert stats is not None
+        count, mean, _ = stats
+        assert count == 10
+        assert mean == pytest.approx(104.5)
+
+    def test_matches_statistics_over_sliding_window(self) -> None:
+        baseline = LatencyBaseline(window=20)
+        values = [random.randint(50, 500) for _ in range(60)]
+
+        for i, value in enumerate(values):
+            stats = baseline.observe(1, value, seed=_no_history)
+            window = values[max(0, i - 20) : i]
+            if len(window) < 10:
+                assert stats is None
+                continue
+            count, mean, stdev = stats  # type: ignore[misc]
+            assert count == len(window)
+            assert mean == pytest.approx(statistics.mean(window))
+            assert stdev == pytest.approx(statistics.stdev(window))
+
+    def test_seed_is_used_once(self) -> None:
+        baseline = LatencyBaseline()
+        calls = []
+
+        def seed() -> List[int]:
+            calls.append(1)
+            return [300, 200] + [100] * 30  # newest first
+
+        stats = baseline.observe(1, 100, seed=seed)
+        baseline.observe(1, 100, seed=seed)
+
+        assert len(calls) == 1
+        count, mean, _ = stats  # type: ignore[misc]
+        assert count == 20
+        assert mean == pytest.approx((300 + 200 + 18 * 100) / 20)
+
+    def test_state_expires(self, fake_redis: Any) -> None:
+        baseline = LatencyBaseline()
+
+        baseline.observe(7, 100, seed=_no_history)
+
+        assert 0 < fake_redis.ttl(BASELINE_KEY.format(7)) <= BASELINE_TTL
+
+    def test_reset(self, fake_redis: Any) -> None:
+        baseline = LatencyBaseline()
+        baseline.observe(7, 100, seed=_no_history)
+
+        baseline.reset(7)
+
+        assert not fake_redis.exists(BASELINE_KEY.format(7))
@@ -0,0 +1,177 @@
+import asyncio
+from typing import List
+import httpx
+import pytest
+from monitor.coalescing import CheckCoalescer, target_key
+from monitor.connections import RunnerConnections
+from monitor.dtos import CheckResult
+from monitor.engine import AsyncCheckEngine
+from monitor.models import Monitor
+
+
+class TestTargetKey:
+    """Unit tests for which monitors share a check"""
+
+    @pytest.mark.parametrize(
+        "first, second",
+        [
+            ("https://example.com/", "HTTPS://Example.COM/"),
+            ("https://example.com/", "https://example.com:443/"),
+            ("http://example.com/a?b=1", "http://example.com:80/a?b=1"),
+            ("https://example.com/a", "https://example.com/a#section"),
+        ],
+    )
+    def test_equivalent_urls_match(self, first: str, second: str) -> None:
+        assert target_key(Monitor(url=first, monitor_type="HTTP")) == target_key(
+            Monitor(url=second, monitor_type="HTTP")
+        )
+
+    @pytest.mark.parametrize(
+        "first, second",
+        [
+            ("https://example.com/", "http://example.com/"),
+            ("https://example.com/", "https://example.com:8443/"),
+            ("https://example.com/a", "https://example.com/A"),
+            ("https://example.com/?a=1", "https://example.com/?a=2"),
+            ("https://example.com/", "https://user@example.com/"),
+        ],
+    )
+    def test_different_requests_do_not_match(self, first: str, second: str) -> None:
+        assert target_key(Monitor(url=first, monitor_type="HTTP")) != target_key(
+            Monitor(url=second, monitor_type="HTTP")
+        )
+
+    def test_fresh_connection_monitors_check_on_their_own(self) -> None:
+        url = "https://example.com/"
+        assert target_key(Monitor(url=url, monitor_type="HTTP")) != target_key(
+            Monitor(url=url, monitor_type="HTTP", fresh_connection=True)
+        )
+
+    def test_tcp_monitors_match_on_host_port_and_banner(self) -> None:
+        def key(url: str, banner: str = "") -> object:
+            return target_key(
+                Monitor(url=url, monitor_type="TCP", expected_banner=banner)
+            )
+
+        assert key("tcp://Example.com:22") == key("tcp://example.com:22")
+        assert key("tcp://example.com:22") != key("tcp://example.com:2222")
+        assert key("tcp://example.com:22") != key("tcp://example.com:22", "SSH")
+
+
+class TestCheckCoalescer:
+    """Unit tests for sharing checks between monitors"""
+
+    def _result(self, monitor_id: int = 0) -> CheckResult:
+        return CheckResult(
+            monitor_id=monitor_id, is_up=True, response_time_ms=12, status_code=200
+        )
+
+    def test_concurrent_checks_share_one_run(self) -> None:
+        runs: List[int] = []
+
+        async def run() -> CheckResult:
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            return self._result()
+
+        async def check_all() -> List[CheckResult]:
+            coalescer = CheckCoalescer(window=5)
+            monitors = [
+                Monitor(id=i, url="https://example.com/", monitor_type="HTTP")
+                for i in (1, 2, 3)
+            ]
+            return list(
+                await asyncio.gather(
+                    *[coalescer.check(monitor, run) for monitor in monitors]
+                )
+            )
+
+        results = asyncio.run(check_all())
+
+        assert len(runs) == 1
+        assert [result.monitor_id for result in results] == [1, 2, 3]
+        assert all(result.status_code == 200 for result in results)
+
+    def test_results_are_reused_within_the_window(self) -> None:
+        now = [0.0]
+        runs: List[int] = []
+
+        async def run() -> CheckResult:
+            runs.append(1)
+            return self._result()
+
+        async def check_at(coalescer: CheckCoalescer, *times: float) -> None:
+            monitor = Monitor(id=1, url="https://example.com/", monitor_type="HTTP")
+            for at in times:
+                now[0] = at
+                await coalescer.check(monitor, run)
+
+        coalescer = CheckCoalescer(window=5, clock=lambda: now[0])
+        asyncio.run(check_at(coalescer, 0, 4.9, 5, 6))
+
+        assert len(runs) == 2
+        assert list(coalescer.checks.values())[0][0] == 5
+
+    def test_waiters_time_out_without_cancelling_the_check(self) -> None:
+        async def run() -> CheckResult:
+            await asyncio.sleep(0.05)
+            return self._result()
+
+        async def check_both() -> CheckResult:
+            coalescer = CheckCoalescer(window=5)
+            first = Monitor(id=1, url="https://example.com/", monitor_type="HTTP")
+            second = Monitor(id=2, url="https://example.com/", monitor_type="HTTP")
+            with pytest.raises(TimeoutError):
+                await coalescer.check(first, run, timeout=0.01)
+            return await coalescer.check(second, run, timeout=1)
+
+        assert asyncio.run(check_both()).monitor_id == 2
+
+
+class TestCoalescedChecks:
+    """Tests for coalescing in the check engine"""
+
+    def test_monitors_of_one_target_send_one_request(self) -> None:
+        seen: List[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.url.path)
+            return httpx.Response(200)
+
+        connections = RunnerConnections(transport=httpx.MockTransport(handler))
+        engine = AsyncCheckEngine(connections=connections)
+        monitors = [
+            Monitor(id=1, url="https://example.com/up", monitor_type="HTTP"),
+            Monitor(id=2, url="https://EXAMPLE.com:443/up", monitor_type="HTTP"),
+            Monitor(id=3, url="https://example.com/other", monitor_type="HTTP"),
+        ]
+        try:
+            results = connections.run(engine.check_many(monitors))
+        finally:
+            connections.close()
+
+        assert sorted(seen) == ["/other", "/up"]
+        assert [result.monitor_id for result in results] == [1, 2, 3]
+        assert all(result.is_up for result in results)
+
+    def test_slow_shared_check_is_down_for_its_monitors(self) -> None:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(1)
+            return httpx.Response(200)
+
+        connections = RunnerConnections(transport=httpx.MockTransport(handler))
+        engine = AsyncCheckEngine(connections=connections, timeout=0.05)
+        monitors = [
+            Monitor(id=1, url="https://example.com/", monitor_type="HTTP"),
+            Monitor(id=2, url="https://example.com/", monitor_type="HTTP"),
+        ]
+        try:
+            results = connections.run(engine.check_many(monitors))
+        finally:
+            connections.close()
+
+        assert [(result.monitor_id, result.is_up) for result in results] == [
+            (1, False),
+            (2, False),
+        ]
+        assert all(result.status_code == 0 for result in results)
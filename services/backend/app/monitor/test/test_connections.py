@@ -0,0 +1,221 @@
+import asyncio
+import subprocess
+import sys
+import textwrap
+import threading
+from pathlib import Path
+from typing import List
+import httpx
+from monitor.connections import HostPools, RunnerConnections
+from monitor.engine import AsyncCheckEngine
+from monitor.models import Monitor
+from monitor.politeness import HostLimiter
+
+
+class CountingTransports:
+    """Transport factory that records every transport (pool) it creates."""
+
+    def __init__(self) -> None:
+        self.created: List[httpx.MockTransport] = []
+        self.closed = 0
+
+    def __call__(self) -> httpx.AsyncBaseTransport:
+        factory = self
+
+        class Transport(httpx.MockTransport):
+            async def aclose(self) -> None:
+                factory.closed += 1
+
+        transport = Transport(lambda request: httpx.Response(200))
+        self.created.append(transport)
+        return transport
+
+
+class TestHostPools:
+    """Unit tests for the per-host keep-alive pools"""
+
+    def _get(self, pools: HostPools, *urls: str) -> None:
+        async def get() -> None:
+            # Not closed: closing the client would close every pool
+            client = httpx.AsyncClient(transport=pools)
+            for url in urls:
+                await client.get(url)
+
+        asyncio.run(get())
+
+    def test_one_pool_per_host(self) -> None:
+        transports = CountingTransports()
+        pools = HostPools(10, 30, transport_factory=transports)
+
+        self._get(
+            pools,
+            "https://example.com/a",
+            "https://example.com/b",
+            "https://example.org/",
+            "http://example.com/",
+        )
+
+        assert len(transports.created) == 3
+        assert set(pools.pools) == {
+            ("https", "example.com"),
+            ("https", "example.org"),
+            ("http", "example.com"),
+        }
+
+    def test_idle_pools_are_closed(self) -> None:
+        now = [0.0]
+        transports = CountingTransports()
+        pools = HostPools(10, 30, transport_factory=transports, clock=lambda: now[0])
+
+        self._get(pools, "https://example.com/", "https://example.org/")
+        now[0] = 20
+        self._get(pools, "https://example.com/")
+        now[0] = 45
+        self._get(pools, "https://example.net/")
+
+        assert transports.closed == 1
+        assert set(pools.pools) == {("https", "example.com"), ("https", "example.net")}
+
+    def test_limits_bound_each_host(self) -> None:
+        pools = HostPools(4, 15)
+
+        assert pools.limits.max_connections == 4
+        assert pools.limits.max_keepalive_connections == 4
+        assert pools.limits.keepalive_expiry == 15
+
+
+class TestRunnerConnections:
+    """Unit tests for the worker-scoped loop and clients"""
+
+    def test_clients_outlive_a_batch(self) -> None:
+        seen: List[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.url.path)
+            return httpx.Response(200)
+
+        connections = RunnerConnections(
+            transport=httpx.MockTransport(handler), coalesce_window=0
+        )
+        engine = AsyncCheckEngine(connections=connections)
+        monitor = Monitor(id=1, url="https://example.com/up", monitor_type="HTTP")
+
+        engine.run([monitor])
+        client, loop = connections.client(), connections.loop
+        engine.run([monitor])
+
+        assert connections.client() is client
+        assert connections.loop is loop
+        assert seen == ["/up", "/up"]
+        connections.close()
+
+    def test_concurrent_runs_share_the_loop(self) -> None:
+        in_flight: List[int] = [0]
+        peak: List[int] = [0]
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0.05)
+            in_flight[0] -= 1
+            return httpx.Response(200)
+
+        connections = RunnerConnections(transport=httpx.MockTransport(handler))
+        results: List[bool] = []
+
+        def check(monitor_id: int) -> None:
+            engine = AsyncCheckEngine(
+                connections=connections,
+                limiter=HostLimiter(min_spacing=0),
+            )
+            monitor = Monitor(
+                id=monitor_id,
+                url=f"https://example.com/{monitor_id}",
+                monitor_type="HTTP",
+            )
+            results.append(engine.run([monitor])[0].is_up)
+
+        threads = [threading.Thread(target=check, args=(i,)) for i in (1, 2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        connections.close()
+
+        assert results == [True, True]
+        assert peak[0] == 2
+
+    def test_concurrent_runs_in_gevent_greenlets(self) -> None:
+        # The runner's pool: tasks are greenlets of one monkey-patched thread
+        script = textwrap.dedent("""
+            import sys
+            # trio (where installed) cannot be imported under gevent
+            sys.modules.setdefault("trio", None)
+            from gevent import monkey
+            monkey.patch_all()
+            import django
+            django.setup()
+            import asyncio, time, fakeredis, gevent, httpx
+            from monitor.connections import RunnerConnections
+            from monitor.engine import AsyncCheckEngine
+            from monitor.models import Monitor
+            from monitor.politeness import HostLimiter
+
+            async def handler(request):
+                await asyncio.sleep(0.2)
+                return httpx.Response(200)
+
+            connections = RunnerConnections(transport=httpx.MockTransport(handler))
+            limiter = HostLimiter(fakeredis.FakeAsyncRedis(), min_spacing=0)
+
+            def check(i):
+                engine = AsyncCheckEngine(connections=connections, limiter=limiter)
+                url = f"https://93.184.216.34/{i}"
+                monitor = Monitor(id=i, url=url, monitor_type="HTTP")
+                return engine.run([monitor])[0].is_up
+
+            started = time.monotonic()
+            greenlets = [gevent.spawn(check, i) for i in range(3)]
+            gevent.joinall(greenlets, raise_error=True)
+            print([greenlet.value for greenlet in greenlets])
+            print(time.monotonic() - started < 0.5)
+            """)
+        app_dir = Path(__file__).resolve().parents[2]
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=app_dir,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+
+        assert output.returncode == 0, output.stderr
+        # Logs come first
+        assert output.stdout.splitlines()[-2:] == ["[True, True, True]", "True"]
+
+    def test_fresh_connection_monitors_skip_the_pool(self) -> None:
+        connections = RunnerConnections(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200))
+        )
+        engine = AsyncCheckEngine(connections=connections)
+
+        engine.run(
+            [
+                Monitor(id=1, url="https://example.com/", fresh_connection=True),
+                Monitor(id=2, url="https://example.com/"),
+            ]
+        )
+
+        assert set(connections.clients) == {True, False}
+        assert connections.client(fresh=True) is not connections.client()
+        connections.close()
+
+    def test_fresh_transport_keeps_no_connections(self) -> None:
+        connections = RunnerConnections()
+
+        pooled = connections._transport(fresh=False)
+        fresh = connections._transport(fresh=True)
+
+        assert isinstance(pooled, HostPools)
+        assert isinstance(fresh, httpx.AsyncHTTPTransport)
+        assert fresh._pool._max_keepalive_connections == 0
@@ -87,6 +87,39 @@ class TestMonitorCRUD:
         count = crud.count_by_user(user)
         assert count == 2
 
+    def test_record_check_returns_previous_status(self, monitor: Monitor) -> None:
+        crud = MonitorCRUD()
+        checked_at = timezone.now()
+
+        previous_status, updated = crud.record_check(  # type: ignore[misc]
+            monitor.id, Monitor.StatusType.UP, checked_at
+        )
+
+        assert previous_status == Monitor.StatusType.PAUSED
+        assert updated.id == monitor.id
+        assert updated.user_id == monitor.user_id
+        monitor.refresh_from_db()
+        assert monitor.status == Monitor.StatusType.UP
+        assert monitor.last_checked_at == checked_at
+
+    def test_record_check_sets_latest_result(self, monitor: Monitor) -> None:
+        crud = MonitorCRUD()
+        for is_up in (True, True, False, True):
+            status = Monitor.StatusType.UP if is_up else Monitor.StatusType.DOWN
+            crud.record_check(monitor.id, status, timezone.now(), 200, 150)
+        crud.record_check(monitor.id, Monitor.StatusType.DOWN, timezone.now(), 0, 0)
+
+        monitor.refresh_from_db()
+        assert monitor.last_status_code == 0
+        assert monitor.last_response_time_ms == 0
+        assert monitor.recent_checks == 0b11010
+        assert monitor.recent_checks_count == 5
+        assert monitor.recent_uptime_percentage == 60.0
+
+    def test_record_check_missing_monitor(self) -> None:
+        crud = MonitorCRUD()
+        assert crud.record_check(99999, Monitor.StatusType.UP, timezone.now()) is None
+
 
 @pytest.mark.django_db
 class TestMonitorResultCRUD:
@@ -0,0 +1,169 @@
+import pytest
+from typing import Any
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.contrib.auth import get_user_model
+from faker import Faker
+from monitor.dashboard import (
+    DashboardSummary,
+    FAILURES_KEY,
+    SUMMARY_KEY,
+    RECENT_FAILURES,
+)
+from monitor.dtos import CheckResult
+from monitor.models import Monitor, MonitorResult
+from monitor.services import MonitorService
+
+User = get_user_model()
+fake = Faker()
+
+NOW = datetime(2026, 3, 10, 12, 30, tzinfo=dt_timezone.utc)
+COUNTS = {"total": 3, "active": 2, "up": 1, "down": 1}
+
+
+def _monitor(status: str = Monitor.StatusType.UP) -> Monitor:
+    return Monitor(id=1, user_id=7, name="API", url="https://api.test", status=status)
+
+
+def _result(is_up: bool, latency: int, at: datetime = NOW) -> MonitorResult:
+    return MonitorResult(
+        id=fake.random_int(),
+        monitor_id=1,
+        status_code=200 if is_up else 500,
+        response_time_ms=latency,
+        is_up=is_up,
+        created_at=at,
+    )
+
+
+class TestDashboardSummary:
+    """Unit tests for the push-maintained Redis summary"""
+
+    def test_missing_summary_needs_build(self, fake_redis: Any) -> None:
+        summary = DashboardSummary()
+        summary.record([("UP", _monitor(), _result(False, 100))], now=NOW)
+
+        # Updates are not applied to a missing summary, nothing is left behind
+        assert not fake_redis.exists(SUMMARY_KEY.format(7), FAILURES_KEY.format(7))
+        assert summary.get(7, now=NOW) is None
+
+    def test_build_then_record(self) -> None:
+        summary = DashboardSummary()
+        built = summary.build(
+            7, COUNTS, [(NOW.replace(minute=0), 2, 300)], failures=[], now=NOW
+        )
+        assert built["avg_latency"] == 150.0
+        assert built["paused"] == 1
+
+        summary.record(
+            [
+                (Monitor.StatusType.UP, _monitor(), _result(False, 0)),
+                (Monitor.StatusType.DOWN, _monitor(), _result(False, 0)),
+            ],
+            now=NOW,
+        )
+        stats = summary.get(7, now=NOW)
+
+        assert stats is not None
+        assert stats["up"] == 0
+        assert stats["down"] == 2
+        assert stats["avg_latency"] == 75.0
+        assert [f["reason"] for f in stats["recent_failures"]] == ["500 Error"] * 2
+        assert summary.get(7, now=NOW) == stats
+
+    def test_recent_failures_capped_newest_first(self) -> None:
+        summary = DashboardSummary()
+        summary.build(7, COUNTS, [], failures=[], now=NOW)
+
+        results = [_result(False, 0, NOW + timedelta(seconds=i)) for i in range(8)]
+        summary.record(
+            ((Monitor.StatusType.DOWN, _monitor(), r) for r in results), now=NOW
+        )
+        stats = summary.get(7, now=NOW)
+
+        assert stats is not None
+        assert len(stats["recent_failures"]) == RECENT_FAILURES
+        assert stats["recent_failures"][0]["id"] == results[-1].id
+
+    def test_latency_older_than_24h_ignored(self) -> None:
+        summary = DashboardSummary()
+        summary.build(7, COUNTS, [], failures=[], now=NOW)
+
+        summary.record(
+            [
+                ("UP", _monitor(), _result(True, 1000, NOW - timedelta(hours=30))),
+                ("UP", _monitor(), _result(True, 100, NOW - timedelta(hours=3))),
+            ],
+            now=NOW,
+        )
+        stats = summary.get(7, now=NOW)
+
+        assert stats is not None
+        assert stats["avg_latency"] == 100.0
+
+    def test_hours_older_than_24h_dropped(self, fake_redis: Any) -> None:
+        summary = DashboardSummary()
+        old = NOW.replace(minute=0) - timedelta(hours=25)
+        summary.build(7, COUNTS, [(old, 1, 100)], failures=[], now=NOW)
+
+        summary.record([("UP", _monitor(), _result(True, 200))], now=NOW)
+
+        hour = int(NOW.replace(minute=0).timestamp())
+        fields = fake_redis.hkeys(SUMMARY_KEY.format(7))
+        assert sorted(f for f in fields if ":" in f) == [
+            f"count:{hour}",
+            f"sum:{hour}",
+        ]
+
+    def test_failures_expire_with_summary(self, fake_redis: Any) -> None:
+        summary = DashboardSummary(ttl=600)
+        summary.build(7, COUNTS, [], failures=[], now=NOW)
+
+        summary.record([("UP", _monitor(), _result(False, 0))], now=NOW)
+
+        assert 0 < fake_redis.ttl(FAILURES_KEY.format(7)) <= 600
+
+    def test_invalidate(self) -> None:
+        summary = DashboardSummary()
+        summary.build(7, COUNTS, [], failures=[], now=NOW)
+
+        summary.invalidate(7)
+
+        assert summary.get(7, now=NOW) is None
+
+
+@pytest.mark.django_db
+class TestDashboardIngestion:
+
+    def test_batch_ingestion_updates_summary(
+        self, django_assert_num_queries: Any
+    ) -> None:
+        user = User.objects.create_user(  # type: ignore[attr-defined]
+            email=fake.email(), password="testpass123"
+        )
+        monitors = [
+            Monitor.objects.create(
+                user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+            )
+            for _ in range(3)
+        ]
+        service = MonitorService()
+        assert service.get_dashboard_stats(user)["paused"] == 3
+
+        service.process_check_results(
+            [
+                CheckResult(monitors[0].id, True, 100, 200),
+                CheckResult(monitors[1].id, True, 300, 200),
+                CheckResult(monitors[1].id, False, 0, 0),
+            ]
+        )
+
+        with django_assert_num_queries(0):
+            stats = service.get_dashboard_stats(user)
+        assert stats["up"] == 1
+        assert stats["down"] == 1
+        assert stats["paused"] == 1
+        assert stats["avg_latency"] == pytest.approx(133.33)
+        assert stats["recent_failures"][0]["reason"] == "Timeout"
+        # Matches a rebuild from the database
+        service.dashboard.invalidate(user.id)
+        assert service.get_dashboard_stats(user) == stats
@@ -0,0 +1,119 @@
+import pytest
+import numpy as np
+from typing import Any
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from faker import Faker
+from monitor.downsampling import lttb
+from monitor.models import Monitor, MonitorResult
+from monitor.services import MonitorService
+
+User = get_user_model()
+fake = Faker()
+
+
+@pytest.fixture
+def user() -> Any:
+    return User.objects.create_user(  # type: ignore[attr-defined]
+        email=fake.email(), password="testpass123"
+    )
+
+
+@pytest.fixture
+def monitor(user: Any) -> Monitor:
+    return Monitor.objects.create(
+        user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+    )
+
+
+def _seed(monitor: Monitor, latencies: list, step: timedelta) -> None:
+    """One check per `step`, oldest first, ending a minute ago."""
+    end = timezone.now() - timedelta(minutes=1)
+    for i, latency in enumerate(latencies):
+        result = MonitorResult.objects.create(
+            monitor=monitor, status_code=200, response_time_ms=latency, is_up=True
+        )
+        # created_at is auto_now_add
+        MonitorResult.objects.filter(id=result.id).update(
+            created_at=end - step * (len(latencies) - 1 - i)
+        )
+
+
+class TestLttb:
+
+    def test_returns_every_index_below_threshold(self) -> None:
+        assert lttb([0, 1, 2], [5, 6, 7], 10).tolist() == [0, 1, 2]
+
+    def test_keeps_first_last_and_threshold_points(self) -> None:
+        x = np.arange(1000)
+        y = np.sin(x / 50.0)
+
+        selected = lttb(x, y, 100)
+
+        assert len(selected) == 100
+        assert selected[0] == 0
+        assert selected[-1] == 999
+        assert np.all(np.diff(selected) > 0)
+
+    def test_keeps_spikes(self) -> None:
+        y = np.full(1000, 100.0)
+        y[[137, 512, 871]] = 5000.0
+
+        selected = lttb(np.arange(1000), y, 50)
+
+        assert {137, 512, 871} <= set(selected.tolist())
+
+
+@pytest.mark.django_db
+class TestHistoryGraph:
+
+    def test_buckets_aggregate_min_avg_max(self, monitor: Monitor) -> None:
+        # 24 checks per hour for the last 24 hours
+        latencies = [100 + (i % 24) for i in range(24 * 24)]
+        _seed(monitor, latencies, timedelta(minutes=2, seconds=30))
+
+        graph = MonitorService().get_history_graph(monitor, "24h", points=24)
+
+        assert graph["method"] == "buckets"
+        assert len(graph["points"]) <= 24
+        assert sum(point["checks"] for point in graph["points"]) == len(latencies)
+        for point in graph["points"]:
+            assert (
+                point["min_response_time"]
+                <= point["avg_response_time"]
+                <= point["max_response_time"]
+            )
+        timestamps = [point["timestamp"] for point in graph["points"]]
+        assert timestamps == sorted(timestamps)
+
+    def test_buckets_skip_failed_checks_without_latency(self, monitor: Monitor) -> None:
+        _seed(monitor, [100, 200], timedelta(minutes=1))
+        MonitorResult.objects.create(monitor=monitor, is_up=False)
+
+        graph = MonitorService().get_history_graph(monitor, "24h", points=1)
+
+        assert len(graph["points"]) == 1
+        assert graph["points"][0]["checks"] == 2
+        assert graph["points"][0]["avg_response_time"] == 150.0
+
+    def test_lttb_limits_points_and_keeps_spike(self, monitor: Monitor) -> None:
+        latencies = [100] * 500
+        latencies[250] = 9000
+        _seed(monitor, latencies, timedelta(minutes=2))
+
+        graph = MonitorService().get_history_graph(
+            monitor, "24h", points=50, method="lttb"
+        )
+
+        assert len(graph["points"]) == 50
+        assert 9000 in [point["response_time_ms"] for point in graph["points"]]
+
+    def test_period_excludes_older_checks(self, monitor: Monitor) -> None:
+        _seed(monitor, [100] * 10, timedelta(days=1))
+
+        day = MonitorService().get_history_graph(monitor, "24h", method="lttb")
+        week = MonitorService().get_history_graph(monitor, "7d", method="lttb")
+
+        assert len(day["points"]) == 1
+        assert len(week["points"]) == 7
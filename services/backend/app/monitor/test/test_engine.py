@@ -0,0 +1,204 @@
+from typing import AsyncIterator
+import asyncio
+import ipaddress
+import httpx
+from monitor.dtos import CheckResult
+from monitor.models import Monitor
+from monitor.engine import AsyncCheckEngine
+from monitor.resolver import DNSCache, IPAddress
+
+
+def _monitor(monitor_id: int, url: str) -> Monitor:
+    return Monitor(id=monitor_id, url=url, monitor_type="HTTP")
+
+
+class TestAsyncCheckEngine:
+    """Unit tests for the asyncio batch check engine"""
+
+    def test_classifies_status_codes(self) -> None:
+        codes = {"/ok": 200, "/created": 201, "/redirect": 304, "/error": 500}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(codes[request.url.path])
+
+        monitors = [
+            _monitor(i, f"https://example.com{path}") for i, path in enumerate(codes)
+        ]
+        engine = AsyncCheckEngine(transport=httpx.MockTransport(handler))
+
+        results = engine.run(monitors)
+
+        assert [r.status_code for r in results] == [200, 201, 304, 500]
+        assert [r.is_up for r in results] == [True, True, False, False]
+        assert [r.monitor_id for r in results] == [0, 1, 2, 3]
+
+    def test_network_error_is_reported_as_down(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("Connection refused", request=request)
+
+        engine = AsyncCheckEngine(transport=httpx.MockTransport(handler))
+
+        results = engine.run([_monitor(1, "https://down.example.com")])
+
+        assert len(results) == 1
+        assert results[0].status_code == 0
+        assert results[0].is_up is False
+        assert results[0].response_time_ms >= 0
+
+    def test_sends_user_agent(self) -> None:
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers["User-Agent"])
+            return httpx.Response(200)
+
+        engine = AsyncCheckEngine(transport=httpx.MockTransport(handler))
+        engine.run([_monitor(1, "https://example.com")])
+
+        assert seen == ["StatusHawk Monitor/1.0"]
+
+    def test_empty_batch(self) -> None:
+        assert AsyncCheckEngine().run([]) == []
+
+
+class ChunkedBody(httpx.AsyncByteStream):
+    """A large response body that records how much of it was read."""
+
+    def __init__(self, chunks: int, size: int = 1024) -> None:
+        self.chunks = chunks
+        self.size = size
+        self.sent = 0
+        self.finished = False
+        self.closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for _ in range(self.chunks):
+            self.sent += 1
+            yield b"x" * self.size
+        self.finished = True
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class TestBoundedBodyReads:
+    """Unit tests for the streamed, capped response body reads"""
+
+    def _run(self, body: ChunkedBody, max_body_bytes: int) -> CheckResult:
+        engine = AsyncCheckEngine(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, stream=body)
+            ),
+            max_body_bytes=max_body_bytes,
+        )
+        return engine.run([_monitor(1, "https://example.com/large.iso")])[0]
+
+    def test_body_is_cut_off_at_the_cap(self) -> None:
+        body = ChunkedBody(chunks=10_000)
+
+        result = self._run(body, max_body_bytes=4096)
+
+        assert result.is_up is True
+        # Stops with the first chunk over the cap
+        assert body.sent == 5
+        assert body.finished is False
+        assert body.closed is True
+
+    def test_headers_only(self) -> None:
+        body = ChunkedBody(chunks=10_000)
+
+        result = self._run(body, max_body_bytes=0)
+
+        assert result.status_code == 200
+        assert body.sent == 0
+        assert body.closed is True
+        assert result.timings.transfer is None
+
+    def test_body_under_the_cap_is_drained(self) -> None:
+        body = ChunkedBody(chunks=3)
+
+        self._run(body, max_body_bytes=65536)
+
+        assert body.sent == 3
+        assert body.finished is True
+
+    def test_body_of_exactly_the_cap_is_drained(self) -> None:
+        body = ChunkedBody(chunks=4)
+
+        self._run(body, max_body_bytes=4096)
+
+        assert body.finished is True
+
+
+class LocalDNSCache(DNSCache):
+    """Sends every host to the loopback test server (normally forbidden)."""
+
+    async def resolve(self, host: str) -> IPAddress:
+        return ipaddress.ip_address("127.0.0.1")
+
+
+class TestTCPChecks:
+    """Unit tests for TCP port checks"""
+
+    def _check(self, url: str, banner: str = "", greeting: bytes = b"") -> CheckResult:
+        async def check() -> CheckResult:
+            async def greet(
+                reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+            ) -> None:
+                writer.write(greeting)
+                await writer.drain()
+                writer.close()
+
+            server = await asyncio.start_server(greet, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            engine = AsyncCheckEngine(dns_cache=LocalDNSCache(), timeout=2)
+            monitor = Monitor(
+                id=1,
+                url=url.format(port=port),
+                monitor_type="TCP",
+                expected_banner=banner,
+            )
+            async with server:
+                return await engine.check_tcp(monitor)
+
+        return asyncio.run(check())
+
+    def test_open_port_is_up(self) -> None:
+        result = self._check("tcp://db.example.com:{port}")
+
+        assert result.is_up is True
+        assert result.status_code is None
+        assert result.timings.connect is not None
+        assert result.timings.ttfb is None
+
+    def test_expected_banner(self) -> None:
+        result = self._check(
+            "tcp://mail.example.com:{port}", "ESMTP", b"220 mail ESMTP ready\r\n"
+        )
+
+        assert result.is_up is True
+        assert result.timings.ttfb is not None
+
+    def test_unexpected_banner_is_down(self) -> None:
+        result = self._check("tcp://mail.example.com:{port}", "ESMTP", b"SSH-2.0\r\n")
+
+        assert result.is_up is False
+
+    def test_closed_port_is_down(self) -> None:
+        # Port 1 on loopback is closed: the connect is refused
+        result = self._check("tcp://db.example.com:1")
+
+        assert result.is_up is False
+        assert result.status_code == 0
+
+    def test_forbidden_address_is_down(self) -> None:
+        engine = AsyncCheckEngine(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200)),
+            dns_cache=DNSCache(),
+        )
+        monitor = Monitor(id=1, url="tcp://10.0.0.5:5432", monitor_type="TCP")
+
+        result = engine.run([monitor])[0]
+
+        assert result.is_up is False
+        assert result.status_code == 0
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import pytest
+from typing import Any, List
+import fakeredis
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.utils import timezone
+from faker import Faker
+from rest_framework.authtoken.models import Token
+from common.authentication import STREAM_TICKET_KEY
+from monitor.events import EVENTS_CHANNEL, MonitorEventPublisher, stream_events
+from monitor.models import Monitor, MonitorResult
+from monitor.services import MonitorService
+
+User = get_user_model()
+fake = Faker()
+
+
+def _monitor() -> Monitor:
+    return Monitor(id=3, user_id=7, name="API", url="https://api.test")
+
+
+def _result(is_up: bool) -> MonitorResult:
+    return MonitorResult(
+        id=11,
+        monitor_id=3,
+        status_code=200 if is_up else 500,
+        response_time_ms=120,
+        is_up=is_up,
+        created_at=timezone.now(),
+    )
+
+
+def _drain(pubsub: Any) -> List[dict]:
+    events = []
+    while message := pubsub.get_message(timeout=0.01):
+        if message["type"] == "message":
+            events.append(json.loads(message["data"]))
+    return events
+
+
+class TestMonitorEventPublisher:
+
+    def test_publishes_transition_and_result(self, fake_redis: Any) -> None:
+        pubsub = fake_redis.pubsub()
+        pubsub.subscribe(EVENTS_CHANNEL.format(7))
+
+        MonitorEventPublisher().publish(
+            [
+                (Monitor.StatusType.UP, _monitor(), _result(False)),
+                (Monitor.StatusType.DOWN, _monitor(), _result(False)),
+            ]
+        )
+
+        events = _drain(pubsub)
+        assert [e["type"] for e in events] == ["status", "result", "result"]
+        assert events[0]["status"] == Monitor.StatusType.DOWN
+        assert events[0]["previous_status"] == Monitor.StatusType.UP
+        assert events[1]["status_code"] == 500
+        assert events[1]["monitor_id"] == 3
+
+
+class TestStreamEvents:
+
+    def test_relays_events_and_keepalives(self) -> None:
+        server = fakeredis.FakeServer()
+        client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        publisher = MonitorEventPublisher(
+            fakeredis.FakeRedis(server=server, decode_responses=True)
+        )
+
+        async def consume() -> List[str]:
+            stream = stream_events(7, client=client, keepalive=0.01)
+            chunks = [await anext(stream)]
+            publisher.publish([(Monitor.StatusType.UP, _monitor(), _result(True))])
+            chunks.append(await anext(stream))
+            chunks.append(await anext(stream))
+            await stream.aclose()
+            return chunks
+
+        retry, result, keepalive = asyncio.run(consume())
+
+        assert retry.startswith("retry:")
+        event, data = result.strip().split("\n")
+        assert event == "event: result"
+        assert json.loads(data.removeprefix("data: "))["is_up"] is True
+        assert keepalive == ": keepalive\n\n"
+
+
+@pytest.mark.django_db
+class TestMonitorEventsView:
+
+    def test_requires_authentication(self) -> None:
+        response = Client().get("/api/v1/monitors/events/")
+
+        assert response.status_code == 401
+
+    def test_rejects_unknown_ticket(self) -> None:
+        response = Client().get("/api/v1/monitors/events/?ticket=bogus")
+
+        assert response.status_code == 401
+
+    def test_api_token_is_not_accepted_in_the_url(self) -> None:
+        user = User.objects.create_user(  # type: ignore[attr-defined]
+            email=fake.email(), password="testpass123"
+        )
+        token = Token.objects.create(user=user)
+
+        response = Client().get(f"/api/v1/monitors/events/?token={token.key}")
+
+        assert response.status_code == 401
+
+    def test_opens_stream_with_single_use_ticket(self, fake_redis: Any) -> None:
+        user = User.objects.create_user(  # type: ignore[attr-defined]
+            email=fake.email(), password="testpass123"
+        )
+        token = Token.objects.create(user=user)
+
+        issued = Client().post(
+            "/api/v1/monitors/events/ticket/", HTTP_AUTHORIZATION=f"Token {token.key}"
+        )
+        ticket = issued.json()["ticket"]
+        assert issued.status_code == 201
+        assert 0 < fake_redis.ttl(STREAM_TICKET_KEY.format(ticket)) <= 30
+
+        url = f"/api/v1/monitors/events/?ticket={ticket}"
+        response = Client().get(url)
+        assert response.status_code == 200
+        assert response.streaming
+        response.close()
+
+        assert Client().get(url).status_code == 401
+
+    def test_opens_stream_with_token(self) -> None:
+        user = User.objects.create_user(  # type: ignore[attr-defined]
+            email=fake.email(), password="testpass123"
+        )
+        token = Token.objects.create(user=user)
+
+        response = Client().get(
+            "/api/v1/monitors/events/", HTTP_AUTHORIZATION=f"Token {token.key}"
+        )
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/event-stream"
+        assert response.streaming
+
+
+@pytest.mark.django_db
+class TestIngestionPublishesEvents:
+
+    def test_process_check_result_publishes(self, fake_redis: Any) -> None:
+        user = User.objects.create_user(  # type: ignore[attr-defined]
+            email=fake.email(), password="testpass123"
+        )
+        monitor = Monitor.objects.create(
+            user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+        )
+        pubsub = fake_redis.pubsub()
+        pubsub.subscribe(EVENTS_CHANNEL.format(user.id))
+
+        MonitorService().process_check_result(monitor.id, True, 90, 200)
+
+        events = _drain(pubsub)
+        assert [e["type"] for e in events] == ["status", "result"]
+        assert events[0]["previous_status"] == Monitor.StatusType.PAUSED
+        assert events[1]["response_time_ms"] == 90
@@ -0,0 +1,169 @@
+import pytest
+import numpy as np
+from typing import Any, List
+from unittest.mock import patch, Mock
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from faker import Faker
+from monitor.crud import MonitorResultCRUD, MonitorRollupCRUD
+from monitor.models import Monitor, MonitorResult
+from monitor.services import MonitorService
+from monitor.fleet import (
+    FleetAnomalyDetector,
+    FLEET_ALERT_KEY,
+    to_matrix,
+    robust_stats,
+    ewma,
+)
+
+User = get_user_model()
+fake = Faker()
+
+
+@pytest.fixture
+def user() -> Any:
+    return User.objects.create_user(  # type: ignore[attr-defined]
+        email=fake.email(), password="testpass123"
+    )
+
+
+def _create_monitor(user: Any) -> Monitor:
+    return Monitor.objects.create(
+        user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+    )
+
+
+def _add_results(monitor: Monitor, values: List[int], **kwargs: Any) -> None:
+    MonitorResult.objects.bulk_create(
+        MonitorResult(monitor=monitor, response_time_ms=value, is_up=True)
+        for value in values
+    )
+    if kwargs:
+        MonitorResult.objects.filter(monitor=monitor, **kwargs.pop("where", {})).update(
+            **kwargs
+        )
+
+
+class TestFleetMath:
+    """Vectorized building blocks"""
+
+    def test_to_matrix_right_aligns_and_pads(self) -> None:
+        rows = [(1, 10.0), (1, 20.0), (1, 30.0), (2, 5.0)]
+
+        ids, matrix = to_matrix(rows, max_samples=2)
+
+        assert ids.tolist() == [1, 2]
+        assert matrix[0].tolist() == [20.0, 30.0]
+        assert np.isnan(matrix[1, 0]) and matrix[1, 1] == 5.0
+
+    def test_to_matrix_empty(self) -> None:
+        ids, matrix = to_matrix([], max_samples=3)
+
+        assert len(ids) == 0
+        assert matrix.shape == (0, 3)
+
+    def test_robust_stats_ignores_outliers_and_padding(self) -> None:
+        matrix = np.array([[np.nan, 100, 101, 99, 100, 5000]], dtype=np.float64)
+
+        median, mad = robust_stats(matrix)
+
+        assert median[0] == 100
+        assert mad[0] == pytest.approx(1.4826)
+
+    def test_ewma_matches_recurrence(self) -> None:
+        matrix = np.array([[np.nan, 100, 200], [10, 10, 10]], dtype=np.float64)
+
+        level = ewma(matrix, alpha=0.5)
+
+        assert level.tolist() == [150.0, 10.0]
+
+
+@pytest.mark.django_db
+class TestFleetAnomalyDetector:
+    def test_flags_sustained_degradation_only(self, user: Any) -> None:
+        degraded = _create_monitor(user)
+        healthy = _create_monitor(user)
+        spiky = _create_monitor(user)
+        _add_results(degraded, [100, 102, 98, 101, 99] * 4 + [400] * 5)
+        _add_results(healthy, [100, 102, 98, 101, 99] * 5)
+        _add_results(spiky, [100, 102, 98, 101, 99] * 5 + [100] * 4 + [900, 100])
+
+        anomalies = FleetAnomalyDetector().detect()
+
+        assert [anomaly.monitor_id for anomaly in anomalies] == [degraded.id]
+        assert anomalies[0].median == pytest.approx(100, abs=2)
+        assert anomalies[0].current > 300
+
+    def test_ignores_monitors_with_few_samples(self, user: Any) -> None:
+        monitor = _create_monitor(user)
+        _add_results(monitor, [100] * 5 + [900] * 3)
+
+        assert FleetAnomalyDetector().detect() == []
+
+    def test_ignores_inactive_monitors(self, user: Any) -> None:
+        monitor = _create_monitor(user)
+        _add_results(monitor, [100] * 20 + [400] * 5)
+        Monitor.objects.filter(id=monitor.id).update(is_active=False)
+
+        assert FleetAnomalyDetector().detect() == []
+
+    def test_latency_window_is_capped_per_monitor(self, user: Any) -> None:
+        monitors = [_create_monitor(user) for _ in range(2)]
+        _add_results(monitors[0], list(range(1, 11)))
+        _add_results(monitors[1], [7])
+
+        rows = MonitorResultCRUD().get_latency_window(
+            timezone.now() - timedelta(hours=1), max_samples=3
+        )
+
+        assert rows == [
+            (monitors[0].id, 8),
+            (monitors[0].id, 9),
+            (monitors[0].id, 10),
+            (monitors[1].id, 7),
+        ]
+
+    def test_usual_peak_hour_is_not_flagged(self, user: Any) -> None:
+        now = timezone.now()
+        monitor = _create_monitor(user)
+        # Same hour yesterday the monitor was just as slow
+        _add_results(monitor, [420] * 10, created_at=now - timedelta(days=1))
+        MonitorRollupCRUD().record(MonitorResult.objects.filter(monitor=monitor))
+        _add_results(
+            monitor,
+            [100, 102, 98, 101, 99] * 4 + [400] * 5,
+            where={"created_at__gt": now - timedelta(hours=1)},
+        )
+
+        detector = FleetAnomalyDetector()
+
+        assert detector.seasonal_baseline(np.array([monitor.id]), now)[0] == 420
+        assert detector.detect(now) == []
+
+
+@pytest.mark.django_db
+class TestDetectFleetAnomalies:
+    @patch("monitor.services.MonitorService._dispatch_anomaly_alert")
+    def test_alerts_once_per_cooldown(
+        self, mock_alert: Mock, user: Any, fake_redis: Any
+    ) -> None:
+        monitor = _create_monitor(user)
+        _add_results(monitor, [100, 102, 98, 101, 99] * 4 + [400] * 5)
+        service = MonitorService()
+
+        assert service.detect_fleet_anomalies() == 1
+        assert service.detect_fleet_anomalies() == 0
+
+        mock_alert.assert_called_once()
+        alerted_monitor, current, median = mock_alert.call_args[0]
+        assert alerted_monitor.id == monitor.id
+        assert current > 300 and median < 110
+        assert fake_redis.ttl(FLEET_ALERT_KEY.format(monitor.id)) > 0
+
+    @patch("monitor.services.MonitorService._dispatch_anomaly_alert")
+    def test_no_anomalies(self, mock_alert: Mock, user: Any) -> None:
+        _add_results(_create_monitor(user), [100] * 20)
+
+        assert MonitorService().detect_fleet_anomalies() == 0
+        mock_alert.assert_not_called()
@@ -0,0 +1,186 @@
+import asyncio
+import ipaddress
+import socket
+import struct
+from typing import Dict, List, Sequence
+from unittest.mock import patch
+import pytest
+from django.contrib.auth import get_user_model
+from faker import Faker
+from monitor.dtos import CheckResult, PingStats
+from monitor.engine import AsyncCheckEngine
+from monitor.icmp import (
+    ICMPSocket,
+    PingProber,
+    checksum,
+    echo_request,
+    parse_echo_reply,
+)
+from monitor.models import Monitor, MonitorResult
+from monitor.resolver import IPAddress
+from monitor.services import MonitorService
+
+User = get_user_model()
+fake = Faker()
+
+
+def _icmp_available() -> bool:
+    try:
+        ICMPSocket(socket.AF_INET).close()
+    except OSError:
+        return False
+    return True
+
+
+class FakeProber(PingProber):
+    """Answers with fixed stats and records the addresses it was given."""
+
+    def __init__(self, stats: Dict[IPAddress, PingStats]) -> None:
+        super().__init__()
+        self.stats = stats
+        self.probed: Sequence[IPAddress] = []
+
+    async def probe(self, addresses: Sequence[IPAddress]) -> Dict[IPAddress, PingStats]:
+        self.probed = addresses
+        return {address: self.stats[address] for address in addresses}
+
+
+class TestEchoPackets:
+    """Unit tests for building and parsing ICMP echo packets"""
+
+    def test_checksum(self) -> None:
+        packet = echo_request(socket.AF_INET, 0x1234, 7)
+
+        # A packet with a correct checksum sums to zero
+        assert checksum(packet) == 0
+        assert struct.unpack("!BBHHH", packet[:8])[3:] == (0x1234, 7)
+
+    def test_parse_reply_with_ip_header(self) -> None:
+        reply = bytearray(echo_request(socket.AF_INET, 0x1234, 7))
+        reply[0] = 0  # echo reply
+        ip_header = bytes([0x45]) + bytes(19)
+
+        assert parse_echo_reply(socket.AF_INET, ip_header + bytes(reply)) == (
+            0x1234,
+            7,
+        )
+        assert parse_echo_reply(socket.AF_INET, bytes(reply)) == (0x1234, 7)
+
+    def test_requests_are_not_replies(self) -> None:
+        request = echo_request(socket.AF_INET, 0x1234, 7)
+
+        assert parse_echo_reply(socket.AF_INET, request) is None
+        assert parse_echo_reply(socket.AF_INET, b"\0\0") is None
+
+
+@pytest.mark.skipif(not _icmp_available(), reason="ICMP sockets are not permitted")
+class TestPingProber:
+    """Probes against loopback and an address that never answers"""
+
+    def test_loopback_answers(self) -> None:
+        loopback = ipaddress.ip_address("127.0.0.1")
+        prober = PingProber(count=3, interval=0.01, timeout=1)
+
+        stats = asyncio.run(prober.probe([loopback]))
+
+        assert stats[loopback].sent == 3
+        assert stats[loopback].received == 3
+        assert stats[loopback].loss == 0
+        assert stats[loopback].avg_rtt_ms is not None
+
+    def test_concurrent_probes_use_distinct_sequences(self) -> None:
+        loopback = ipaddress.ip_address("127.0.0.1")
+        sent: List[int] = []
+
+        def recording_request(family: int, identifier: int, sequence: int) -> bytes:
+            sent.append(sequence)
+            return echo_request(family, identifier, sequence)
+
+        async def probe_both() -> List[Dict[IPAddress, PingStats]]:
+            prober = PingProber(count=3, interval=0.01, timeout=1)
+            return list(
+                await asyncio.gather(prober.probe([loopback]), prober.probe([loopback]))
+            )
+
+        with patch("monitor.icmp.echo_request", recording_request):
+            results = asyncio.run(probe_both())
+
+        assert len(set(sent)) == len(sent) == 6
+        assert [stats[loopback].received for stats in results] == [3, 3]
+
+    def test_silent_address_is_lost(self) -> None:
+        # Reserved (240.0.0.0/4): nothing answers, or the send already fails
+        silent = ipaddress.ip_address("240.0.0.1")
+        loopback = ipaddress.ip_address("127.0.0.1")
+        prober = PingProber(count=2, interval=0.01, timeout=0.3)
+
+        stats = asyncio.run(prober.probe([silent, loopback]))
+
+        assert stats[silent].received == 0
+        assert stats[silent].loss == 100
+        assert stats[loopback].received == 2
+
+
+class TestPingChecks:
+    """Unit tests for PING monitors in the check engine"""
+
+    def test_results_per_monitor(self) -> None:
+        # fake_dns resolves every hostname to the same public address
+        address = ipaddress.ip_address("93.184.216.34")
+        prober = FakeProber({address: PingStats(3, 2, [10.0, 14.0])})
+        engine = AsyncCheckEngine(prober=prober)
+        monitors = [
+            Monitor(id=1, url="https://example.com", monitor_type="PING"),
+            Monitor(id=2, url="https://www.example.com", monitor_type="PING"),
+        ]
+
+        results = asyncio.run(engine.check_pings(monitors))
+
+        # Both monitors share the probes of their one address
+        assert list(prober.probed) == [address]
+        assert [r.monitor_id for r in results] == [1, 2]
+        assert results[0] == CheckResult(
+            1, True, 12, None, results[0].timings, packet_loss=33
+        )
+
+    def test_all_lost_is_down(self) -> None:
+        address = ipaddress.ip_address("93.184.216.34")
+        engine = AsyncCheckEngine(prober=FakeProber({address: PingStats(3, 0)}))
+
+        results = asyncio.run(
+            engine.check_pings([Monitor(id=1, url="https://example.com")])
+        )
+
+        assert results[0].is_up is False
+        assert results[0].status_code == 0
+        assert results[0].packet_loss == 100
+
+    def test_forbidden_host_is_not_pinged(self) -> None:
+        prober = FakeProber({})
+        engine = AsyncCheckEngine(prober=prober)
+
+        results = asyncio.run(
+            engine.check_pings([Monitor(id=1, url="https://10.0.0.1")])
+        )
+
+        assert list(prober.probed) == []
+        assert results[0].is_up is False
+        assert results[0].packet_loss is None
+
+    @pytest.mark.django_db
+    def test_packet_loss_is_stored(self) -> None:
+        user = User.objects.create_user(email=fake.email(), password="testpass123")
+        monitor = Monitor.objects.create(
+            user=user,
+            name=fake.company(),
+            url="https://example.com",
+            monitor_type="PING",
+        )
+
+        MonitorService().process_check_results(
+            [CheckResult(monitor.id, True, 12, None, packet_loss=33)]
+        )
+
+        result = MonitorResult.objects.get(monitor=monitor)
+        assert result.packet_loss == 33
+        assert result.status_code is None
@@ -0,0 +1,184 @@
+import pytest
+from typing import Any, List
+from datetime import timedelta
+from unittest.mock import patch, Mock
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from faker import Faker
+from monitor.models import Monitor, MonitorResult
+from monitor.dtos import CheckResult
+from monitor.ingestion import ResultBuffer
+from monitor.rollups import MINUTE, floor_to
+from monitor.services import MonitorService
+
+User = get_user_model()
+fake = Faker()
+
+
+@pytest.fixture
+def user() -> Any:
+    return User.objects.create_user(email=fake.email(), password="testpass123")
+
+
+def _create_monitors(user: Any, count: int) -> List[Monitor]:
+    return [
+        Monitor.objects.create(
+            user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+        )
+        for _ in range(count)
+    ]
+
+
+class TestResultBuffer:
+    """Unit tests for the in-worker result buffer"""
+
+    @patch("monitor.ingestion.MonitorService.process_check_results")
+    def test_flushes_when_full(self, mock_process: Mock) -> None:
+        buffer = ResultBuffer(max_size=3, max_age=60)
+
+        buffer.add([CheckResult(1, True, 100, 200), CheckResult(2, True, 100, 200)])
+        mock_process.assert_not_called()
+        assert len(buffer) == 2
+
+        buffer.add([CheckResult(3, False, 0, 0)])
+        mock_process.assert_called_once()
+        assert [r.monitor_id for r in mock_process.call_args[0][0]] == [1, 2, 3]
+        assert len(buffer) == 0
+
+    @patch("monitor.ingestion.time.monotonic")
+    @patch("monitor.ingestion.MonitorService.process_check_results")
+    def test_flushes_when_stale(self, mock_process: Mock, mock_clock: Mock) -> None:
+        buffer = ResultBuffer(max_size=100, max_age=2)
+
+        mock_clock.return_value = 10.0
+        buffer.add([CheckResult(1, True, 100, 200)])
+        assert buffer.flush_if_due() == 0
+
+        mock_clock.return_value = 12.5
+        assert buffer.flush_if_due() == 1
+        mock_process.assert_called_once()
+
+    @patch("monitor.ingestion.MonitorService.process_check_results")
+    def test_flush_writes_in_chunks(self, mock_process: Mock) -> None:
+        buffer = ResultBuffer(max_size=2, max_age=60)
+        buffer._results = [CheckResult(i, True, 100, 200) for i in range(5)]
+
+        assert buffer.flush() == 5
+        assert [len(c[0][0]) for c in mock_process.call_args_list] == [2, 2, 1]
+
+    @patch("monitor.ingestion.MonitorService.process_check_results")
+    def test_failed_writes_are_retried(self, mock_process: Mock) -> None:
+        mock_process.side_effect = [RuntimeError("db down"), None, None]
+        buffer = ResultBuffer(max_size=10, max_age=60, max_retries=3)
+        buffer.add([CheckResult(1, True, 100, 200)])
+
+        with patch("monitor.ingestion.logger") as mock_logger:
+            buffer.flush()
+
+        mock_logger.warning.assert_called_once()
+        assert len(buffer) == 1
+
+        # Kept in front of the results that arrived meanwhile
+        buffer.add([CheckResult(2, True, 100, 200)])
+        assert buffer.flush() == 2
+        assert [r.monitor_id for r in mock_process.call_args[0][0]] == [1, 2]
+        assert len(buffer) == 0
+
+    @patch("monitor.ingestion.MonitorService.process_check_results")
+    def test_results_are_written_one_by_one_after_retries(
+        self, mock_process: Mock
+    ) -> None:
+        def process(results: List[CheckResult]) -> None:
+            if len(results) > 1 or results[0].monitor_id == 2:
+                raise RuntimeError("bad row")
+
+        mock_process.side_effect = process
+        buffer = ResultBuffer(max_size=10, max_age=60, max_retries=1)
+        buffer.add([CheckResult(i, True, 100, 200) for i in (1, 2, 3)])
+
+        with patch("monitor.ingestion.logger") as mock_logger:
+            buffer.flush()
+            buffer.flush()
+
+        written = [c[0][0] for c in mock_process.call_args_list[2:]]
+        assert [[r.monitor_id for r in chunk] for chunk in written] == [[1], [2], [3]]
+        # The failed batch, then the one result that failed on its own
+        assert mock_logger.error.call_count == 2
+        assert len(buffer) == 0
+
+
+@pytest.mark.django_db
+class TestBulkResultProcessing:
+    """MonitorService.process_check_results writes a whole batch at once"""
+
+    def test_writes_results_and_statuses(self, user: Any) -> None:
+        up, down = _create_monitors(user, 2)
+
+        MonitorService().process_check_results(
+            [CheckResult(up.id, True, 120, 200), CheckResult(down.id, False, 0, 0)]
+        )
+
+        up.refresh_from_db()
+        down.refresh_from_db()
+        assert up.status == Monitor.StatusType.UP
+        assert down.status == Monitor.StatusType.DOWN
+        assert MonitorResult.objects.filter(monitor=up, response_time_ms=120).exists()
+        assert MonitorResult.objects.filter(monitor=down, status_code=0).exists()
+
+    def test_check_time_is_kept(self, user: Any) -> None:
+        (monitor,) = _create_monitors(user, 1)
+        checked_at = timezone.now() - timedelta(seconds=30)
+
+        MonitorService().process_check_results(
+            [CheckResult(monitor.id, True, 100, 200, checked_at=checked_at)]
+        )
+
+        monitor.refresh_from_db()
+        result = MonitorResult.objects.get(monitor=monitor)
+        assert monitor.last_checked_at == checked_at
+        assert result.checked_at == result.created_at == checked_at
+        assert monitor.rollups.get(granularity=MINUTE).bucket_start == floor_to(
+            checked_at, MINUTE
+        )
+
+    def test_query_count_does_not_grow_with_batch(self, user: Any) -> None:
+        service = MonitorService()
+        counts = []
+        for size in (2, 20):
+            monitors = _create_monitors(user, size)
+            Monitor.objects.filter(id__in=[m.id for m in monitors]).update(
+                status=Monitor.StatusType.DOWN
+            )
+            results = [CheckResult(m.id, False, 0, 0) for m in monitors]
+
+            with CaptureQueriesContext(connection) as ctx:
+                service.process_check_results(results)
+            counts.append(len(ctx.captured_queries))
+
+        assert counts[0] == counts[1]
+
+    def test_transitions_dispatch_alerts_after_commit(self, user: Any) -> None:
+        (monitor,) = _create_monitors(user, 1)
+        service = MonitorService()
+
+        with patch.object(service, "dispatch_alerts") as mock_alerts:
+            service.process_check_results(
+                [
+                    CheckResult(monitor.id, False, 0, 0),
+                    CheckResult(monitor.id, False, 0, 0),
+                ]
+            )
+
+        mock_alerts.assert_called_once()
+        assert mock_alerts.call_args[0][1] == Monitor.StatusType.DOWN
+
+    def test_unknown_monitors_are_skipped(self, user: Any) -> None:
+        (monitor,) = _create_monitors(user, 1)
+
+        MonitorService().process_check_results(
+            [CheckResult(99999, True, 100, 200), CheckResult(monitor.id, True, 90, 200)]
+        )
+
+        assert MonitorResult.objects.count() == 1
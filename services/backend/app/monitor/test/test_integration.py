@@ -7,6 +7,7 @@ from rest_framework.test import APIClient
 from rest_framework import status
 from faker import Faker
 from monitor.models import Monitor, MonitorResult
+from monitor.crud import MonitorRollupCRUD
 
 User = get_user_model()
 fake = Faker()
@@ -222,6 +223,8 @@ class TestMonitorIntegration:
         )
         result2.created_at = now - timedelta(days=5)
         result2.save()
+        # Stats read rollups, which only the ingestion path keeps up to date
+        MonitorRollupCRUD().rebuild(now - timedelta(days=30), timezone.now())
 
         # Test 24h period
         response = authenticated_client.get(
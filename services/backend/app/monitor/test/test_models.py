@@ -119,6 +119,19 @@ class TestMonitor:
         assert monitor.updated_at is not None
         assert monitor.created_at <= monitor.updated_at
 
+    def test_monitor_record_result_rolls_uptime_window(self) -> None:
+        monitor = Monitor()
+        assert monitor.recent_uptime_percentage is None
+
+        for i in range(Monitor.RECENT_CHECKS + 10):
+            monitor.record_result(i % 4 != 0, 200, 100)
+
+        assert monitor.recent_checks_count == Monitor.RECENT_CHECKS
+        assert monitor.recent_checks < 1 << Monitor.RECENT_CHECKS
+        assert monitor.recent_uptime_percentage == 75.0
+        assert monitor.last_status_code == 200
+        assert monitor.last_response_time_ms == 100
+
 
 @pytest.mark.django_db
 class TestMonitorResult:
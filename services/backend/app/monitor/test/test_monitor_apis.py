@@ -1,4 +1,5 @@
 import pytest
+from base64 import urlsafe_b64encode
 from typing import Any
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -7,6 +8,7 @@ from rest_framework.test import APIClient
 from rest_framework import status
 from faker import Faker
 from monitor.models import Monitor, MonitorResult
+from monitor.services import MonitorService
 
 User = get_user_model()
 fake = Faker()
@@ -181,6 +183,35 @@ class TestMonitorAPI:
         response = authenticated_client.post("/api/v1/monitors/", data)
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    def test_tcp_monitor(self, authenticated_client: APIClient) -> None:
+        data = {
+            "name": "Database",
+            "url": "tcp://db.example.com:5432",
+            "monitor_type": "TCP",
+            "interval": 60,
+            "expected_banner": "",
+        }
+        response = authenticated_client.post("/api/v1/monitors/", data)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["url"] == "tcp://db.example.com:5432"
+
+    @pytest.mark.parametrize(
+        "url,monitor_type",
+        [
+            ("tcp://db.example.com", "TCP"),
+            ("https://db.example.com:5432", "TCP"),
+            ("tcp://db.example.com:5432", "HTTP"),
+            ("tcp://10.0.0.5:5432", "TCP"),
+        ],
+    )
+    def test_tcp_url_must_match_type(
+        self, authenticated_client: APIClient, url: str, monitor_type: str
+    ) -> None:
+        data = {"name": "Database", "url": url, "monitor_type": monitor_type}
+        response = authenticated_client.post("/api/v1/monitors/", data)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "url" in response.data
+
     def test_update_monitor(self, authenticated_client: APIClient, user: Any) -> None:
         monitor = Monitor.objects.create(
             user=user, name="Old Name", url="https://old.com", monitor_type="HTTP"
@@ -286,6 +317,37 @@ class TestMonitorStatsAPI:
         assert response.data["total_checks"] == 0
         assert response.data["uptime_percentage"] == 0.0
         assert response.data["last_check"] is None
+        assert response.data["avg_timings"]["dns"] is None
+
+    def test_stats_phase_timings(
+        self, authenticated_client: APIClient, user: Any
+    ) -> None:
+        monitor = Monitor.objects.create(
+            user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+        )
+        MonitorResult.objects.create(
+            monitor=monitor,
+            status_code=200,
+            response_time_ms=95,
+            is_up=True,
+            dns_ms=1,
+            connect_ms=15,
+            tls_ms=30,
+            ttfb_ms=45,
+            transfer_ms=4,
+        )
+
+        response = authenticated_client.get(f"/api/v1/monitors/{monitor.id}/stats/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["avg_timings"] == {
+            "dns": 1.0,
+            "connect": 15.0,
+            "tls": 30.0,
+            "ttfb": 45.0,
+            "transfer": 4.0,
+        }
+        assert response.data["last_check"]["tls_ms"] == 30
 
     def test_stats_unauthorized(self, api_client: APIClient, user: Any) -> None:
         monitor = Monitor.objects.create(
@@ -295,6 +357,107 @@ class TestMonitorStatsAPI:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+@pytest.mark.django_db
+class TestMonitorLatestResultAPI:
+
+    def test_list_includes_latest_result(
+        self,
+        authenticated_client: APIClient,
+        user: Any,
+        django_assert_num_queries: Any,
+    ) -> None:
+        monitor = Monitor.objects.create(
+            user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+        )
+        service = MonitorService()
+        service.process_check_result(monitor.id, True, 120, 200)
+        service.process_check_result(monitor.id, True, 80, 200)
+
+        # Page count and rows only: no per-monitor result lookups
+        with django_assert_num_queries(2):
+            response = authenticated_client.get("/api/v1/monitors/")
+
+        row = response.data["results"][0]
+        assert row["last_status_code"] == 200
+        assert row["last_response_time_ms"] == 80
+        assert row["recent_uptime_percentage"] == 100.0
+        assert row["last_checked_at"] is not None
+
+    def test_bulk_stats_returns_page_of_monitors(
+        self, authenticated_client: APIClient, user: Any
+    ) -> None:
+        monitors = [
+            Monitor.objects.create(
+                user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+            )
+            for _ in range(3)
+        ]
+        for is_up, latency in ((True, 100), (True, 200), (False, 300)):
+            MonitorResult.objects.create(
+                monitor=monitors[0],
+                status_code=200 if is_up else 500,
+                response_time_ms=latency,
+                is_up=is_up,
+            )
+        last = MonitorResult.objects.create(
+            monitor=monitors[1], status_code=200, response_time_ms=50, is_up=True
+        )
+
+        response = authenticated_client.get("/api/v1/monitors/bulk_stats/?size=2")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 3
+        by_monitor = {row["monitor_id"]: row for row in response.data["results"]}
+        # Same order as the monitor list: newest first
+        assert list(by_monitor) == [monitors[2].id, monitors[1].id]
+        assert by_monitor[monitors[1].id]["last_check"]["id"] == last.id
+        assert by_monitor[monitors[1].id]["uptime_percentage"] == 100.0
+        assert by_monitor[monitors[2].id]["total_checks"] == 0
+        assert by_monitor[monitors[2].id]["last_check"] is None
+
+        response = authenticated_client.get(
+            "/api/v1/monitors/bulk_stats/?size=2&page=2"
+        )
+        stats = response.data["results"][0]
+        assert stats["monitor_id"] == monitors[0].id
+        assert stats["total_checks"] == 3
+        assert stats["uptime_percentage"] == 66.67
+        assert stats["avg_response_time"] == 200.0
+
+    def test_bulk_stats_constant_query_count(
+        self,
+        authenticated_client: APIClient,
+        user: Any,
+        django_assert_num_queries: Any,
+    ) -> None:
+        for _ in range(20):
+            monitor = Monitor.objects.create(
+                user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+            )
+            MonitorResult.objects.create(
+                monitor=monitor, status_code=200, response_time_ms=100, is_up=True
+            )
+
+        # Page count and rows, then the rollups and the last checks
+        with django_assert_num_queries(4):
+            response = authenticated_client.get("/api/v1/monitors/bulk_stats/?size=20")
+
+        assert len(response.data["results"]) == 20
+        assert all(row["last_check"] for row in response.data["results"])
+
+    def test_bulk_stats_only_user_monitors(
+        self, authenticated_client: APIClient, user: Any, other_user: Any
+    ) -> None:
+        Monitor.objects.create(
+            user=other_user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+        )
+
+        response = authenticated_client.get("/api/v1/monitors/bulk_stats/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"] == []
+
+
 @pytest.mark.django_db
 class TestMonitorHistoryAPI:
 
@@ -315,6 +478,7 @@ class TestMonitorHistoryAPI:
         response = authenticated_client.get(f"/api/v1/monitors/{monitor.id}/history/")
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["results"]) == 5
+        assert response.data["results"][0]["ttfb_ms"] is None
 
     def test_history_24h_filter(
         self, authenticated_client: APIClient, user: Any
@@ -392,6 +556,137 @@ class TestMonitorHistoryAPI:
         assert response.data["results"][0]["id"] == result2.id
         assert response.data["results"][1]["id"] == result1.id
 
+    def test_history_cursor_pagination_walks_all_pages(
+        self, authenticated_client: APIClient, user: Any
+    ) -> None:
+        monitor = Monitor.objects.create(
+            user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+        )
+        now = timezone.now()
+        MonitorResult.objects.bulk_create(
+            MonitorResult(monitor=monitor, response_time_ms=100, is_up=True)
+            for _ in range(25)
+        )
+        # Rows with identical timestamps are ordered by id
+        tied = MonitorResult.objects.filter(monitor=monitor).order_by("id")[:12]
+        MonitorResult.objects.filter(
+            id__in=list(tied.values_list("id", flat=True))
+        ).update(created_at=now)
+        expected = list(
+            MonitorResult.objects.filter(monitor=monitor)
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        )
+
+        seen = []
+        url = f"/api/v1/monitors/{monitor.id}/history/?pagination=cursor&size=10"
+        while url:
+            response = authenticated_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert "count" not in response.data
+            seen += [row["id"] for row in response.data["results"]]
+            url = response.data["next"]
+
+        assert seen == expected
+
+    def test_history_cursor_pagination_skips_count(
+        self,
+        authenticated_client: APIClient,
+        user: Any,
+        django_assert_num_queries: Any,
+    ) -> None:
+        monitor = Monitor.objects.create(
+            user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+        )
+        MonitorResult.objects.bulk_create(
+            MonitorResult(monitor=monitor, response_time_ms=100, is_up=True)
+            for _ in range(15)
+        )
+        url = f"/api/v1/monitors/{monitor.id}/history/?pagination=cursor&size=10"
+        next_url = authenticated_client.get(url).data["next"]
+
+        # The monitor lookup and one keyset range query
+        with django_assert_num_queries(2) as captured:
+            response = authenticated_client.get(next_url)
+
+        assert len(response.data["results"]) == 5
+        assert response.data["next"] is None
+        assert not any("COUNT" in query["sql"] for query in captured.captured_queries)
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "bogus",
+            # Forged keys: a non-integer tiebreak, a naive datetime, not a pair
+            urlsafe_b64encode(b'["2024-01-01T00:00:00+00:00", "x"]').decode(),
+            urlsafe_b64encode(b'["2024-01-01T00:00:00+00:00", null]').decode(),
+            urlsafe_b64encode(b'["2024-01-01T00:00:00", 1]').decode(),
+            urlsafe_b64encode(b'{"a": 1}').decode(),
+        ],
+    )
+    def test_history_cursor_pagination_invalid_cursor(
+        self, authenticated_client: APIClient, user: Any, cursor: str
+    ) -> None:
+        monitor = Monitor.objects.create(
+            user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+        )
+
+        response = authenticated_client.get(
+            f"/api/v1/monitors/{monitor.id}/history/?pagination=cursor&cursor={cursor}"
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestMonitorGraphAPI:
+
+    def test_graph_returns_downsampled_points(
+        self, authenticated_client: APIClient, user: Any
+    ) -> None:
+        monitor = Monitor.objects.create(
+            user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+        )
+        MonitorResult.objects.bulk_create(
+            MonitorResult(
+                monitor=monitor, status_code=200, response_time_ms=100 + i, is_up=True
+            )
+            for i in range(120)
+        )
+
+        response = authenticated_client.get(
+            f"/api/v1/monitors/{monitor.id}/graph/?points=20&method=lttb"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["period"] == "24h"
+        assert response.data["method"] == "lttb"
+        assert len(response.data["points"]) == 20
+
+    def test_graph_invalid_method(
+        self, authenticated_client: APIClient, user: Any
+    ) -> None:
+        monitor = Monitor.objects.create(
+            user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+        )
+
+        response = authenticated_client.get(
+            f"/api/v1/monitors/{monitor.id}/graph/?method=median"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_graph_other_users_monitor_not_found(
+        self, authenticated_client: APIClient, other_user: Any
+    ) -> None:
+        monitor = Monitor.objects.create(
+            user=other_user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+        )
+
+        response = authenticated_client.get(f"/api/v1/monitors/{monitor.id}/graph/")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
 
 @pytest.mark.django_db
 class TestDashboardStatsAPI:
@@ -0,0 +1,141 @@
+import pytest
+from typing import Optional
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+from faker import Faker
+from monitor.models import Monitor, MonitorResult
+from monitor.partitions import ResultPartitionManager
+
+User = get_user_model()
+fake = Faker()
+
+
+@pytest.fixture
+def monitor() -> Monitor:
+    user = User.objects.create_user(  # type: ignore[attr-defined]
+        email=fake.email(), password="testpass123"
+    )
+    return Monitor.objects.create(
+        user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+    )
+
+
+@pytest.fixture
+def manager() -> ResultPartitionManager:
+    return ResultPartitionManager()
+
+
+def _partition_of(result_id: int) -> Optional[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT tableoid::regclass::text FROM monitor_monitorresult WHERE id = %s",
+            [result_id],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+@pytest.mark.django_db
+class TestResultPartitionManager:
+    def test_results_land_in_daily_partition(
+        self, manager: ResultPartitionManager, monitor: Monitor
+    ) -> None:
+        result = MonitorResult.objects.create(monitor=monitor, is_up=True)
+
+        assert manager.is_partitioned()
+        assert _partition_of(result.id) == manager.partitions()[timezone.now().date()]
+
+    def test_ensure_creates_missing_days_only(
+        self, manager: ResultPartitionManager
+    ) -> None:
+        today = timezone.now().date() + timedelta(days=30)
+
+        created = manager.ensure(days_ahead=2, today=today)
+
+        assert len(created) == 3
+        assert set(manager.partitions()) >= {
+            today + timedelta(days=offset) for offset in range(3)
+        }
+        assert manager.ensure(days_ahead=2, today=today) == []
+
+    def test_ensure_moves_rows_out_of_default(
+        self, manager: ResultPartitionManager, monitor: Monitor
+    ) -> None:
+        future = timezone.now() + timedelta(days=40)
+        result = MonitorResult.objects.create(monitor=monitor, is_up=True)
+        MonitorResult.objects.filter(id=result.id).update(created_at=future)
+        assert _partition_of(result.id) == "monitor_monitorresult_default"
+
+        manager.ensure(days_ahead=0, today=future.date())
+
+        assert _partition_of(result.id) == f"monitor_monitorresult_p{future:%Y%m%d}"
+
+    def test_drop_expired(
+        self, manager: ResultPartitionManager, monitor: Monitor
+    ) -> None:
+        today = timezone.now().date()
+        old_day = today - timedelta(days=45)
+        manager.ensure(days_ahead=0, today=old_day)
+        result = MonitorResult.objects.create(monitor=monitor, is_up=True)
+        MonitorResult.objects.filter(id=result.id).update(
+            created_at=timezone.now() - timedelta(days=45)
+        )
+        # Fire the deferred FK checks of this test transaction
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+        dropped = manager.drop_expired(retain_days=30)
+
+        assert f"monitor_monitorresult_p{old_day:%Y%m%d}" in dropped
+        assert today in manager.partitions()
+        assert not MonitorResult.objects.filter(id=result.id).exists()
+
+    def test_drop_expired_does_not_wait_for_busy_parent(
+        self,
+        manager: ResultPartitionManager,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        old_day = timezone.now().date() - timedelta(days=45)
+        manager.ensure(days_ahead=0, today=old_day)
+        monkeypatch.setattr("monitor.partitions.DETACH_LOCK_TIMEOUT_MS", 100)
+
+        # A long-running reader of the parent table in another session
+        reader = connection.copy()
+        try:
+            with reader.cursor() as cursor:
+                cursor.execute("BEGIN")
+                cursor.execute(
+                    "LOCK TABLE ONLY monitor_monitorresult IN ACCESS SHARE MODE"
+                )
+                dropped = manager.drop_expired(retain_days=30)
+                cursor.execute("ROLLBACK")
+        finally:
+            reader.close()
+
+        assert dropped == []
+        assert old_day in manager.partitions()
+
+    def test_drop_expired_disabled(self, manager: ResultPartitionManager) -> None:
+        manager.ensure(days_ahead=0, today=timezone.now().date() - timedelta(days=90))
+
+        assert manager.drop_expired(retain_days=0) == []
+
+    def test_ids_stay_unique_across_partitions(self, monitor: Monitor) -> None:
+        first = MonitorResult.objects.create(monitor=monitor, is_up=True)
+        MonitorResult.objects.filter(id=first.id).update(
+            created_at=timezone.now() - timedelta(days=1)
+        )
+        second = MonitorResult.objects.create(monitor=monitor, is_up=True)
+
+        assert second.id > first.id
+        assert MonitorResult.objects.get(id=first.id).monitor_id == monitor.id
+
+
+@pytest.mark.django_db
+def test_manage_partitions_task() -> None:
+    from monitor.tasks import manage_result_partitions_task
+
+    # The migration already created the upcoming week
+    assert manage_result_partitions_task() == "Created 0 result partitions"
@@ -0,0 +1,181 @@
+import asyncio
+import time
+from typing import List
+import fakeredis
+import httpx
+import pytest
+import redis.asyncio as aioredis
+from monitor.engine import AsyncCheckEngine
+from monitor.models import Monitor
+from monitor.politeness import SLOTS_KEY, HostLimiter
+
+
+class TestHostLimiter:
+    """Unit tests for the per-host politeness limits"""
+
+    def _limiter(
+        self, max_concurrency: int = 2, min_spacing: float = 0.1, max_wait: float = 1
+    ) -> HostLimiter:
+        return HostLimiter(
+            max_concurrency=max_concurrency, min_spacing=min_spacing, max_wait=max_wait
+        )
+
+    def test_concurrency_is_limited_across_workers(
+        self, fake_redis: fakeredis.FakeRedis
+    ) -> None:
+        # Two limiters sharing Redis: two runner workers, which do not wake
+        # each other's checks
+        workers = [self._limiter(min_spacing=0, max_wait=0.01) for _ in range(2)]
+        in_flight: List[int] = [0]
+        peak: List[int] = [0]
+
+        async def check(limiter: HostLimiter) -> None:
+            async with limiter.slot("example.com"):
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+                await asyncio.sleep(0.02)
+                in_flight[0] -= 1
+
+        async def check_all() -> None:
+            await asyncio.gather(*(check(workers[i % 2]) for i in range(6)))
+
+        asyncio.run(check_all())
+
+        assert peak[0] == 2
+        assert in_flight[0] == 0
+        assert fake_redis.zcard(SLOTS_KEY.format("example.com")) == 0
+
+    def test_hosts_are_limited_independently(
+        self, fake_redis: fakeredis.FakeRedis
+    ) -> None:
+        limiter = self._limiter(max_concurrency=1, min_spacing=0)
+
+        async def acquire_both() -> List[object]:
+            return [
+                await limiter.acquire("example.com"),
+                await limiter.acquire("Example.org"),
+            ]
+
+        assert all(asyncio.run(acquire_both()))
+        assert fake_redis.zcard(SLOTS_KEY.format("example.org")) == 1
+
+    def test_starts_are_spaced(self, fake_redis: fakeredis.FakeRedis) -> None:
+        limiter = self._limiter(max_concurrency=10, min_spacing=0.05)
+        starts: List[float] = []
+
+        async def check() -> None:
+            async with limiter.slot("example.com"):
+                starts.append(time.monotonic())
+
+        async def check_all() -> None:
+            await asyncio.gather(*(check() for _ in range(3)))
+
+        asyncio.run(check_all())
+
+        gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+        assert all(gap >= 0.04 for gap in gaps)
+
+    def test_expired_leases_free_their_slot(
+        self, fake_redis: fakeredis.FakeRedis
+    ) -> None:
+        limiter = self._limiter(max_concurrency=1, min_spacing=0)
+        # A slot held by a worker that died an hour ago
+        fake_redis.zadd(
+            SLOTS_KEY.format("example.com"), {"crashed": (time.time() - 3600) * 1000}
+        )
+
+        token = asyncio.run(limiter.acquire("example.com"))
+
+        assert token is not None
+        assert fake_redis.zrange(SLOTS_KEY.format("example.com"), 0, -1) == [token]
+
+    def test_waits_until_the_earliest_lease_expires(
+        self, fake_redis: fakeredis.FakeRedis
+    ) -> None:
+        limiter = self._limiter(max_concurrency=1, min_spacing=0, max_wait=10)
+        # A slot of another worker, whose lease ends in 0.1 seconds
+        fake_redis.zadd(
+            SLOTS_KEY.format("example.com"), {"other": (time.time() + 0.1) * 1000}
+        )
+
+        started = time.monotonic()
+        token = asyncio.run(limiter.acquire("example.com"))
+
+        assert token is not None
+        assert 0.05 <= time.monotonic() - started < 1
+
+    def test_released_slots_wake_waiting_checks(self) -> None:
+        limiter = self._limiter(max_concurrency=1, min_spacing=0, max_wait=10)
+        started: List[float] = []
+
+        async def check() -> None:
+            async with limiter.slot("example.com"):
+                started.append(time.monotonic())
+                await asyncio.sleep(0.05)
+
+        async def check_both() -> None:
+            await asyncio.gather(check(), check())
+
+        asyncio.run(check_both())
+
+        # Not a lease (60 seconds) later
+        assert started[1] - started[0] < 0.5
+
+    def test_checks_go_ahead_without_redis(self) -> None:
+        # Nothing listens on port 1
+        client = aioredis.Redis(host="127.0.0.1", port=1)
+        limiter = HostLimiter(client, max_concurrency=1, min_spacing=0.1)
+
+        async def check() -> bool:
+            async with limiter.slot("example.com"):
+                return True
+
+        assert asyncio.run(check())
+
+    @pytest.mark.parametrize("min_spacing", [0, 0.05])
+    def test_released_slots_are_reused(
+        self, fake_redis: fakeredis.FakeRedis, min_spacing: float
+    ) -> None:
+        limiter = self._limiter(max_concurrency=1, min_spacing=min_spacing)
+
+        async def check_twice() -> None:
+            for _ in range(2):
+                async with asyncio.timeout(1):
+                    async with limiter.slot("example.com"):
+                        pass
+
+        asyncio.run(check_twice())
+
+        assert fake_redis.zcard(SLOTS_KEY.format("example.com")) == 0
+
+
+class TestPoliteChecks:
+    """Tests for the host limits in the check engine"""
+
+    def test_checks_over_the_limit_are_deferred(
+        self, fake_redis: fakeredis.FakeRedis
+    ) -> None:
+        in_flight: List[int] = [0]
+        peak: List[int] = [0]
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0.02)
+            in_flight[0] -= 1
+            return httpx.Response(200)
+
+        engine = AsyncCheckEngine(
+            transport=httpx.MockTransport(handler),
+            limiter=HostLimiter(max_concurrency=1, min_spacing=0),
+        )
+        monitors = [
+            Monitor(id=i, url=f"https://example.com/{i}", monitor_type="HTTP")
+            for i in range(1, 5)
+        ]
+
+        results = engine.run(monitors)
+
+        assert peak[0] == 1
+        assert [result.monitor_id for result in results] == [1, 2, 3, 4]
+        assert all(result.is_up for result in results)
@@ -0,0 +1,146 @@
+import asyncio
+import ipaddress
+from typing import Any, List, Tuple
+import httpx
+import pytest
+from monitor.engine import AsyncCheckEngine
+from monitor.models import Monitor
+from monitor.resolver import (
+    DNSCache,
+    ForbiddenAddressError,
+    IPAddress,
+    PinnedTransport,
+    is_forbidden_address,
+)
+
+PUBLIC = ipaddress.ip_address("93.184.216.34")
+
+
+class StaticDNSCache(DNSCache):
+    """Answers every lookup with fixed records and counts the lookups."""
+
+    def __init__(self, addresses: List[str], ttl: float = 60, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.addresses = [ipaddress.ip_address(a) for a in addresses]
+        self.ttl = ttl
+        self.lookups = 0
+
+    async def _lookup(self, host: str) -> Tuple[List[IPAddress], float]:
+        self.lookups += 1
+        return self.addresses, self.ttl
+
+
+class TestIsForbiddenAddress:
+    """Unit tests for the address vetting"""
+
+    @pytest.mark.parametrize(
+        "address",
+        [
+            "127.0.0.1",
+            "10.1.2.3",
+            "172.16.0.1",
+            "192.168.1.1",
+            "169.254.169.254",
+            "0.0.0.0",
+            "224.0.0.1",
+            "::1",
+            "fd00:ec2::254",
+            "::ffff:127.0.0.1",
+        ],
+    )
+    def test_forbidden(self, address: str) -> None:
+        assert is_forbidden_address(ipaddress.ip_address(address))
+
+    @pytest.mark.parametrize("address", ["93.184.216.34", "2606:2800:220:1::1"])
+    def test_public(self, address: str) -> None:
+        assert not is_forbidden_address(ipaddress.ip_address(address))
+
+
+class TestDNSCache:
+    """Unit tests for the runner DNS cache"""
+
+    def test_answer_is_cached_for_its_ttl(self) -> None:
+        now = [0.0]
+        cache = StaticDNSCache(["93.184.216.34"], ttl=30, clock=lambda: now[0])
+
+        assert asyncio.run(cache.resolve("example.com")) == PUBLIC
+        now[0] = 29
+        asyncio.run(cache.resolve("EXAMPLE.com."))
+        assert cache.lookups == 1
+
+        now[0] = 31
+        asyncio.run(cache.resolve("example.com"))
+        assert cache.lookups == 2
+
+    def test_ttl_is_clamped(self) -> None:
+        now = [0.0]
+        cache = StaticDNSCache(
+            ["93.184.216.34"], ttl=0, min_ttl=5, max_ttl=300, clock=lambda: now[0]
+        )
+
+        asyncio.run(cache.resolve("example.com"))
+        now[0] = 4
+        asyncio.run(cache.resolve("example.com"))
+        assert cache.lookups == 1
+
+        cache.ttl = 86400
+        now[0] = 5
+        asyncio.run(cache.resolve("example.com"))
+        now[0] = 306
+        asyncio.run(cache.resolve("example.com"))
+        assert cache.lookups == 3
+
+    def test_host_resolving_to_private_address_is_refused(self) -> None:
+        cache = StaticDNSCache(["93.184.216.34", "10.0.0.5"])
+
+        with pytest.raises(ForbiddenAddressError, match="10.0.0.5"):
+            asyncio.run(cache.resolve("rebind.example.com"))
+
+    def test_ip_literals_are_vetted_without_lookup(self) -> None:
+        cache = StaticDNSCache([])
+
+        assert asyncio.run(cache.resolve("93.184.216.34")) == PUBLIC
+        with pytest.raises(ForbiddenAddressError):
+            asyncio.run(cache.resolve("169.254.169.254"))
+        assert cache.lookups == 0
+
+
+class TestPinnedTransport:
+    """Unit tests for connecting to the vetted address"""
+
+    def test_request_goes_to_vetted_address(self) -> None:
+        seen: List[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200)
+
+        transport = PinnedTransport(
+            httpx.MockTransport(handler), StaticDNSCache(["93.184.216.34"])
+        )
+
+        async def get() -> httpx.Response:
+            async with httpx.AsyncClient(transport=transport) as client:
+                return await client.get("https://example.com/health")
+
+        assert asyncio.run(get()).status_code == 200
+        assert seen[0].url.host == "93.184.216.34"
+        assert seen[0].url.path == "/health"
+        assert seen[0].headers["Host"] == "example.com"
+        assert seen[0].extensions["sni_hostname"] == "example.com"
+
+    def test_forbidden_host_is_reported_as_down(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise AssertionError("a forbidden address was connected to")
+
+        engine = AsyncCheckEngine(
+            transport=httpx.MockTransport(handler),
+            dns_cache=StaticDNSCache(["127.0.0.1"]),
+        )
+
+        results = engine.run(
+            [Monitor(id=1, url="https://internal.example.com", monitor_type="HTTP")]
+        )
+
+        assert results[0].status_code == 0
+        assert results[0].is_up is False
@@ -0,0 +1,117 @@
+import pytest
+from typing import Any
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from faker import Faker
+from monitor.models import Monitor, MonitorResult, MonitorRollup
+from monitor.partitions import ResultPartitionManager
+from monitor.retention import RetentionEngine
+from monitor.rollups import DAY, HOUR, MINUTE, floor_to
+
+User = get_user_model()
+fake = Faker()
+
+
+@pytest.fixture
+def monitor() -> Monitor:
+    user = User.objects.create_user(  # type: ignore[attr-defined]
+        email=fake.email(), password="testpass123"
+    )
+    return Monitor.objects.create(
+        user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+    )
+
+
+@pytest.fixture
+def engine() -> RetentionEngine:
+    return RetentionEngine(chunk_size=2, pause=0)
+
+
+def _backdated_results(monitor: Monitor, count: int, age: timedelta) -> None:
+    for _ in range(count):
+        result = MonitorResult.objects.create(monitor=monitor, is_up=True)
+        MonitorResult.objects.filter(id=result.id).update(
+            created_at=timezone.now() - age
+        )
+    # Fire the deferred FK checks before any partition is dropped
+    with connection.cursor() as cursor:
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+
+@pytest.mark.django_db
+class TestRetentionEngine:
+    def test_purges_expired_results_in_chunks(
+        self, engine: RetentionEngine, monitor: Monitor, settings: Any
+    ) -> None:
+        settings.RESULT_RETENTION_DAYS = 30
+        # No partition exists that far back: these rows sit in DEFAULT
+        _backdated_results(monitor, 5, timedelta(days=400))
+        _backdated_results(monitor, 2, timedelta(days=1))
+
+        purged = engine.run()
+
+        assert purged["results"] == 5
+        assert MonitorResult.objects.filter(monitor=monitor).count() == 2
+
+    def test_drops_expired_partitions(
+        self, engine: RetentionEngine, monitor: Monitor, settings: Any
+    ) -> None:
+        settings.RESULT_RETENTION_DAYS = 30
+        old_day = (timezone.now() - timedelta(days=45)).date()
+        ResultPartitionManager().ensure(days_ahead=0, today=old_day)
+        _backdated_results(monitor, 3, timedelta(days=45))
+
+        purged = engine.run()
+
+        assert purged["result_partitions"] >= 1
+        assert purged["results"] == 0
+        assert not MonitorResult.objects.filter(monitor=monitor).exists()
+
+    def test_empty_default_partition_is_not_scanned(
+        self, engine: RetentionEngine, monitor: Monitor, settings: Any
+    ) -> None:
+        settings.RESULT_RETENTION_DAYS = 30
+        yesterday = (timezone.now() - timedelta(days=1)).date()
+        ResultPartitionManager().ensure(days_ahead=1, today=yesterday)
+        _backdated_results(monitor, 2, timedelta(days=1))
+
+        with CaptureQueriesContext(connection) as captured:
+            purged = engine.purge_results(timezone.now())
+
+        assert purged["results"] == 0
+        assert not any("DELETE" in query["sql"] for query in captured)
+
+    def test_keeps_everything_when_disabled(
+        self, engine: RetentionEngine, monitor: Monitor, settings: Any
+    ) -> None:
+        settings.RESULT_RETENTION_DAYS = 0
+        _backdated_results(monitor, 3, timedelta(days=400))
+
+        assert "results" not in engine.run()
+        assert MonitorResult.objects.filter(monitor=monitor).count() == 3
+
+    def test_purges_rollups_per_granularity(
+        self, engine: RetentionEngine, monitor: Monitor, settings: Any
+    ) -> None:
+        settings.ROLLUP_RETENTION_DAYS = {"minute": 2, "hour": 90, "day": 0}
+        now = timezone.now()
+        for granularity, age in [
+            (MINUTE, timedelta(days=3)),
+            (MINUTE, timedelta(hours=1)),
+            (HOUR, timedelta(days=3)),
+            (HOUR, timedelta(days=100)),
+            (DAY, timedelta(days=1000)),
+        ]:
+            MonitorRollup.objects.create(
+                monitor=monitor,
+                granularity=granularity,
+                bucket_start=floor_to(now - age, granularity),
+            )
+
+        purged = engine.purge_rollups(now)
+
+        assert purged == {"minute_rollups": 1, "hour_rollups": 1}
+        assert MonitorRollup.objects.filter(monitor=monitor).count() == 3
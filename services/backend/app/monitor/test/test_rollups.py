@@ -0,0 +1,241 @@
+import pytest
+from typing import Any
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from faker import Faker
+from monitor.crud import MonitorRollupCRUD
+from monitor.dtos import CheckResult, CheckTimings
+from monitor.models import Monitor, MonitorResult, MonitorRollup
+from monitor.services import MonitorService
+from monitor.rollups import (
+    DAY,
+    HOUR,
+    MINUTE,
+    cover,
+    floor_to,
+    sketch_index,
+    sketch_quantile,
+)
+
+User = get_user_model()
+fake = Faker()
+
+
+def _at(
+    year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0
+) -> datetime:
+    return datetime(year, month, day, hour, minute, second, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture
+def user() -> Any:
+    return User.objects.create_user(  # type: ignore[attr-defined]
+        email=fake.email(), password="testpass123"
+    )
+
+
+@pytest.fixture
+def monitor(user: Any) -> Monitor:
+    return Monitor.objects.create(
+        user=user, name=fake.company(), url=fake.url(), monitor_type="HTTP"
+    )
+
+
+@pytest.fixture
+def crud() -> MonitorRollupCRUD:
+    return MonitorRollupCRUD()
+
+
+class TestRollupMath:
+    def test_floor_to(self) -> None:
+        moment = _at(2026, 3, 4, 5, 6, 7)
+
+        assert floor_to(moment, MINUTE) == _at(2026, 3, 4, 5, 6)
+        assert floor_to(moment, HOUR) == _at(2026, 3, 4, 5)
+        assert floor_to(moment, DAY) == _at(2026, 3, 4)
+
+    def test_cover_uses_coarsest_buckets(self) -> None:
+        ranges = cover(_at(2026, 3, 1, 22, 30, 15), _at(2026, 3, 4, 1, 10, 30))
+
+        assert ranges == [
+            (MINUTE, _at(2026, 3, 1, 22, 30), _at(2026, 3, 1, 23)),
+            (HOUR, _at(2026, 3, 1, 23), _at(2026, 3, 2)),
+            (DAY, _at(2026, 3, 2), _at(2026, 3, 4)),
+            (HOUR, _at(2026, 3, 4), _at(2026, 3, 4, 1)),
+            (MINUTE, _at(2026, 3, 4, 1), _at(2026, 3, 4, 1, 10, 30)),
+        ]
+
+    def test_cover_within_one_hour(self) -> None:
+        ranges = cover(_at(2026, 3, 1, 10, 5), _at(2026, 3, 1, 10, 20))
+
+        assert ranges == [(MINUTE, _at(2026, 3, 1, 10, 5), _at(2026, 3, 1, 10, 20))]
+
+    def test_cover_size_does_not_grow_with_period(self) -> None:
+        end = _at(2026, 3, 31, 13, 37, 1)
+
+        assert len(cover(end - timedelta(days=30), end)) <= 5
+
+    def test_sketch_quantile(self) -> None:
+        sketch = [0] * 50
+        for latency in [100] * 90 + [1000] * 10:
+            sketch[sketch_index(latency)] += 1
+
+        assert sketch_quantile(sketch, 0.5) == pytest.approx(100, rel=0.13)
+        assert sketch_quantile(sketch, 0.95) == pytest.approx(1000, rel=0.13)
+        assert sketch_quantile([0] * 50, 0.95) is None
+
+
+@pytest.mark.django_db
+class TestMonitorRollupCRUD:
+    def test_result_save_updates_all_granularities(self, monitor: Monitor) -> None:
+        MonitorResult.objects.create(
+            monitor=monitor, status_code=200, response_time_ms=120, is_up=True
+        )
+        MonitorResult.objects.create(
+            monitor=monitor, status_code=500, response_time_ms=80, is_up=False
+        )
+
+        rollups = MonitorRollup.objects.filter(monitor=monitor)
+        assert rollups.count() == 3
+        for rollup in rollups:
+            assert rollup.checks == 2
+            assert rollup.up_count == 1
+            assert rollup.latency_sum == 200
+            assert (rollup.latency_min, rollup.latency_max) == (80, 120)
+            assert sum(rollup.latency_sketch) == 2
+
+    def test_get_stats_aggregate(
+        self, crud: MonitorRollupCRUD, monitor: Monitor
+    ) -> None:
+        for latency, is_up in [(100, True), (300, True), (None, False)]:
+            MonitorResult.objects.create(
+                monitor=monitor, response_time_ms=latency, is_up=is_up
+            )
+        now = timezone.now()
+
+        stats = crud.get_stats_aggregate(monitor, now - timedelta(days=30), now)
+
+        assert stats["total_checks"] == 3
+        assert stats["up_count"] == 2
+        assert stats["down_count"] == 1
+        assert stats["avg_latency"] == 200
+        assert stats["p95_latency"] == pytest.approx(300, rel=0.13)
+
+    def test_get_stats_aggregate_phase_timings(
+        self, crud: MonitorRollupCRUD, monitor: Monitor
+    ) -> None:
+        # A reused connection times neither connect nor tls
+        MonitorResult.objects.create(
+            monitor=monitor, is_up=True, dns_ms=2, ttfb_ms=40, transfer_ms=4
+        )
+        MonitorResult.objects.create(
+            monitor=monitor,
+            is_up=True,
+            dns_ms=4,
+            connect_ms=10,
+            tls_ms=30,
+            ttfb_ms=60,
+            transfer_ms=6,
+        )
+        MonitorResult.objects.create(monitor=monitor, is_up=False)
+        now = timezone.now()
+
+        stats = crud.get_stats_aggregate(monitor, now - timedelta(days=30), now)
+
+        assert stats["avg_timings"] == {
+            "dns": 3,
+            "connect": 10,
+            "tls": 30,
+            "ttfb": 50,
+            "transfer": 5,
+        }
+
+    def test_phase_timings_merge_into_rollups_without_them(
+        self, crud: MonitorRollupCRUD, monitor: Monitor
+    ) -> None:
+        MonitorResult.objects.create(monitor=monitor, is_up=False)
+        MonitorResult.objects.create(monitor=monitor, is_up=True, ttfb_ms=20)
+
+        minute = MonitorRollup.objects.get(monitor=monitor, granularity=MINUTE)
+        assert minute.phase_counts == [0, 0, 0, 1, 0]
+        assert minute.phase_sums == [0, 0, 0, 20, 0]
+
+    def test_get_stats_aggregate_excludes_old_buckets(
+        self, crud: MonitorRollupCRUD, monitor: Monitor
+    ) -> None:
+        now = timezone.now()
+        MonitorRollup.objects.create(
+            monitor=monitor,
+            granularity=DAY,
+            bucket_start=floor_to(now, DAY) - timedelta(days=10),
+            checks=5,
+        )
+
+        assert (
+            crud.get_stats_aggregate(monitor, now - timedelta(days=30), now)[
+                "total_checks"
+            ]
+            == 5
+        )
+        assert (
+            crud.get_stats_aggregate(monitor, now - timedelta(days=7), now)[
+                "total_checks"
+            ]
+            == 0
+        )
+
+    def test_rebuild(self, crud: MonitorRollupCRUD, monitor: Monitor) -> None:
+        now = timezone.now()
+        result = MonitorResult.objects.create(
+            monitor=monitor, response_time_ms=100, is_up=True
+        )
+        MonitorResult.objects.filter(id=result.id).update(
+            created_at=now - timedelta(days=3)
+        )
+
+        assert crud.rebuild(now - timedelta(days=30), timezone.now()) == 1
+
+        day = MonitorRollup.objects.get(monitor=monitor, granularity=DAY)
+        assert day.bucket_start == floor_to(now - timedelta(days=3), DAY)
+        assert day.checks == 1
+
+
+@pytest.mark.django_db
+class TestRollupIngestion:
+    def test_bulk_results_update_rollups(self, monitor: Monitor) -> None:
+        MonitorService().process_check_results(
+            [
+                CheckResult(monitor.id, True, 100, 200),
+                CheckResult(monitor.id, False, 0, 0),
+            ]
+        )
+
+        minute = MonitorRollup.objects.get(monitor=monitor, granularity=MINUTE)
+        assert (minute.checks, minute.up_count) == (2, 1)
+
+    def test_bulk_results_store_phase_timings(self, monitor: Monitor) -> None:
+        timings = CheckTimings(dns=1, connect=12, tls=25, ttfb=80, transfer=3)
+        MonitorService().process_check_results(
+            [CheckResult(monitor.id, True, 121, 200, timings)]
+        )
+
+        result = MonitorResult.objects.get(monitor=monitor)
+        assert (result.dns_ms, result.connect_ms, result.tls_ms) == (1, 12, 25)
+        assert (result.ttfb_ms, result.transfer_ms) == (80, 3)
+        stats = MonitorService().get_stats(monitor)
+        assert stats["avg_timings"]["tls"] == 25
+
+    def test_get_stats_query_count_is_constant(
+        self, monitor: Monitor, django_assert_num_queries: Any
+    ) -> None:
+        MonitorService().process_check_results(
+            [CheckResult(monitor.id, True, 100, 200) for _ in range(50)]
+        )
+
+        # One rollup query and the last check, however many results exist
+        with django_assert_num_queries(2):
+            stats = MonitorService().get_stats(monitor, period="30d")
+
+        assert stats["total_checks"] == 50
+        assert stats["avg_response_time"] == 100
@@ -0,0 +1,247 @@
+import pytest
+from typing import Any, cast
+from unittest.mock import patch, Mock
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from faker import Faker
+from monitor.models import Monitor
+from monitor.scheduler import (
+    MonitorScheduler,
+    SCHEDULE_KEY,
+    INTERVALS_KEY,
+    next_slot,
+    phase,
+)
+
+User = get_user_model()
+fake = Faker()
+
+
+@pytest.fixture
+def user() -> Any:
+    return User.objects.create_user(email=fake.email(), password="testpass123")
+
+
+@pytest.fixture
+def scheduler() -> MonitorScheduler:
+    scheduler = MonitorScheduler()
+    # Due times exactly on each monitor's phase
+    scheduler.jitter = 0
+    return scheduler
+
+
+def _create_monitor(user: Any, **kwargs: Any) -> Monitor:
+    defaults = {"name": fake.company(), "url": fake.url(), "monitor_type": "HTTP"}
+    defaults.update(kwargs)
+    return Monitor.objects.create(user=user, **defaults)
+
+
+class TestMonitorScheduler:
+    """Unit tests for the Redis sorted-set scheduler"""
+
+    def test_schedule_and_claim_due(self, scheduler: MonitorScheduler) -> None:
+        scheduler.schedule(1, 60, due_at=1000)
+        scheduler.schedule(2, 30, due_at=1010)
+        scheduler.schedule(3, 60, due_at=2000)
+
+        claimed = scheduler.claim_due(now=1020, limit=10)
+
+        assert sorted(claimed) == [1, 2]
+        assert scheduler.redis.zscore(SCHEDULE_KEY, "1") == next_slot(1, 60, 1020)
+        assert scheduler.redis.zscore(SCHEDULE_KEY, "2") == next_slot(2, 30, 1020)
+        assert scheduler.redis.zscore(SCHEDULE_KEY, "3") == 2000
+
+    def test_claim_respects_limit(self, scheduler: MonitorScheduler) -> None:
+        for monitor_id in range(5):
+            scheduler.schedule(monitor_id, 60, due_at=1000 + monitor_id)
+
+        assert scheduler.claim_due(now=2000, limit=2) == [0, 1]
+
+    def test_late_monitor_skips_missed_checks(
+        self, scheduler: MonitorScheduler
+    ) -> None:
+        scheduler.schedule(1, 60, due_at=1000)
+
+        scheduler.claim_due(now=5000, limit=10)
+
+        due_at = cast(float, scheduler.redis.zscore(SCHEDULE_KEY, "1"))
+        assert 5000 < due_at <= 5060
+
+    def test_orphan_entries_are_dropped(self, scheduler: MonitorScheduler) -> None:
+        scheduler.redis.zadd(SCHEDULE_KEY, {"7": 1000})
+
+        assert scheduler.claim_due(now=2000, limit=10) == []
+        assert scheduler.redis.zscore(SCHEDULE_KEY, "7") is None
+
+    def test_unschedule(self, scheduler: MonitorScheduler) -> None:
+        scheduler.schedule(1, 60, due_at=1000)
+
+        scheduler.unschedule([1])
+
+        assert scheduler.redis.zcard(SCHEDULE_KEY) == 0
+        assert scheduler.redis.hlen(INTERVALS_KEY) == 0
+
+    def test_update_interval_keeps_due_time(self, scheduler: MonitorScheduler) -> None:
+        scheduler.schedule(1, 60, due_at=1000)
+
+        scheduler.update_interval(1, 300)
+        scheduler.claim_due(now=1000, limit=10)
+
+        assert scheduler.redis.zscore(SCHEDULE_KEY, "1") == next_slot(1, 300, 1000)
+
+    def test_on_phase_monitor_keeps_its_interval(
+        self, scheduler: MonitorScheduler
+    ) -> None:
+        due_at = next_slot(1, 60, 1000)
+        scheduler.schedule(1, 60, due_at=due_at)
+
+        scheduler.claim_due(now=due_at + 0.5, limit=10)
+
+        assert scheduler.redis.zscore(SCHEDULE_KEY, "1") == pytest.approx(due_at + 60)
+
+    def test_monitors_created_together_are_spread(
+        self, scheduler: MonitorScheduler
+    ) -> None:
+        for monitor_id in range(1, 61):
+            scheduler.schedule(monitor_id, 60, due_at=1000)
+
+        scheduler.claim_due(now=1000, limit=100)
+
+        # Every 10 seconds of the next interval get about a sixth of them
+        due = [score for _, score in scheduler.redis.zscan_iter(SCHEDULE_KEY)]
+        buckets = [
+            sum(1 for d in due if 1000 + s < d <= 1010 + s) for s in range(0, 60, 10)
+        ]
+        assert all(8 <= bucket <= 12 for bucket in buckets)
+
+    def test_jitter_is_bounded(self, scheduler: MonitorScheduler) -> None:
+        scheduler.jitter = 5
+
+        for monitor_id in range(1, 21):
+            slot = next_slot(monitor_id, 30, 1000)
+            assert slot <= scheduler.next_due(monitor_id, 30, 1000) <= slot + 3
+
+    def test_phase_is_deterministic(self) -> None:
+        assert phase(42, 60) == phase(42, 60)
+        assert 0 <= phase(42, 60) < 60
+        assert next_slot(42, 60, 1000) % 60 == pytest.approx(phase(42, 60))
+
+    @patch("monitor.tasks.check_monitors_batch_task.apply_async")
+    def test_tick_enqueues_in_batches(
+        self, mock_apply_async: Mock, scheduler: MonitorScheduler
+    ) -> None:
+        scheduler.batch_size = 2
+        for monitor_id in range(5):
+            scheduler.schedule(monitor_id, 60, due_at=1000)
+
+        enqueued = scheduler.tick(now=1000)
+
+        assert enqueued == 5
+        assert mock_apply_async.call_count == 3
+        batches = [c[1]["args"][0] for c in mock_apply_async.call_args_list]
+        assert sorted(sum(batches, [])) == [0, 1, 2, 3, 4]
+        assert all(
+            c[1]["queue"] == "runner_queue" for c in mock_apply_async.call_args_list
+        )
+
+    @patch("monitor.tasks.check_monitors_batch_task.apply_async")
+    def test_tick_without_due_monitors(
+        self, mock_apply_async: Mock, scheduler: MonitorScheduler
+    ) -> None:
+        scheduler.schedule(1, 60, due_at=5000)
+
+        assert scheduler.tick(now=1000) == 0
+        mock_apply_async.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestSchedulerSync:
+    """The database is the source of truth; sync repairs the schedule"""
+
+    def test_sync_restores_missing_and_drops_stale(
+        self, scheduler: MonitorScheduler, user: Any
+    ) -> None:
+        checked_at = timezone.now() - timedelta(seconds=10)
+        active = _create_monitor(user, interval=60, last_checked_at=checked_at)
+        _create_monitor(user, is_active=False)
+        scheduler.schedule(99999, 60)
+
+        added, removed = scheduler.sync()
+
+        assert (added, removed) == (1, 1)
+        # Restored on its phase, within the next interval
+        due_at = cast(float, scheduler.redis.zscore(SCHEDULE_KEY, str(active.id)))
+        now = timezone.now().timestamp()
+        assert now - 1 < due_at <= now + 60
+        assert due_at % 60 == pytest.approx(phase(active.id, 60))
+        assert scheduler.redis.hget(INTERVALS_KEY, str(active.id)) == "60"
+        assert scheduler.redis.zscore(SCHEDULE_KEY, "99999") is None
+
+    def test_sync_keeps_existing_due_times(
+        self, scheduler: MonitorScheduler, user: Any
+    ) -> None:
+        monitor = _create_monitor(user, interval=60)
+        scheduler.schedule(monitor.id, 60, due_at=1234)
+
+        assert scheduler.sync() == (0, 0)
+        assert scheduler.redis.zscore(SCHEDULE_KEY, str(monitor.id)) == 1234
+
+
+@pytest.mark.django_db
+class TestMonitorScheduleHooks:
+    """Monitor.save/delete keep the schedule in step after commit"""
+
+    def test_new_monitor_is_scheduled(
+        self,
+        scheduler: MonitorScheduler,
+        user: Any,
+        django_capture_on_commit_callbacks: Any,
+    ) -> None:
+        with django_capture_on_commit_callbacks(execute=True):
+            monitor = _create_monitor(user, interval=120)
+
+        assert scheduler.redis.zscore(SCHEDULE_KEY, str(monitor.id)) is not None
+        assert scheduler.redis.hget(INTERVALS_KEY, str(monitor.id)) == "120"
+
+    def test_paused_monitor_is_unscheduled(
+        self,
+        scheduler: MonitorScheduler,
+        user: Any,
+        django_capture_on_commit_callbacks: Any,
+    ) -> None:
+        with django_capture_on_commit_callbacks(execute=True):
+            monitor = _create_monitor(user)
+        with django_capture_on_commit_callbacks(execute=True):
+            monitor.is_active = False
+            monitor.save()
+
+        assert scheduler.redis.zscore(SCHEDULE_KEY, str(monitor.id)) is None
+
+    def test_interval_change_is_applied(
+        self,
+        scheduler: MonitorScheduler,
+        user: Any,
+        django_capture_on_commit_callbacks: Any,
+    ) -> None:
+        with django_capture_on_commit_callbacks(execute=True):
+            monitor = _create_monitor(user, interval=60)
+        with django_capture_on_commit_callbacks(execute=True):
+            monitor.interval = 600
+            monitor.save()
+
+        assert scheduler.redis.hget(INTERVALS_KEY, str(monitor.id)) == "600"
+
+    def test_deleted_monitor_is_unscheduled(
+        self,
+        scheduler: MonitorScheduler,
+        user: Any,
+        django_capture_on_commit_callbacks: Any,
+    ) -> None:
+        with django_capture_on_commit_callbacks(execute=True):
+            monitor = _create_monitor(user)
+        monitor_id = monitor.id
+        with django_capture_on_commit_callbacks(execute=True):
+            monitor.delete()
+
+        assert scheduler.redis.zscore(SCHEDULE_KEY, str(monitor_id)) is None
@@ -1,11 +1,13 @@
 import pytest
 from typing import Any
+from unittest.mock import patch
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
 from faker import Faker
 from monitor.models import Monitor, MonitorResult
 from monitor.services import MonitorService
+from monitor.dtos import CheckResult
 
 User = get_user_model()
 fake = Faker()
@@ -217,3 +219,108 @@ class TestMonitorService:
         stats = service.get_dashboard_stats(user)
         assert stats["total"] == 2
         assert stats["active"] == 1
+
+    def test_get_dashboard_stats_query_count(
+        self, service: MonitorService, user: Any, django_assert_num_queries: Any
+    ) -> None:
+        for status in (Monitor.StatusType.UP, Monitor.StatusType.DOWN):
+            Monitor.objects.create(
+                user=user, name=fake.company(), url=fake.url(), status=status
+            )
+
+        # Monitor counts, rollup latency average and recent failures
+        with django_assert_num_queries(3):
+            service.get_dashboard_stats(user)
+
+        # Then served from the cache
+        with django_assert_num_queries(0):
+            stats = service.get_dashboard_stats(user)
+        assert stats["up"] == 1
+        assert stats["down"] == 1
+
+    def test_get_dashboard_stats_invalidated_on_status_change(
+        self, service: MonitorService, user: Any, monitor: Monitor
+    ) -> None:
+        Monitor.objects.filter(id=monitor.id).update(status=Monitor.StatusType.UP)
+        assert service.get_dashboard_stats(user)["down"] == 0
+
+        with patch.object(service, "dispatch_alerts"):
+            service.process_check_result(monitor.id, False, 0, 500)
+
+        stats = service.get_dashboard_stats(user)
+        assert stats["down"] == 1
+        assert len(stats["recent_failures"]) == 1
+
+    def test_get_dashboard_stats_invalidated_on_monitor_edit(
+        self,
+        service: MonitorService,
+        user: Any,
+        monitor: Monitor,
+        django_capture_on_commit_callbacks: Any,
+    ) -> None:
+        assert service.get_dashboard_stats(user)["active"] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            monitor.is_active = False
+            monitor.save()
+
+        assert service.get_dashboard_stats(user)["active"] == 0
+
+    def test_process_check_results(
+        self, service: MonitorService, monitor: Monitor, user: Any
+    ) -> None:
+        second = Monitor.objects.create(
+            user=user, name="M2", url=fake.url(), monitor_type="HTTP"
+        )
+
+        service.process_check_results(
+            [
+                CheckResult(monitor.id, True, 100, 200),
+                CheckResult(second.id, False, 300, 500),
+            ]
+        )
+
+        monitor.refresh_from_db()
+        second.refresh_from_db()
+        assert monitor.status == Monitor.StatusType.UP
+        assert second.status == Monitor.StatusType.DOWN
+        assert monitor.last_checked_at is not None
+        assert monitor.last_response_time_ms == 100
+        assert second.last_status_code == 500
+        assert second.recent_uptime_percentage == 0.0
+        assert MonitorResult.objects.filter(monitor__user=user).count() == 2
+
+    def test_process_check_result_query_count(
+        self,
+        service: MonitorService,
+        monitor: Monitor,
+        django_assert_num_queries: Any,
+    ) -> None:
+        Monitor.objects.filter(id=monitor.id).update(status=Monitor.StatusType.DOWN)
+
+        # UPDATE ... RETURNING, INSERT and the rollup upsert; no Monitor.save()
+        with django_assert_num_queries(3):
+            service.process_check_result(monitor.id, False, 0, 0)
+
+        monitor.refresh_from_db()
+        assert monitor.status == Monitor.StatusType.DOWN
+        assert monitor.last_checked_at is not None
+
+    def test_process_check_result_status_change_alerts(
+        self, service: MonitorService, monitor: Monitor
+    ) -> None:
+        with patch.object(service, "dispatch_alerts") as mock_alerts:
+            service.process_check_result(monitor.id, False, 0, 0)
+
+        mock_alerts.assert_called_once()
+        alerted_monitor, new_status = mock_alerts.call_args[0]
+        assert alerted_monitor.id == monitor.id
+        assert alerted_monitor.name == monitor.name
+        assert new_status == Monitor.StatusType.DOWN
+
+    def test_process_check_result_missing_monitor(
+        self, service: MonitorService
+    ) -> None:
+        service.process_check_result(99999, True, 100, 200)
+
+        assert not MonitorResult.objects.filter(monitor_id=99999).exists()
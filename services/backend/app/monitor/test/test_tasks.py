@@ -1,10 +1,15 @@
+import httpx
 import pytest
-from typing import Any
+from typing import Any, Callable, Iterator, Union
 from unittest.mock import patch, Mock
 from django.contrib.auth import get_user_model
 from faker import Faker
 from monitor.models import Monitor, MonitorResult
-from monitor.tasks import check_monitor_task
+from monitor.dtos import CheckResult
+from monitor.engine import AsyncCheckEngine
+from monitor.scheduler import MonitorScheduler, SCHEDULE_KEY
+from monitor.ingestion import result_buffer
+from monitor.tasks import check_monitor_task, check_monitors_batch_task
 
 User = get_user_model()
 fake = Faker()
@@ -27,19 +32,37 @@ def monitor(user: Any) -> Monitor:
     )
 
 
+Outcome = Union[int, type[httpx.TransportError]]
+
+
+@pytest.fixture
+def respond() -> Iterator[Callable[[Outcome], None]]:
+    """Sets what the runner gets back: a status code or a raised error."""
+    outcome: dict[str, Outcome] = {"value": 200}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        value = outcome["value"]
+        if isinstance(value, int):
+            return httpx.Response(value)
+        raise value("Timeout", request=request)
+
+    def engine() -> AsyncCheckEngine:
+        return AsyncCheckEngine(transport=httpx.MockTransport(handler))
+
+    with patch("monitor.tasks.AsyncCheckEngine", side_effect=engine):
+        yield lambda value: outcome.update(value=value)
+
+
 @pytest.mark.django_db
 class TestCheckMonitorTask:
     """Unit tests for the check_monitor_task"""
 
-    @patch("monitor.tasks.requests.get")
     @patch("monitor.tasks.check_monitor_task.apply_async")
     def test_successful_check(
-        self, mock_apply_async: Mock, mock_get: Mock, monitor: Monitor
+        self, mock_apply_async: Mock, respond: Any, monitor: Monitor
     ) -> None:
         """Test successful monitor check"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_get.return_value = mock_response
+        respond(200)
 
         result = check_monitor_task(monitor.id)
 
@@ -48,17 +71,14 @@ class TestCheckMonitorTask:
         monitor.refresh_from_db()
         assert monitor.status == "UP"
         assert monitor.last_checked_at is not None
-        mock_apply_async.assert_called_once()
+        mock_apply_async.assert_not_called()
 
-    @patch("monitor.tasks.requests.get")
     @patch("monitor.tasks.check_monitor_task.apply_async")
     def test_failed_check(
-        self, mock_apply_async: Mock, mock_get: Mock, monitor: Monitor
+        self, mock_apply_async: Mock, respond: Any, monitor: Monitor
     ) -> None:
         """Test failed monitor check"""
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_get.return_value = mock_response
+        respond(500)
 
         result = check_monitor_task(monitor.id)
 
@@ -67,15 +87,12 @@ class TestCheckMonitorTask:
         monitor.refresh_from_db()
         assert monitor.status == "DOWN"
 
-    @patch("monitor.tasks.requests.get")
     @patch("monitor.tasks.check_monitor_task.apply_async")
     def test_timeout_check(
-        self, mock_apply_async: Mock, mock_get: Mock, monitor: Monitor
+        self, mock_apply_async: Mock, respond: Any, monitor: Monitor
     ) -> None:
         """Test monitor check with timeout"""
-        import requests
-
-        mock_get.side_effect = requests.RequestException("Timeout")
+        respond(httpx.ConnectTimeout)
 
         result = check_monitor_task(monitor.id)
 
@@ -105,16 +122,12 @@ class TestCheckMonitorTask:
         assert "does not exist" in result.lower()
         mock_apply_async.assert_not_called()
 
-    @patch("monitor.tasks.requests.get")
     @patch("monitor.tasks.check_monitor_task.apply_async")
     def test_response_time_recorded(
-        self, mock_apply_async: Mock, mock_get: Mock, monitor: Monitor
+        self, mock_apply_async: Mock, respond: Any, monitor: Monitor
     ) -> None:
         """Test that response time is recorded"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.elapsed.total_seconds.return_value = 0.150
-        mock_get.return_value = mock_response
+        respond(200)
 
         check_monitor_task(monitor.id)
 
@@ -123,27 +136,20 @@ class TestCheckMonitorTask:
         assert result_obj.response_time_ms is not None
         assert result_obj.response_time_ms >= 0
 
-    @patch("monitor.tasks.requests.get")
     @patch("monitor.tasks.check_monitor_task.apply_async")
-    def test_next_check_scheduled(
-        self, mock_apply_async: Mock, mock_get: Mock, monitor: Monitor
+    def test_next_check_is_left_to_scheduler(
+        self, mock_apply_async: Mock, respond: Any, monitor: Monitor
     ) -> None:
-        """Test that next check is scheduled with correct interval"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_get.return_value = mock_response
+        """Test that the task no longer reschedules itself"""
+        respond(200)
 
         check_monitor_task(monitor.id)
 
-        mock_apply_async.assert_called_once()
-        call_args = mock_apply_async.call_args
-        assert call_args[0][0] == (monitor.id,)
-        assert call_args[1]["countdown"] == monitor.interval
+        mock_apply_async.assert_not_called()
 
-    @patch("monitor.tasks.requests.get")
     @patch("monitor.tasks.check_monitor_task.apply_async")
     def test_status_codes_classification(
-        self, mock_apply_async: Mock, mock_get: Mock, monitor: Monitor
+        self, mock_apply_async: Mock, respond: Any, monitor: Monitor
     ) -> None:
         """Test different status codes are classified correctly"""
         test_cases = [
@@ -156,9 +162,7 @@ class TestCheckMonitorTask:
         ]
 
         for status_code, expected_is_up in test_cases:
-            mock_response = Mock()
-            mock_response.status_code = status_code
-            mock_get.return_value = mock_response
+            respond(status_code)
 
             check_monitor_task(monitor.id)
 
@@ -170,3 +174,63 @@ class TestCheckMonitorTask:
 
             # Clean up for next iteration
             MonitorResult.objects.filter(monitor=monitor).delete()
+
+
+@pytest.mark.django_db
+class TestCheckMonitorsBatchTask:
+    """Unit tests for the check_monitors_batch_task"""
+
+    @patch("monitor.tasks.AsyncCheckEngine.run")
+    def test_batch_results_are_processed(
+        self, mock_run: Mock, user: Any, monitor: Monitor
+    ) -> None:
+        second = Monitor.objects.create(
+            user=user,
+            name=fake.company(),
+            url="https://example.org",
+            monitor_type="HTTP",
+            is_active=True,
+        )
+        mock_run.return_value = [
+            CheckResult(monitor.id, True, 120, 200),
+            CheckResult(second.id, False, 80, 503),
+        ]
+
+        result = check_monitors_batch_task([monitor.id, second.id])
+        result_buffer.flush()
+
+        assert "Checked 2 monitors (1 up)" in result
+        checked = mock_run.call_args[0][0]
+        assert {m.id for m in checked} == {monitor.id, second.id}
+        monitor.refresh_from_db()
+        second.refresh_from_db()
+        assert monitor.status == "UP"
+        assert second.status == "DOWN"
+        assert MonitorResult.objects.filter(monitor=second, status_code=503).exists()
+
+    @patch("monitor.tasks.AsyncCheckEngine.run")
+    def test_inactive_monitors_are_skipped(
+        self, mock_run: Mock, monitor: Monitor
+    ) -> None:
+        monitor.is_active = False
+        monitor.save()
+
+        result = check_monitors_batch_task([monitor.id, 99999])
+
+        assert "no active monitors" in result.lower()
+        mock_run.assert_not_called()
+
+    @patch("monitor.tasks.AsyncCheckEngine.run")
+    def test_stale_monitors_are_unscheduled(
+        self, mock_run: Mock, monitor: Monitor
+    ) -> None:
+        scheduler = MonitorScheduler()
+        scheduler.schedule(monitor.id, 60)
+        scheduler.schedule(99999, 60)
+        mock_run.return_value = [CheckResult(monitor.id, True, 100, 200)]
+
+        check_monitors_batch_task([monitor.id, 99999])
+        result_buffer.flush()
+
+        assert scheduler.redis.zscore(SCHEDULE_KEY, str(monitor.id)) is not None
+        assert scheduler.redis.zscore(SCHEDULE_KEY, "99999") is None
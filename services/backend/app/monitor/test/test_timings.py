@@ -0,0 +1,105 @@
+import asyncio
+from typing import List
+import httpx
+from monitor.dtos import CheckTimings
+from monitor.engine import AsyncCheckEngine
+from monitor.models import Monitor
+from monitor.timings import PhaseTimer
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _replay(timer: PhaseTimer, clock: FakeClock, events: List[tuple]) -> None:
+    """Feeds (seconds, event) trace events to the timer."""
+
+    async def replay() -> None:
+        for at, event in events:
+            clock.now = at
+            await timer.trace(event, {})
+
+    asyncio.run(replay())
+
+
+class TestPhaseTimer:
+    """Unit tests for the per-phase check timings"""
+
+    def test_phases_of_a_fresh_connection(self) -> None:
+        clock = FakeClock()
+        timer = PhaseTimer(clock=clock)
+
+        _replay(
+            timer,
+            clock,
+            [
+                (0.000, "dns.resolve.started"),
+                (0.002, "dns.resolve.complete"),
+                (0.002, "connection.connect_tcp.started"),
+                (0.014, "connection.connect_tcp.complete"),
+                (0.014, "connection.start_tls.started"),
+                (0.040, "connection.start_tls.complete"),
+                (0.040, "http11.send_request_headers.started"),
+                (0.041, "http11.send_request_headers.complete"),
+                (0.041, "http11.receive_response_headers.started"),
+                (0.090, "http11.receive_response_headers.complete"),
+                (0.090, "http11.receive_response_body.started"),
+                (0.095, "http11.receive_response_body.complete"),
+            ],
+        )
+
+        assert timer.timings() == CheckTimings(
+            dns=2, connect=12, tls=26, ttfb=50, transfer=5
+        )
+
+    def test_redirects_add_up_and_failed_phases_are_left_out(self) -> None:
+        clock = FakeClock()
+        timer = PhaseTimer(clock=clock)
+
+        _replay(
+            timer,
+            clock,
+            [
+                (0.000, "http11.send_request_headers.started"),
+                (0.020, "http11.receive_response_headers.complete"),
+                (0.020, "http11.receive_response_body.started"),
+                (0.021, "http11.receive_response_body.complete"),
+                (0.021, "http2.send_request_headers.started"),
+                (0.051, "http2.receive_response_headers.complete"),
+                (0.051, "http2.receive_response_body.started"),
+                (0.060, "http2.receive_response_body.failed"),
+            ],
+        )
+
+        assert timer.timings() == CheckTimings(ttfb=50, transfer=1)
+
+    def test_cut_off_body_still_times_the_transfer(self) -> None:
+        clock = FakeClock()
+        timer = PhaseTimer(clock=clock)
+
+        _replay(
+            timer,
+            clock,
+            [
+                (0.000, "http11.receive_response_body.started"),
+                (0.010, "runner.receive_response_body.complete"),
+                (0.011, "http11.receive_response_body.failed"),
+            ],
+        )
+
+        assert timer.timings() == CheckTimings(transfer=10)
+
+    def test_engine_reports_dns_timing(self) -> None:
+        engine = AsyncCheckEngine(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200))
+        )
+
+        results = engine.run([Monitor(id=1, url="https://example.com/")])
+
+        # The mock transport opens no connection: only DNS is timed
+        assert results[0].timings.dns is not None
+        assert results[0].timings.connect is None
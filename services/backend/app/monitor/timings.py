@@ -0,0 +1,54 @@
+from typing import Any, Callable, Dict
+import time
+from .dtos import PHASES, CheckTimings
+
+# httpcore trace steps (event names without their "http11."-like prefix)
+# where a phase starts and where it ends; "dns.resolve" is the runner's own
+PHASE_STARTS = {
+    "resolve.started": "dns",
+    "connect_tcp.started": "connect",
+    "start_tls.started": "tls",
+    "send_request_headers.started": "ttfb",
+    "receive_response_body.started": "transfer",
+}
+PHASE_ENDS = {
+    "resolve.complete": "dns",
+    "connect_tcp.complete": "connect",
+    "start_tls.complete": "tls",
+    "receive_response_headers.complete": "ttfb",
+    "receive_response_body.complete": "transfer",
+}
+
+
+class PhaseTimer:
+    """
+    Collects the phase timings of one check from the request `trace`
+    extension: pass `trace` with every request of the check. Durations come
+    from a monotonic clock; a phase that starts more than once (redirects)
+    adds up, and one that never completes is left out.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.clock = clock
+        self.started: Dict[str, float] = {}
+        self.totals: Dict[str, float] = {}
+
+    async def trace(self, event: str, info: Dict[str, Any]) -> None:
+        step = event.partition(".")[2]
+        if step in PHASE_STARTS:
+            self.started[PHASE_STARTS[step]] = self.clock()
+        elif step in PHASE_ENDS:
+            phase = PHASE_ENDS[step]
+            started_at = self.started.pop(phase, None)
+            if started_at is not None:
+                elapsed = self.clock() - started_at
+                self.totals[phase] = self.totals.get(phase, 0.0) + elapsed
+
+    def timings(self) -> CheckTimings:
+        return CheckTimings(
+            **{
+                phase: round(self.totals[phase] * 1000)
+                for phase in PHASES
+                if phase in self.totals
+            }
+        )
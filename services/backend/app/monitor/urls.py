@@ -1,11 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import MonitorView
+from .views import MonitorView, monitor_events
 
 app_name = "monitor"
 router = DefaultRouter()
 router.register("", MonitorView, basename="monitor")
 
 urlpatterns = [
+    # Before the router, whose detail route would match "events/"
+    path("events/", monitor_events, name="monitor-events"),
     path("", include(router.urls)),
 ]
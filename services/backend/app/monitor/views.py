@@ -1,4 +1,7 @@
 from typing import Any
+from django.conf import settings
+from django.http import HttpRequest, JsonResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
@@ -10,8 +13,14 @@ from rest_framework.decorators import action
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 from django.db.models import QuerySet
+from rest_framework.exceptions import ValidationError
+from common.authentication import aauthenticate, issue_stream_ticket
+from common.pagination import KeysetPagination
+from .events import stream_events
+from .downsampling import DEFAULT_POINTS, GRAPH_METHODS, MAX_POINTS
 from .models import Monitor
 from .serializers import (
+    MonitorBulkStatsSerializer,
     MonitorSerializer,
     MonitorHistorySerializer,
     MonitorStatsSerializer,
@@ -25,6 +34,11 @@ class MonitorPagination(PageNumberPagination):
     max_page_size = 100
 
 
+class MonitorHistoryCursorPagination(KeysetPagination):
+    ordering_field = "created_at"
+    tiebreak_field = "id"
+
+
 class MonitorView(
     GenericViewSet,
     mixins.ListModelMixin,
@@ -75,6 +89,38 @@ class MonitorView(
 
         return Response(data=stats_data)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="period",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Time period for statistics",
+                enum=["24h", "7d", "30d"],
+                default="24h",
+            )
+        ],
+        responses={200: MonitorBulkStatsSerializer(many=True)},
+        description=(
+            "Get aggregated statistics for a page of monitors "
+            "(same paging and order as the monitor list)"
+        ),
+    )
+    @action(detail=False, methods=["get"])
+    def bulk_stats(self, request: Request) -> Response:
+        period = request.query_params.get("period", "24h")
+        monitors = self.paginate_queryset(self.get_queryset()) or []
+
+        stats = self.service.get_bulk_stats(monitors, period)
+        for stats_data in stats:
+            stats_data["last_check"] = (
+                MonitorHistorySerializer(stats_data["last_check"]).data
+                if stats_data["last_check"]
+                else None
+            )
+
+        return self.get_paginated_response(stats)
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -84,7 +130,25 @@ class MonitorView(
                 description="Time period for history",
                 enum=["24h", "7d", "30d"],
                 required=False,
-            )
+            ),
+            OpenApiParameter(
+                name="pagination",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "'cursor' pages newest first with an opaque cursor "
+                    "(constant cost per page, no total count)"
+                ),
+                enum=["page", "cursor"],
+                default="page",
+            ),
+            OpenApiParameter(
+                name="cursor",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Cursor from the 'next' link (cursor pagination only)",
+                required=False,
+            ),
         ],
         responses={200: MonitorHistorySerializer(many=True)},
         description="Get raw history logs for graphing with pagination support",
@@ -96,6 +160,12 @@ class MonitorView(
 
         queryset = self.service.get_history(monitor, period)
 
+        if request.query_params.get("pagination") == "cursor":
+            paginator = MonitorHistoryCursorPagination()
+            cursor_page = paginator.paginate_queryset(queryset, request, view=self)
+            serializer = MonitorHistorySerializer(cursor_page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = MonitorHistorySerializer(page, many=True)
@@ -104,6 +174,55 @@ class MonitorView(
         serializer = MonitorHistorySerializer(queryset, many=True)
         return Response(serializer.data)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="period",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Time period of the series",
+                enum=["24h", "7d", "30d"],
+                default="24h",
+            ),
+            OpenApiParameter(
+                name="points",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description=f"Maximum number of points (at most {MAX_POINTS})",
+                default=DEFAULT_POINTS,
+            ),
+            OpenApiParameter(
+                name="method",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "'buckets': min/avg/max per time bucket; "
+                    "'lttb': raw checks picked to keep the chart's shape"
+                ),
+                enum=list(GRAPH_METHODS),
+                default="buckets",
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+        description="Get a downsampled response-time series for charting",
+    )
+    @action(detail=True, methods=["get"])
+    def graph(self, request: Request, pk: Any = None) -> Response:
+        monitor = self.get_object()
+        period = request.query_params.get("period", "24h")
+        method = request.query_params.get("method", "buckets")
+        if method not in GRAPH_METHODS:
+            raise ValidationError({"method": f"Must be one of {list(GRAPH_METHODS)}"})
+        try:
+            points = int(request.query_params.get("points", DEFAULT_POINTS))
+        except ValueError:
+            raise ValidationError({"points": "Must be an integer"})
+
+        graph = self.service.get_history_graph(
+            monitor, period, max(3, min(points, MAX_POINTS)), method
+        )
+        return Response(graph)
+
     @extend_schema(
         responses={
             200: OpenApiTypes.OBJECT,
@@ -117,3 +236,44 @@ class MonitorView(
     def dashboard_stats(self, request: Request) -> Response:
         stats = self.service.get_dashboard_stats(request.user)  # type: ignore[misc]
         return Response(stats)
+
+    @extend_schema(
+        request=None,
+        responses={201: OpenApiTypes.OBJECT},
+        description=(
+            "Get a single-use ticket for opening the events stream "
+            "(GET /monitors/events/?ticket=...)"
+        ),
+    )
+    @action(detail=False, methods=["post"], url_path="events/ticket")
+    def events_ticket(self, request: Request) -> Response:
+        return Response(
+            {
+                "ticket": issue_stream_ticket(request.user),
+                "expires_in": settings.STREAM_TICKET_TTL_SECONDS,
+            },
+            status=201,
+        )
+
+
+async def monitor_events(request: HttpRequest) -> HttpResponseBase:
+    """
+    Server-sent events stream of the user's monitor status transitions
+    ("status") and new check results ("result"), replacing dashboard polling.
+    Authenticates with an API token header, a stream ticket (?ticket=, from
+    POST events/ticket/) or the session. Tickets are single use: clients
+    fetch a new one before reconnecting.
+    """
+    user = await aauthenticate(request)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=401
+        )
+
+    response = StreamingHttpResponse(
+        stream_events(user.pk), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Stops nginx from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response